@@ -0,0 +1,42 @@
+import json
+import shutil
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS = ROOT / "tools"
+sys.path.insert(0, str(TOOLS))
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Copia del proyecto (con tools/) en un directorio temporal."""
+    dest = tmp_path / "prompt-manager-lite-v"
+    shutil.copytree(ROOT, dest, ignore=shutil.ignore_patterns(
+        "__pycache__", ".verify_cache", "tests", "file_integrity.sqlite", "*.trace.json"))
+    return dest
+
+
+@pytest.fixture
+def run_tool(project):
+    """Ejecuta una herramienta de la copia y devuelve el CompletedProcess."""
+    def run(tool, *args):
+        return subprocess.run([sys.executable, str(project / "tools" / tool), *args], cwd=project,
+                              capture_output=True, text=True, encoding="utf-8")
+    return run
+
+
+@pytest.fixture
+def run_python(project):
+    """Ejecuta código en la copia (con sus tools/ importables); devuelve el JSON de la última línea."""
+    def run(code):
+        source = "import sys\nsys.path.insert(0, 'tools')\n" + textwrap.dedent(code)
+        result = subprocess.run([sys.executable, "-c", source], cwd=project,
+                                capture_output=True, text=True, encoding="utf-8")
+        assert result.returncode == 0, result.stderr
+        return json.loads(result.stdout.splitlines()[-1])
+    return run
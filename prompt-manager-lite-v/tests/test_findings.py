@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from findings import Finding, ListSink, close_sink
+
+
+@pytest.mark.parametrize("tool", ["verify.py", "verify_docs_and_schemas.py"])
+def test_profile_keeps_ndjson_clean(run_tool, tmp_path, tool):
+    result = run_tool(tool, "--format", "ndjson", "--profile", str(tmp_path / "t.json"))
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert records and records[-1]["type"] == "summary"
+    assert "PERFIL" in result.stderr
+    assert (tmp_path / "t.json").exists()
+
+
+@pytest.mark.parametrize("tool", ["verify.py", "verify_integrity.py"])
+def test_profile_keeps_sarif_clean(run_tool, tmp_path, tool):
+    args = ["verify"] if tool == "verify_integrity.py" else []
+    result = run_tool(tool, *args, "--format", "sarif", "--profile", str(tmp_path / "t.json"))
+    report = json.loads(result.stdout)
+    assert report["version"] == "2.1.0"
+    assert "Traza guardada" in result.stderr
+
+
+def test_profile_with_output_uses_stdout(run_tool, tmp_path):
+    out = tmp_path / "findings.ndjson"
+    result = run_tool("verify_docs_and_schemas.py", "--format", "ndjson", "-o", str(out),
+                      "--profile", str(tmp_path / "t.json"))
+    assert "PERFIL" in result.stdout
+    assert all(json.loads(line) for line in out.read_text(encoding="utf-8").splitlines())
+
+
+def test_close_list_sink():
+    sink = ListSink("test")
+    sink.emit(Finding("x/y", "error", "mensaje"))
+    close_sink(sink)
+    assert [f.code for f in sink.findings] == ["x/y"]
+
+
+def test_sink_base_class_is_abstract():
+    from findings import Sink
+
+    with pytest.raises(TypeError):
+        Sink(None, "x")
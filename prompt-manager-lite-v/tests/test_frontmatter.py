@@ -0,0 +1,65 @@
+from frontmatter import MAX_HEADER_LINES, FrontmatterIndex, as_list, parse_header, read_header
+
+
+def write(tmp_path, text, name="DOC.md"):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_read_header_stops_at_the_closer(tmp_path):
+    path = write(tmp_path, "---\r\ntitle: A\r\n---\r\n# Cuerpo\n---\n")
+    assert read_header(path) == ["title: A"]
+    assert read_header(write(tmp_path, "---\nid: DOC001\n...\ncuerpo\n")) == ["id: DOC001"]
+    assert read_header(write(tmp_path, "# Sin frontmatter\n---\n")) is None
+
+
+def test_missing_closer_is_a_horizontal_rule(tmp_path):
+    assert read_header(write(tmp_path, "---\ntitle: A\nTexto\n")) is None
+    body = "".join(f"línea {i}\n" for i in range(MAX_HEADER_LINES))
+    assert read_header(write(tmp_path, f"---\n{body}---\n")) == body.splitlines()
+    assert read_header(write(tmp_path, f"---\n{body}extra\n---\n")) is None
+
+
+def test_parse_header_lists_and_comments():
+    meta = parse_header([
+        "# comentario",
+        "id: DOC008  # código",
+        'title: "API # no es comentario"',
+        "schemaRefs: [a.json, 'b.json', ]",
+        "empty: []",
+        "playbooks:",
+        "  - uno.md",
+        "  # entre elementos",
+        "  - 'dos.md'",
+        "owner:",
+        "nested:",
+        "  child: x",
+        "note: # solo comentario",
+        "no es clave",
+        "  - huérfano",
+    ])
+    assert meta == {
+        "id": "DOC008",
+        "title": "API # no es comentario",
+        "schemaRefs": ["a.json", "b.json"],
+        "empty": [],
+        "playbooks": ["uno.md", "dos.md"],
+        "owner": "",
+        "nested": "",
+        "note": "",
+    }
+    assert as_list(meta["schemaRefs"]) == ["a.json", "b.json"]
+    assert as_list("x.json") == ["x.json"] and as_list("") == []
+
+
+def test_index_reuses_cache_until_stat_changes(tmp_path):
+    doc = write(tmp_path, "---\ntitle: A\n---\n")
+    cache = tmp_path / "cache"
+    index = FrontmatterIndex(tmp_path, cache)
+    assert index.get(doc) == {"title": "A"}
+    index.save()
+    again = FrontmatterIndex(tmp_path, cache)
+    assert again.get(doc) == {"title": "A"} and again.read == 0
+    write(tmp_path, "---\ntitle: Nuevo\n---\n")
+    assert again.get(doc) == {"title": "Nuevo"} and again.read == 1
@@ -0,0 +1,106 @@
+import hashlib
+import os
+import shutil
+import struct
+import subprocess
+
+import pytest
+
+from git_index import GitIndex, _HEADER, _ENTRY, blob_id, parse_index
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git no disponible")
+
+FILES = {
+    "docs/DOC001-Intro.md": b"# Intro\n[Nombre del Proyecto]\n",
+    "docs/DOC002-Arquitectura.md": b"# Arquitectura\n",
+    "docs/DOC002-Arquitectura-anexo.md": b"anexo\n",
+    "schemas/a.json": b"{}\n",
+    "raiz.md": b"raiz\n",
+}
+
+
+def git(repo, *args):
+    return subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    git(repo, "init", "-q")
+    past = 1_600_000_000
+    for rel, data in FILES.items():
+        path = repo / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        # mtime anterior al índice: las entradas no son "racy"
+        os.utime(path, (past, past))
+    git(repo, "add", ".")
+    return repo
+
+
+def ls_files(repo):
+    entries = {}
+    for line in git(repo, "ls-files", "-s").splitlines():
+        meta, path = line.split("\t", 1)
+        _mode, blob, _stage = meta.split()
+        entries[path] = blob
+    return entries
+
+
+@pytest.mark.parametrize("version", [2, 3, 4])
+def test_parse_index_versions(repo, version):
+    if version > 2:
+        # git solo escribe la versión 3 si alguna entrada tiene flags extendidas
+        (repo / "nuevo.md").write_bytes(b"nuevo\n")
+        git(repo, "add", "-N", "nuevo.md")
+    git(repo, "update-index", "--index-version", str(version))
+    data = (repo / ".git" / "index").read_bytes()
+    assert _HEADER.unpack_from(data, 0)[1] == version
+    parsed = {path: blob for path, _fields, blob, _flags, _ext in parse_index(data)}
+    assert parsed == ls_files(repo)
+
+
+@pytest.mark.parametrize("version", [2, 3, 4])
+def test_prefix_and_clean_blobs(repo, version):
+    git(repo, "update-index", "--index-version", str(version))
+    index = GitIndex.load(repo / "docs")
+    assert sorted(index.entries) == ["DOC001-Intro.md", "DOC002-Arquitectura-anexo.md", "DOC002-Arquitectura.md"]
+    path = repo / "docs" / "DOC001-Intro.md"
+    assert index.blob_for("DOC001-Intro.md", os.stat(path)) == blob_id(FILES["docs/DOC001-Intro.md"])
+    path.write_bytes(b"cambiado\n")
+    assert index.blob_for("DOC001-Intro.md", os.stat(path)) is None
+
+
+def test_intent_to_add_is_not_clean(repo):
+    extra = repo / "nuevo.md"
+    extra.write_bytes(b"nuevo\n")
+    os.utime(extra, (1_600_000_000, 1_600_000_000))
+    git(repo, "add", "-N", "nuevo.md")
+    data = (repo / ".git" / "index").read_bytes()
+    assert _HEADER.unpack_from(data, 0)[1] == 3  # las flags extendidas fuerzan la versión 3
+    index = GitIndex.load(repo)
+    assert "nuevo.md" in index.entries
+    assert index.blob_for("nuevo.md", os.stat(extra)) is None
+
+
+def test_split_index_is_rejected(repo):
+    git(repo, "update-index", "--split-index")
+    assert GitIndex.load(repo) is None
+
+
+def _entry_v2(name, blob):
+    fields = _ENTRY.pack(0, 0, 0, 0, 0, 0, 0o100644, 0, 0, 0)
+    flags = struct.pack(">H", min(len(name), 0xFFF))
+    body = fields + blob + flags + name
+    return body + b"\0" * (8 - len(body) % 8)
+
+
+def test_long_names_use_nul_terminator():
+    long_name = ("d/" * 2100 + "x.md").encode()
+    names = [b"a.md", long_name, b"z.md"]
+    blobs = [hashlib.sha1(n).digest() for n in names]
+    data = _HEADER.pack(b"DIRC", 2, len(names)) + b"".join(map(_entry_v2, names, blobs))
+    data += hashlib.sha1(data).digest()
+    parsed = [(path, blob) for path, _f, blob, _fl, _ext in parse_index(data)]
+    assert parsed == [(n.decode(), b.hex()) for n, b in zip(names, blobs)]
@@ -0,0 +1,158 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+
+@pytest.mark.parametrize("tool", ["verify.py", "verify_docs_and_schemas.py"])
+def test_change_source_error_is_a_finding(run_tool, tool):
+    result = run_tool(tool, "--format", "ndjson", "--changed-since", "origin/main")
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert result.returncode == 2
+    assert [r["code"] for r in records if r["type"] == "finding"] == ["changes/source-error"]
+    assert "not a git repository" in records[0]["message"]
+    assert records[-1]["type"] == "summary"
+
+
+def test_changes_are_checked_in_the_indexed_project(project):
+    import verify_docs_and_schemas as vds
+    from findings import ListSink
+    from repo_index import RepoIndex
+
+    manifest_path = project / "manifests" / "documentation_manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    dropped = manifest["documents"].pop(0)["path"]
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    sink = ListSink("test")
+    vds.main(index=RepoIndex.build(project), sink=sink,
+             changes={"manifests/documentation_manifest.json": "modified"})
+    unlisted = [f.path for f in sink.findings if f.code == "manifest/doc-unlisted"]
+    assert unlisted == [dropped]
+    assert (project / ".verify_cache" / "schema_deps.json").exists()
+
+
+def test_baseline_changes_read_the_json_baseline(project):
+    import impact
+    from repo_index import RepoIndex
+
+    doc = "real_structure_documentation/docs/DOC003-DesignSystem.md"
+    with open(project / doc, "a", encoding="utf-8") as f:
+        f.write("\nTexto nuevo.\n")
+    (project / "real_structure_documentation/docs/DOC004-FrontendArchitecture.md").unlink()
+    changes, old_manifest = impact.collect_changes(impact.BASELINE_REF, RepoIndex.build(project), "sqlite")
+    assert changes[doc] == impact.MODIFIED
+    assert changes["real_structure_documentation/docs/DOC004-FrontendArchitecture.md"] == impact.DELETED
+    assert old_manifest is None
+    assert not (project / "file_integrity.sqlite").exists()
+
+
+SCHEMAS = "real_structure_documentation/schemas"
+PARTS = SCHEMAS + "/master_blueprint_parts"
+DOCS = "real_structure_documentation/docs"
+MANIFEST = "manifests/documentation_manifest.json"
+
+
+def graph_impact(project, changes, old_manifest=None):
+    import impact
+    from repo_index import RepoIndex
+
+    manifest = json.loads((project / MANIFEST).read_text(encoding="utf-8"))
+    graph = impact.DependencyGraph(RepoIndex.build(project), manifest)
+    return graph, graph.impact(changes, old_manifest)
+
+
+def test_doc_edit_selects_only_its_frontmatter(project):
+    doc = f"{DOCS}/DOC003-DesignSystem.md"
+    _, result = graph_impact(project, {doc: "modified"})
+    assert result.checks == {("frontmatter", doc)}
+    assert result.integrity == {doc}
+    assert result.docs == {}
+
+
+def test_new_doc_selects_manifest_playbook_and_guide(project):
+    doc = f"{DOCS}/DOC099-Nuevo.md"
+    (project / doc).write_text("# Nuevo\n", encoding="utf-8")
+    _, result = graph_impact(project, {doc: "added"})
+    assert result.checks == {("manifest",), ("frontmatter", doc), ("playbook", doc), ("guide_doc", doc)}
+
+
+def test_schema_deletion_reaches_referencing_schemas_and_docs(project):
+    schema = f"{PARTS}/projectInfo.json"
+    (project / schema).unlink()
+    graph, result = graph_impact(project, {schema: "deleted"})
+    assert graph.dependents(schema) == {schema: schema, f"{SCHEMAS}/master_blueprint_schema.json": schema}
+    assert {("schema_ref", schema), ("guide_schema", schema), ("manifest",)} <= result.checks
+    assert result.selected("frontmatter") == {f"{DOCS}/{d.name}" for d in (project / DOCS).glob("DOC*.md")}
+    assert set(result.docs) == {f"{DOCS}/DOC000-ProjectBrief.md", f"{DOCS}/DOC001-ProjectREADME.md"}
+    assert ("manifest_schema",) not in result.checks
+
+
+def test_schema_edit_follows_ref_chain(project):
+    part = project / PARTS / "projectInfo.json"
+    data = json.loads(part.read_text(encoding="utf-8"))
+    data["properties"] = {**data.get("properties", {}), "extra": {"$ref": "definitions.json#/definitions"}}
+    part.write_text(json.dumps(data), encoding="utf-8")
+    definitions = f"{PARTS}/definitions.json"
+    _, result = graph_impact(project, {definitions: "modified"})
+    assert result.docs[f"{DOCS}/DOC000-ProjectBrief.md"] == [f"{definitions} (vía {PARTS}/projectInfo.json)"]
+    assert not result.selected("schema_ref")
+
+
+def test_manifest_schema_edit_selects_schema_validation(project):
+    schema = f"{PARTS}/documentationManifest.json"
+    _, result = graph_impact(project, {schema: "modified"})
+    assert result.checks == {("manifest_schema",)}
+
+
+def test_manifest_status_change_marks_the_entry(project):
+    path = project / MANIFEST
+    old_manifest = json.loads(path.read_text(encoding="utf-8"))
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    entry = manifest["documents"][3]
+    entry["status"] = "review"
+    path.write_text(json.dumps(manifest), encoding="utf-8")
+    graph, result = graph_impact(project, {MANIFEST: "modified"}, old_manifest)
+    assert {("manifest",), ("manifest_schema",)} <= result.checks
+    assert len(result.selected("schema_ref")) == len(graph.schemas)
+    assert len(result.selected("frontmatter")) == len(graph.docs)
+    assert result.docs == {entry["path"]: [f"{MANIFEST} (entrada modificada)"]}
+    # Sin la versión anterior no se sabe qué entrada cambió
+    assert graph_impact(project, {MANIFEST: "modified"})[1].docs == {}
+
+
+def test_guide_and_playbook_changes(project):
+    _, result = graph_impact(project, {"guides/USO_PLAYBOOKS_DOCS.md": "modified"})
+    assert {k[0] for k in result.checks} == {"guide_doc"}
+    assert len(result.checks) == len(list((project / DOCS).glob("DOC*.md")))
+    _, result = graph_impact(project, {"guides/CONEXION_SCHEMAS_DOCS.md": "modified"})
+    assert {k[0] for k in result.checks} == {"guide_schema"}
+
+    playbook = "prompt_playbooks/documentation_playbooks/playbook-v2-DOC002-ProductDefinition.md"
+    (project / playbook).unlink()
+    _, result = graph_impact(project, {playbook: "deleted"})
+    assert result.checks == {("playbook", f"{DOCS}/DOC002-ProductDefinition.md")}
+    # Editar un playbook no cambia si existe
+    assert graph_impact(project, {playbook: "modified"})[1].checks == set()
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git no disponible")
+def test_changes_since_git(project):
+    import impact
+
+    def git(*args):
+        subprocess.run(["git", *args], cwd=project, check=True, capture_output=True)
+
+    git("init", "-q")
+    git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "vacío")
+    git("add", "-A")
+    git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", "base")
+    doc = f"{DOCS}/DOC003-DesignSystem.md"
+    with open(project / doc, "a", encoding="utf-8") as f:
+        f.write("\nTexto nuevo.\n")
+    (project / PARTS / "projectInfo.json").unlink()
+    (project / DOCS / "DOC099-Nuevo.md").write_text("# Nuevo\n", encoding="utf-8")
+    changes = impact.changes_since_git("HEAD", project)
+    assert changes == {doc: "modified", f"{PARTS}/projectInfo.json": "deleted", f"{DOCS}/DOC099-Nuevo.md": "added"}
+    assert impact.manifest_at("HEAD~1", impact.layout_of(impact.RepoIndex.build(project))) is None
+    assert impact.manifest_at("HEAD", impact.layout_of(impact.RepoIndex.build(project)))["documents"]
@@ -0,0 +1,61 @@
+import pytest
+
+from placeholders import GRAMMARS, scan_file, scan_text
+
+SAMPLE = (
+    "# [Nombre del Proyecto]\n"
+    "Versión {{version}} de [ID] y `[ID]`.\n"
+    "```json\n"
+    '{"id": "[NO]"}\n'
+    "```\n"
+    "<!-- [NO] en un comentario\n"
+    "que ocupa [NO] varias líneas -->[Responsable]\n"
+    "- [ ] tarea\n"
+    "- [x] hecha\n"
+    "Ver [la guía](guides/USO.md), [DOC][ref] e ![img](a.png).\n"
+    "[ref]: https://example.com\n"
+    "\\[escapado] y [Fecha]\n"
+    "~~~~\n"
+    "[NO]\n"
+    "```\n"
+    "[NO] (``` no cierra un bloque abierto con ~~~~)\n"
+    "~~~~\n"
+    "[Fin]"
+)
+
+
+def test_counts_each_placeholder_once():
+    count, found = scan_text("[ID] `[ID]` [Nombre del Proyecto] {{x}}")
+    assert count == 4
+    assert found == ["[ID]", "[Nombre del Proyecto]", "{{x}}"]
+
+
+def test_markdown_context_is_not_counted():
+    count, found = scan_text(SAMPLE)
+    assert found == ["[Fecha]", "[Fin]", "[ID]", "[Nombre del Proyecto]", "[Responsable]", "{{version}}"]
+    assert count == 7
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("- [ ] a\n* [x] b\n1. [X] c", 0),
+    ("[x] sin lista", 1),
+    ("[a <!-- c --> b]", 0),
+    ("   ```\n[NO]\n   ```\n[SI]", 1),
+    ("    ```\n[SI]", 1),
+    ("[]", 1),
+    ("[sin cierre\n]", 0),
+])
+def test_markdown_cases(text, expected):
+    assert scan_text(text)[0] == expected
+
+
+def test_json_grammar_only_counts_strings():
+    count, found = scan_text('{"a": "[X] y {{y}}", "b": [1, 2], "c": ["[Z]"]}', GRAMMARS["json"])
+    assert (count, found) == (3, ["[X]", "[Z]", "{{y}}"])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64, 1 << 16])
+def test_chunk_boundaries_match_whole_text(tmp_path, chunk_size):
+    path = tmp_path / "doc.md"
+    path.write_text(SAMPLE, encoding="utf-8")
+    assert scan_file(path, chunk_size=chunk_size) == scan_text(SAMPLE)
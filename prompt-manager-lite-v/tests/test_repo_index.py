@@ -0,0 +1,34 @@
+from repo_index import RepoIndex
+
+
+def rels(index, kind):
+    return [f.rel for f in index.of_kind(kind)]
+
+
+def test_refresh_keeps_kinds_sorted(project):
+    index = RepoIndex.build(project)
+    docs = rels(index, "doc")
+    doc = project / docs[len(docs) // 2]
+
+    doc.unlink()
+    old, new = index.refresh(docs[len(docs) // 2])
+    assert old is not None and new is None
+    assert rels(index, "doc") == docs[:len(docs) // 2] + docs[len(docs) // 2 + 1:]
+
+    added = "real_structure_documentation/docs/DOC000A-Nuevo.md"
+    (project / added).write_text("# Nuevo\n", encoding="utf-8")
+    old, new = index.refresh(added)
+    assert old is None and new.kind == "doc"
+    assert rels(index, "doc") == sorted(rels(index, "doc"))
+    assert rels(index, "doc") == rels(RepoIndex.build(project), "doc")
+
+
+def test_refresh_of_modified_and_unindexed_files(project):
+    index = RepoIndex.build(project)
+    manifest = "manifests/documentation_manifest.json"
+    (project / manifest).write_text("{}", encoding="utf-8")
+    old, new = index.refresh(manifest)
+    assert old.rel == new.rel == manifest and new.stat.st_size == 2
+    assert rels(index, "manifest").count(manifest) == 1
+    assert index.refresh("README.md") == (None, None)
+    assert index.refresh("tools/verify.py") == (None, None)
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from schema_validator import CompiledSchema, SchemaError, SchemaRegistry, bundle_schema
+
+
+def write(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+def test_local_and_cross_file_refs(tmp_path):
+    write(tmp_path / "defs.json", {"definitions": {"id": {"type": "string", "pattern": "^F[0-9]{3}$"}}})
+    root = write(tmp_path / "root.json", {
+        "type": "object",
+        "required": ["id", "tags"],
+        "properties": {
+            "id": {"$ref": "defs.json#/definitions/id"},
+            "tags": {"type": "array", "items": {"$ref": "#/definitions/tag"}},
+        },
+        "definitions": {"tag": {"type": "string", "minLength": 1}},
+    })
+    bundle = bundle_schema(root)
+    assert set(bundle["deps"]) == {"root.json", "defs.json"}
+    schema = CompiledSchema(bundle)
+    assert schema.is_valid({"id": "F001", "tags": ["a"]})
+    paths = sorted(v.path for v in schema.validate({"id": "X1", "tags": [""]}))
+    assert paths == ["$.id", "$.tags[0]"]
+
+
+def test_recursive_ref_terminates(tmp_path):
+    root = write(tmp_path / "tree.json", {
+        "type": "object",
+        "properties": {"children": {"type": "array", "items": {"$ref": "#"}}},
+    })
+    schema = CompiledSchema(bundle_schema(root))
+    assert schema.is_valid({"children": [{"children": []}]})
+    assert not schema.is_valid({"children": [{"children": [1]}]})
+
+
+def test_unresolvable_refs_raise(tmp_path):
+    missing = write(tmp_path / "missing.json", {"$ref": "nope.json#"})
+    remote = write(tmp_path / "remote.json", {"$ref": "https://example.com/s.json"})
+    for path in (missing, remote):
+        with pytest.raises(SchemaError):
+            bundle_schema(path)
+
+
+def test_registry_rebundles_when_a_dependency_changes(tmp_path):
+    defs = write(tmp_path / "defs.json", {"type": "string"})
+    root = write(tmp_path / "root.json", {"$ref": "defs.json#"})
+    cache = tmp_path / "cache"
+    assert SchemaRegistry(cache).get(root).is_valid("x")
+    assert list(cache.iterdir())
+    write(defs, {"type": "integer"})
+    # Mismo root.json, caché en disco obsoleta: la dependencia manda
+    schema = SchemaRegistry(cache).get(root)
+    assert schema.is_valid(1)
+    assert not schema.is_valid("x")
+
+
+def test_malformed_schema_is_a_schema_error(tmp_path):
+    root = tmp_path / "root.json"
+    root.write_text('{"type": "object", "properties": {', encoding="utf-8")
+    latin1 = tmp_path / "latin1.json"
+    latin1.write_bytes('{"description": "añadido"}'.encode("latin-1"))
+    for path in (root, latin1):
+        with pytest.raises(SchemaError, match=path.name):
+            SchemaRegistry().get(path)
+
+
+def test_truncated_manifest_schema_is_reported_as_finding(project, run_tool):
+    schema = project / "real_structure_documentation" / "schemas" / "master_blueprint_parts" / "documentationManifest.json"
+    schema.write_bytes(schema.read_bytes()[:200])
+    result = run_tool("verify_docs_and_schemas.py", "--format", "ndjson")
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert "Traceback" not in result.stderr
+    assert any(r.get("code") == "schema/invalid" for r in records)
+    assert result.returncode == 1
@@ -0,0 +1,35 @@
+from sections import compare, merkle_root, repo_root, section_hash, split_sections
+
+
+def test_split_sections_ignores_headings_inside_fences():
+    content = "intro\n# Uno\ntexto\n```\n# no es título\n```\n## Dos\n"
+    sections = split_sections(content)
+    assert [heading for heading, _ in sections] == ["", "# Uno", "## Dos"]
+    assert "".join(text for _, text in sections) == content
+
+
+def test_merkle_root_odd_node_and_order():
+    a, b, c = (section_hash(s) for s in "abc")
+    assert merkle_root([a]) == a
+    assert merkle_root([a, b, c]) != merkle_root([b, a, c])
+
+
+def test_repo_root_is_order_independent_and_skips_empty():
+    roots = {"a.md": section_hash("a"), "b.md": section_hash("b")}
+    assert repo_root(roots) == repo_root(dict(reversed(list(roots.items()))))
+    assert repo_root({**roots, "vacío.md": None}) == repo_root(roots)
+    assert repo_root({**roots, "a.md": section_hash("x")}) != repo_root(roots)
+
+
+def test_compare_states():
+    initial = [("# T", "h1", 2), ("# U", "h2", 0), ("# C", "h3", 2), ("# P", "h4", 3), ("# M", "h5", 1)]
+    current = [("# T", "h1", 2), ("# U", "h2", 0), ("# C", "x3", 0), ("# P", "x4", 1),
+               ("# M", "x5", 1), ("# N", "h6", 0)]
+    assert [state for _, state, _ in compare(initial, current)] == [
+        "template", "unchanged", "completed", "in-progress", "modified", "new"]
+
+
+def test_compare_repeated_headings_pair_in_order():
+    initial = [("## Paso", "a", 1), ("## Paso", "b", 1)]
+    current = [("## Paso", "a", 1), ("## Paso", "c", 0), ("## Paso", "d", 0)]
+    assert [state for _, state, _ in compare(initial, current)] == ["template", "completed", "new"]
@@ -0,0 +1,52 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from streaming_registry import Registry
+
+
+def _features(base):
+    folder = base / "streaming_files" / "features"
+    folder.mkdir(parents=True)
+    (folder / "template.md").write_text("---\nstatus: draft|done\ntitle: \n---\n# Feature\n", encoding="utf-8")
+    return folder
+
+
+def test_allocate_skips_unsynced_manual_folder(tmp_path):
+    folder = _features(tmp_path)
+    (folder / "F000-manual").mkdir()
+    item = Registry("features", tmp_path).allocate("other")
+    assert item["id"] == "F001"
+    assert (folder / "F001-other" / "feature_spec.md").is_file()
+
+
+def test_next_matches_allocate_with_unsynced_folder(tmp_path):
+    folder = _features(tmp_path)
+    (folder / "F005-manual").mkdir()
+    registry = Registry("features", tmp_path)
+    assert registry.next_id() == "F006"
+    assert registry.allocate("y")["id"] == "F006"
+    assert registry.next_id() == "F007"
+
+
+def test_allocate_after_sync_and_gap(tmp_path):
+    folder = _features(tmp_path)
+    (folder / "F000-a").mkdir()
+    registry = Registry("features", tmp_path)
+    registry.sync()
+    (folder / "F007-b").mkdir()
+    assert registry.allocate("c")["id"] == "F008"
+    manifest = json.loads((folder / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["next"] == 9
+
+
+def _allocate(args):
+    base, slug = args
+    return Registry("features", base).allocate(slug)["id"]
+
+
+def test_allocate_concurrent_ids_are_unique(tmp_path):
+    _features(tmp_path)
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        ids = list(pool.map(_allocate, [(tmp_path, f"item-{i}") for i in range(12)]))
+    assert sorted(ids) == [f"F{n:03d}" for n in range(12)]
+    assert len(Registry("features", tmp_path).items) == 12
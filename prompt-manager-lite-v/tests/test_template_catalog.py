@@ -0,0 +1,56 @@
+import shutil
+
+import pytest
+
+import template_catalog
+import verify_integrity
+from template_catalog import ORIGINAL, PARTIAL, TEMPLATE, load_catalog, template_sources
+
+
+@pytest.fixture(autouse=True)
+def fresh_catalogs():
+    template_catalog._catalogs.clear()
+    yield
+    template_catalog._catalogs.clear()
+
+
+def test_sources_are_only_template_files(project):
+    rels = [rel for rel, _ in template_sources(project)]
+    assert "streaming_files/features/template.md" in rels
+    assert "template-pendingtask.md" in rels
+    assert not [rel for rel in rels if "/DOC" in rel]
+
+
+def test_catalog_is_per_root_and_follows_template_edits(project, tmp_path):
+    other = tmp_path / "other"
+    shutil.copytree(project, other)
+    template = other / "streaming_files" / "features" / "template.md"
+    template.write_text(template.read_text(encoding="utf-8") + "\nSección añadida a esta plantilla.\n",
+                        encoding="utf-8")
+    new_hash = verify_integrity._analyze(template, catalog=None)[0]["hash"]
+    assert load_catalog(other).lookup(new_hash) is not None
+    assert load_catalog(project).lookup(new_hash) is None
+    assert (other / ".verify_cache" / "template_catalog.json").exists()
+
+    # Editar la plantilla invalida el catálogo guardado (también en otro proceso)
+    template_catalog._catalogs.clear()
+    template.write_text("# Otra plantilla\n\n[Nombre] y más texto de relleno.\n", encoding="utf-8")
+    catalog = load_catalog(other)
+    assert catalog.lookup(new_hash) is None
+    assert catalog.sources == template_catalog.current_sources(other)
+
+
+def test_new_files_are_classified_against_the_templates(project):
+    features = project / "streaming_files" / "features"
+    template = (features / "template.md").read_text(encoding="utf-8")
+    copy = features / "F900-copia" / "feature_spec.md"
+    copy.parent.mkdir()
+    copy.write_text(template, encoding="utf-8")
+    partial = features / "F901-parcial" / "feature_spec.md"
+    partial.parent.mkdir()
+    partial.write_text(template.replace("\n\n", "\n\nTexto propio rellenado en este bloque.\n", 3), encoding="utf-8")
+    own = features / "F902-propio" / "feature_spec.md"
+    own.parent.mkdir()
+    own.write_text("# Feature propia\n\nNada que ver con la plantilla de features.\n", encoding="utf-8")
+    states = {path: verify_integrity.new_file_finding(path, path.name, project)[1] for path in (copy, partial, own)}
+    assert states == {copy: TEMPLATE, partial: PARTIAL, own: ORIGINAL}
@@ -0,0 +1,36 @@
+import shutil
+
+from verify_batch import expand_roots, run_batch, select_projects
+
+
+def test_expand_roots_dedups_in_order(project, tmp_path):
+    (tmp_path / "otro").mkdir()
+    roots = expand_roots([str(project), str(tmp_path / "*"), str(project) + "/"])
+    assert roots == [(str(project), True), (str(tmp_path / "otro"), False)]
+
+
+def test_explicit_root_wins_over_earlier_glob(tmp_path):
+    (tmp_path / "no-proyecto").mkdir()
+    roots = expand_roots([str(tmp_path / "*"), str(tmp_path / "no-proyecto")])
+    assert roots == [(str(tmp_path / "no-proyecto"), True)]
+    # Una ruta explícita que no es un proyecto se conserva para informarla como error
+    assert select_projects(roots) == [str(tmp_path / "no-proyecto")]
+
+
+def test_glob_drops_non_projects(project, tmp_path):
+    (tmp_path / "no-proyecto").mkdir()
+    assert select_projects(expand_roots([str(tmp_path / "*")])) == [str(project)]
+
+
+def test_broken_baseline_fails_only_its_project(project, tmp_path):
+    broken = tmp_path / "broken"
+    shutil.copytree(project, broken)
+    (broken / "file_integrity.sqlite").write_bytes(b"esto no es una base sqlite" * 100)
+    bad_json = tmp_path / "bad-json"
+    shutil.copytree(project, bad_json)
+    (bad_json / "file_integrity.json").write_text('{"files": {}}', encoding="utf-8")
+    records = list(run_batch([str(broken), str(project), str(bad_json)], jobs=1))
+    assert [r["ok"] for r in records] == [False, True, False]
+    assert records[0]["findings"][0]["code"] == "batch/project-error"
+    assert "DatabaseError" in records[0]["findings"][0]["message"]
+    assert "KeyError" in records[2]["findings"][0]["message"]
@@ -0,0 +1,135 @@
+import stat
+
+SERVE = """
+    import http.client
+    import json
+    import threading
+    import time
+    import verify_daemon as vd
+
+    server = threading.Thread(target=vd.serve, kwargs={"poll": True}, daemon=True)
+    server.start()
+    while not vd.STATE_FILE.exists():
+        time.sleep(0.02)
+    state = json.loads(vd.STATE_FILE.read_text(encoding="utf-8"))
+    port = state["port"]
+
+    def call(method, path, headers=None):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        conn.request(method, path, headers=headers or {})
+        resp = conn.getresponse()
+        status, body = resp.status, json.loads(resp.read())
+        conn.close()
+        return [status, body]
+
+    auth = {vd.TOKEN_HEADER: state["token"]}
+    results = {}
+"""
+STOP = """
+    results["stop"] = call("POST", "/shutdown", auth)[0]
+    # serve() borra daemon.json e imprime su despedida antes de volver
+    server.join(10)
+    print(json.dumps(results))
+"""
+
+
+def run_daemon(run_python, code):
+    return run_python(SERVE + code + STOP)
+
+
+def test_requests_need_token_and_local_host(project, run_python):
+    results = run_daemon(run_python, """
+    results["no_token"] = call("POST", "/shutdown")[0]
+    results["bad_token"] = call("GET", "/status", {vd.TOKEN_HEADER: "x"})[0]
+    results["rebinding"] = call("GET", "/status", {**auth, "Host": f"evil.example:{port}"})[0]
+    results["origin"] = call("POST", "/refresh", {**auth, "Origin": "http://evil.example"})[0]
+    results["localhost"] = call("GET", "/status", {**auth, "Host": f"localhost:{port}"})[0]
+    results["client"] = vd.request("GET", "/status")[0]
+    """)
+    assert results == {"no_token": 403, "bad_token": 403, "rebinding": 403, "origin": 403,
+                       "localhost": 200, "client": 200, "stop": 200}
+    assert not (project / ".verify_cache" / "daemon.json").exists()
+
+
+def test_state_file_is_private_and_internal_errors_answer_500(project, run_python):
+    results = run_daemon(run_python, """
+    import os
+    results["mode"] = os.stat(vd.STATE_FILE).st_mode
+    vd.Daemon.coverage = lambda self: 1 / 0
+    results["error"] = call("GET", "/coverage", auth)
+    results["after"] = call("GET", "/status", auth)[0]
+    """)
+    assert stat.S_IMODE(results["mode"]) == 0o600
+    assert results["error"][0] == 500
+    assert "ZeroDivisionError" in results["error"][1]["error"]
+    assert results["after"] == 200
+
+
+DAEMON = """
+    import json
+    import verify_daemon as vd
+    import verify_integrity as vi
+
+    daemon = vd.Daemon(vi.DEFAULT_BACKEND, None, True, 1.0)
+
+    def ask(fn, *args):
+        try:
+            return fn(*args)
+        except vd.QueryError as e:
+            return [e.status, str(e)]
+"""
+DOC008 = "real_structure_documentation/docs/DOC008-APISpecification.md"
+
+
+def test_resolve_accepts_paths_names_and_doc_codes(project, run_python):
+    docs = project / "real_structure_documentation" / "docs"
+    for name in ("DOC050-Alpha.md", "DOC050-Beta.md"):
+        (docs / name).write_text("# Nuevo\n", encoding="utf-8")
+    results = run_python(DAEMON + """
+    print(json.dumps({q: ask(daemon.resolve, q) for q in [
+        "real_structure_documentation/docs/DOC008-APISpecification.md",
+        "./real_structure_documentation/docs/DOC008-APISpecification.md",
+        "DOC008-APISpecification.md",
+        "DOC008",
+        "DOC050-Alpha.md",
+        "DOC050",
+        "DOC999",
+    ]}))
+    """)
+    for query in (DOC008, "./" + DOC008, "DOC008-APISpecification.md", "DOC008"):
+        assert results[query] == DOC008
+    assert results["DOC050-Alpha.md"] == "real_structure_documentation/docs/DOC050-Alpha.md"
+    assert results["DOC050"][0] == 400
+    assert "ambiguo" in results["DOC050"][1] and "DOC050-Beta.md" in results["DOC050"][1]
+    assert results["DOC999"] == [404, "no se encontró: DOC999"]
+
+
+def test_handle_routes_queries(project, run_python):
+    results = run_python(DAEMON + """
+    queries = {
+        "status": ("GET", "/status", {}),
+        "file": ("GET", "/file", {"path": "DOC008"}),
+        "placeholders": ("GET", "/placeholders", {"doc": "DOC008"}),
+        "doc": ("GET", "/doc", {"doc": "DOC008"}),
+        "coverage": ("GET", "/coverage", {}),
+        "findings": ("GET", "/findings", {"severity": "warning"}),
+        "unknown": ("GET", "/nope", {}),
+        "method": ("PUT", "/status", {}),
+        "missing": ("GET", "/file", {}),
+        "shutdown": ("POST", "/shutdown", {}),
+    }
+    print(json.dumps({name: ask(daemon.handle, *args) for name, args in queries.items()}))
+    """)
+    assert results["status"]["files"] > 0 and results["status"]["watcher"]
+    assert results["file"]["path"] == DOC008
+    assert results["file"]["tracked"] and results["file"]["exists"]
+    assert results["placeholders"]["count"] == len(results["placeholders"]["placeholders"])
+    assert results["placeholders"]["count"] == results["file"]["placeholders"]
+    assert results["doc"]["manifest_entry"]["path"].endswith("DOC008-APISpecification.md")
+    assert set(results["coverage"]) == {"schemas_without_schema_refs", "schemas_not_in_guide",
+                                        "docs_not_in_guide", "docs_not_in_manifest", "missing_playbooks"}
+    assert all(f["severity"] == "warning" for f in results["findings"]["findings"])
+    assert results["unknown"] == [404, "ruta desconocida: /nope"]
+    assert results["method"][0] == 405
+    assert results["missing"] == [400, "falta el parámetro 'path'"]
+    assert results["shutdown"] == {"stopping": True}
@@ -0,0 +1,32 @@
+import os
+
+import pml_api
+import verify_integrity
+from integrity_store import SqliteStore
+
+
+def test_verify_reads_json_baseline_without_writing(project):
+    result = pml_api.verify(project)
+    assert result.integrity.has_baseline
+    assert result.integrity.errors == 0
+    assert not (project / "file_integrity.sqlite").exists()
+
+
+def test_sqlite_racy_cutoff_uses_filesystem_clock(tmp_path):
+    db = tmp_path / "file_integrity.sqlite"
+    store = SqliteStore(db, tmp_path)
+    record = {"path": "a.md", "hash": "0" * 64, "placeholder_count": 0, "analyzed_at": "x",
+              "stats": {"size": 1, "modified": 0.0, "mtime_ns": 1, "inode": 1, "lines": 1, "chars": 1, "words": 1}}
+    store.save("hoy", [record])
+    store.put(dict(record, path="b.md"))
+    store.load()
+    for rel in ("a.md", "b.md"):
+        assert 0 < store.racy_ns(rel) <= os.stat(db).st_mtime_ns
+    store.close()
+
+
+def test_stored_sqlite_baseline_reuses_stat(project):
+    verify_integrity.store_initial_state(backend="sqlite", base=project, quiet=True)
+    result = pml_api.verify(project)
+    assert result.integrity.errors == 0
+    assert result.integrity.counts["reused"] > 0
@@ -0,0 +1,157 @@
+import pytest
+
+
+def test_start_reads_json_baseline_without_writing(project, run_python):
+    result = run_python("""
+        import json
+        import watch
+        session = watch.WatchSession()
+        session.start()
+        print(json.dumps({"files": len(session.baseline), "counts": session.counts()}))
+    """)
+    assert result["files"] > 0
+    assert result["counts"]["error"] == 0
+    assert not (project / "file_integrity.sqlite").exists()
+
+
+DOCS = "real_structure_documentation/docs"
+PLAYBOOKS = "prompt_playbooks/documentation_playbooks"
+
+# Sesión arrancada en la copia; step(rutas) aplica un lote y anota [signo, código, ruta]
+SESSION = """
+    import json
+    import os
+    import watch
+    session = watch.WatchSession()
+    steps = [[[sign, f.code, f.path] for sign, f in session.start()]]
+
+    def step(*rels):
+        steps.append([[sign, f.code, f.path] for sign, f in session.apply(set(rels))])
+"""
+DONE = """
+    print(json.dumps({"steps": steps, "counts": session.counts()}))
+"""
+
+
+def run_session(run_python, code):
+    result = run_python(SESSION + code + DONE)
+    return result["steps"], result["counts"]
+
+
+def test_apply_doc_edit(run_python):
+    steps, _ = run_session(run_python, f"""
+    doc = "{DOCS}/DOC003-DesignSystem.md"
+    with open(doc, "a", encoding="utf-8") as f:
+        f.write("\\nTexto nuevo.\\n")
+    step(doc)
+    step(doc)
+    """)
+    doc = f"{DOCS}/DOC003-DesignSystem.md"
+    assert steps[0] == []
+    assert steps[1] == [["-", "integrity/template", doc], ["+", "integrity/in-progress", doc]]
+    # Sin cambios nuevos no hay diferencias
+    assert steps[2] == []
+
+
+def test_apply_playbook_deletion_and_restore(run_python):
+    steps, counts = run_session(run_python, f"""
+    pb = "{PLAYBOOKS}/playbook-v2-DOC002-ProductDefinition.md"
+    with open(pb, encoding="utf-8") as f:
+        data = f.read()
+    os.unlink(pb)
+    step(pb)
+    with open(pb, "w", encoding="utf-8") as f:
+        f.write(data)
+    step(pb)
+    """)
+    pb = f"{PLAYBOOKS}/playbook-v2-DOC002-ProductDefinition.md"
+    assert steps[1] == [["+", "playbook/missing", pb]]
+    assert steps[2] == [["-", "playbook/missing", pb]]
+    assert counts == {"error": 0, "warning": 0}
+
+
+def test_apply_new_doc_and_removal(run_python):
+    steps, _ = run_session(run_python, f"""
+    new = "{DOCS}/DOC099-Nuevo.md"
+    with open(new, "w", encoding="utf-8") as f:
+        f.write("# Nuevo\\n")
+    step(new)
+    counts = session.counts()
+    os.unlink(new)
+    step(new)
+    steps.append(counts)
+    """)
+    new = f"{DOCS}/DOC099-Nuevo.md"
+    added = [
+        ["+", "manifest/doc-unlisted", new],
+        ["+", "playbook/missing", f"{PLAYBOOKS}/playbook-v2-DOC099-Nuevo.md"],
+        ["+", "guide/doc-unindexed", "guides/USO_PLAYBOOKS_DOCS.md"],
+    ]
+    assert steps[1] == added
+    assert steps[2] == [["-"] + item[1:] for item in added]
+    assert steps[3] == {"error": 1, "warning": 2}
+
+
+def test_apply_full_rescan_reports_differences(run_python):
+    steps, _ = run_session(run_python, f"""
+    os.unlink("{PLAYBOOKS}/playbook-v2-DOC002-ProductDefinition.md")
+    step("*")
+    """)
+    assert steps[1] == [["+", "playbook/missing", f"{PLAYBOOKS}/playbook-v2-DOC002-ProductDefinition.md"]]
+
+
+def test_format_report():
+    import watch
+    from findings import Finding
+
+    lines = watch.format_report([("+", Finding("playbook/missing", "error", "Playbook faltante: x.md"))])
+    assert lines == ["  + ❌ Playbook faltante: x.md"]
+
+
+def _wait_for(watcher, timeout=5.0):
+    import time
+
+    deadline = time.time() + timeout
+    changed = set()
+    while time.time() < deadline and not changed:
+        changed = watcher.wait(0.5) or set()
+    return changed
+
+
+def test_polling_watcher_detects_edit_and_deletion(project):
+    import watch
+    from repo_index import RepoIndex
+
+    index = RepoIndex.build(project)
+    watcher = watch.PollingWatcher(project, index, interval=0.05)
+    doc = f"{DOCS}/DOC003-DesignSystem.md"
+    path = project / doc
+    path.write_text(path.read_text(encoding="utf-8") + "x", encoding="utf-8")
+    (project / PLAYBOOKS / "playbook-v2-DOC002-ProductDefinition.md").unlink()
+    assert _wait_for(watcher) == {doc, f"{PLAYBOOKS}/playbook-v2-DOC002-ProductDefinition.md"}
+    assert watcher.wait(0.05) is None
+
+
+def test_inotify_watcher_sees_files_in_new_folders(project):
+    import watch
+    from repo_index import RepoIndex
+
+    index = RepoIndex.build(project)
+    watcher = watch.make_watcher(project, index)
+    if not isinstance(watcher, watch.InotifyWatcher):
+        watcher.close()
+        pytest.skip("inotify no disponible")
+    try:
+        doc = f"{DOCS}/DOC003-DesignSystem.md"
+        with open(project / doc, "a", encoding="utf-8") as f:
+            f.write("x")
+        assert doc in _wait_for(watcher)
+        folder = project / "streaming_files" / "features" / "F900-nueva"
+        folder.mkdir()
+        (folder / "feature_spec.md").write_text("# F900\n", encoding="utf-8")
+        changed = _wait_for(watcher)
+        # La carpeta nueva se vigila al crearse; su contenido llega en el mismo lote o en el siguiente
+        changed |= watcher.wait(0.3) or set()
+        assert "streaming_files/features/F900-nueva/feature_spec.md" in changed
+    finally:
+        watcher.close()
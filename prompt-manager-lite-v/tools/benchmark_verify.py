@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Prompt Manager Lite - Benchmarks de los verificadores
+
+Genera repositorios sintéticos con la estructura real
+(real_structure_documentation/docs, schemas/master_blueprint_parts,
+prompt_playbooks/documentation_playbooks, streaming_files/*, manifest y guías)
+y mide `store`, `verify`, `verify --paranoid` y cada `check_*` de
+verify_docs_and_schemas.py: tiempo, RSS máximo y archivos/segundo.
+
+Cada fase se ejecuta en un proceso nuevo para que el RSS sea el de esa fase,
+con las herramientas copiadas dentro del árbol sintético (así detectan su raíz
+igual que en un proyecto real). Las cachés de `.verify_cache/` se borran antes
+de cada fase: los tiempos son en frío.
+
+Uso:
+    python3 tools/benchmark_verify.py run --sizes 100 1000 10000 --output bench.json
+    python3 tools/benchmark_verify.py run --sizes 100 1000 --baseline bench.json
+    python3 tools/benchmark_verify.py compare bench.json nuevo.json --threshold 0.2
+    python3 tools/benchmark_verify.py generate /tmp/arbol --docs 5000 --density 0.5
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent
+
+PHASES = [
+    'store',
+    'verify',
+    'verify_paranoid',
+    'check_manifest',
+    'check_manifest_schema',
+    'check_playbooks',
+    'check_schemas_covered_in_guide',
+    'check_schema_refs_coverage',
+    'check_docs_indexed_in_guide',
+]
+
+STREAMING = {
+    'features': ('F', 'feature_spec.md'),
+    'bugs': ('B', 'bug_report.md'),
+    'operations': ('T', 'task_spec.md'),
+    'proposals': ('IDEA', 'idea_spec.md'),
+}
+
+PLACEHOLDERS = [
+    '[Nombre del Proyecto]',
+    '[Describa la idea en una o dos frases.]',
+    '{{variable}}',
+    '`[Ruta absoluta al directorio raíz del proyecto]`',
+    '[ID]',
+]
+
+WORDS = (
+    'el sistema valida cada solicitud antes de persistir los datos del usuario '
+    'y registra un evento de auditoría con la marca de tiempo correspondiente'
+).split()
+
+
+# ----------------------------------------------------------------------------
+# Generador de árboles sintéticos
+# ----------------------------------------------------------------------------
+
+def _body(rng, lines, density):
+    out = []
+    for i in range(lines):
+        if i % 12 == 0:
+            out.append(f"## Sección {i // 12 + 1}")
+            continue
+        line = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 14)))
+        if rng.random() < density:
+            line = f"{line} {rng.choice(PLACEHOLDERS)}"
+        out.append(line)
+    return '\n'.join(out) + '\n'
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+
+
+def generate_tree(root, docs, density=0.3, seed=0, doc_lines=40):
+    """Crea un proyecto sintético con `docs` DOCs; devuelve un resumen de tamaños."""
+    rng = random.Random(seed)
+    root = Path(root)
+    rsd = root / 'real_structure_documentation'
+    schemas_dir = rsd / 'schemas'
+    parts_dir = schemas_dir / 'master_blueprint_parts'
+    pb_dir = root / 'prompt_playbooks' / 'documentation_playbooks'
+    (root / 'manifests').mkdir(parents=True, exist_ok=True)
+    (root / 'guides').mkdir(parents=True, exist_ok=True)
+
+    # Schemas: el schema real del manifest + partes sintéticas
+    n_schemas = max(5, docs // 10)
+    real_manifest_schema = None
+    for base in (TOOLS_DIR.parent / 'real_structure_documentation' / 'schemas', TOOLS_DIR.parent / 'schemas'):
+        candidate = base / 'master_blueprint_parts' / 'documentationManifest.json'
+        if candidate.exists():
+            real_manifest_schema = candidate.read_text(encoding='utf-8')
+            break
+    _write(parts_dir / 'documentationManifest.json', real_manifest_schema or json.dumps({'type': 'object'}))
+    schema_names = [f'part{i:05d}.json' for i in range(n_schemas)]
+    for name in schema_names:
+        _write(parts_dir / name, json.dumps({
+            '$schema': 'http://json-schema.org/draft-07/schema#',
+            'title': f'[Título de {name}]' if rng.random() < density else name,
+            'type': 'object',
+            'properties': {f'field{j}': {'type': 'string'} for j in range(8)},
+        }, indent=2))
+    _write(schemas_dir / 'master_blueprint_schema.json', json.dumps({
+        '$schema': 'http://json-schema.org/draft-07/schema#',
+        'type': 'object',
+        'properties': {name[:-5]: {'$ref': f'master_blueprint_parts/{name}'} for name in schema_names},
+    }, indent=2))
+
+    # DOCs, playbooks y manifest
+    documents = []
+    doc_names = []
+    for i in range(docs):
+        basename = f'DOC{i:05d}-Documento{i}'
+        doc_names.append(basename)
+        _write(rsd / 'docs' / f'{basename}.md', f"# {basename}\n\n" + _body(rng, doc_lines, density))
+        _write(pb_dir / f'playbook-v2-{basename}.md', f"# Playbook {basename}\n\n" + _body(rng, 10, 0))
+        documents.append({
+            'id': basename.split('-')[0],
+            'title': basename,
+            'path': f'real_structure_documentation/docs/{basename}.md',
+            'ownerAgent': 'Documentation Architect',
+            'status': rng.choice(['draft', 'review', 'approved']),
+            'schemaRefs': [f'real_structure_documentation/schemas/master_blueprint_parts/{schema_names[i % n_schemas]}'],
+        })
+    _write(root / 'manifests' / 'documentation_manifest.json', json.dumps({'documents': documents}, indent=2))
+
+    # Guías que mencionan todos los DOCs y schemas
+    _write(root / 'guides' / 'USO_PLAYBOOKS_DOCS.md', "# Índice DOCs ↔ Playbooks\n\n" + ''.join(
+        f"- {name.split('-')[0]}: `{name}` → `playbook-v2-{name}.md`\n" for name in doc_names
+    ))
+    _write(root / 'guides' / 'CONEXION_SCHEMAS_DOCS.md', "# Conexión Schemas ↔ Docs\n\n" + ''.join(
+        f"- `real_structure_documentation/schemas/master_blueprint_parts/{name}`\n" for name in schema_names
+    ) + "- `real_structure_documentation/schemas/master_blueprint_schema.json`\n"
+        "- `real_structure_documentation/schemas/master_blueprint_parts/documentationManifest.json`\n")
+
+    # streaming_files: plantilla + un elemento por cada 20 DOCs
+    n_items = max(1, docs // 20)
+    for folder, (prefix, spec) in STREAMING.items():
+        base = root / 'streaming_files' / folder
+        _write(base / 'manifest.json', json.dumps({'description': f'Manifiestos de {folder}.'}))
+        _write(base / 'template.md', f"# [Título]\n\n" + _body(rng, doc_lines, max(density, 0.5)))
+        for i in range(n_items):
+            _write(base / f'{prefix}{i:03d}-Elemento-{i}' / spec, f"# {prefix}{i:03d}\n\n" + _body(rng, doc_lines, density))
+
+    # Herramientas copiadas dentro del árbol para que detecten su raíz
+    tools = root / 'tools'
+    tools.mkdir(exist_ok=True)
+    for script in TOOLS_DIR.glob('*.py'):
+        shutil.copy2(script, tools / script.name)
+
+    return {'docs': docs, 'schemas': n_schemas + 1, 'streaming_items': n_items * len(STREAMING)}
+
+
+# ----------------------------------------------------------------------------
+# Ejecución de una fase (en un proceso hijo)
+# ----------------------------------------------------------------------------
+
+def _run_phase(root, phase, jobs):
+    root = Path(root)
+    sys.path.insert(0, str(root / 'tools'))
+    import verify_docs_and_schemas as vds
+    import verify_integrity as vi
+    from repo_index import RepoIndex
+
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        stdout = sys.stdout
+        sys.stdout = devnull
+        try:
+            if phase in ('store', 'verify', 'verify_paranoid'):
+                start = time.perf_counter()
+                if phase == 'store':
+                    vi.store_initial_state(jobs=jobs)
+                else:
+                    vi.verify_file_integrity(paranoid=phase == 'verify_paranoid', jobs=jobs)
+                wall = time.perf_counter() - start
+                files = len(vi.tracked_files())
+            else:
+                index = RepoIndex.build(vds.BASE)
+                manifest = vds.load_json(vds.MANIFEST_PATH)
+                docs = vds.list_docs(index)
+                schemas = vds.list_schema_files(index)
+                pb_names = vds.list_playbooks(index)
+                calls = {
+                    'check_manifest': (lambda: vds.check_manifest(manifest, docs), len(docs)),
+                    'check_manifest_schema': (lambda: vds.check_manifest_schema(manifest), len(manifest['documents'])),
+                    'check_playbooks': (lambda: vds.check_playbooks(docs, pb_names), len(docs)),
+                    'check_schemas_covered_in_guide': (lambda: vds.check_schemas_covered_in_guide(schemas, vds.GUIDE_CONN), len(schemas)),
+                    'check_schema_refs_coverage': (lambda: vds.check_schema_refs_coverage(schemas, manifest), len(schemas)),
+                    'check_docs_indexed_in_guide': (lambda: vds.check_docs_indexed_in_guide(docs, vds.GUIDE_PB_DOCS), len(docs)),
+                }
+                call, files = calls[phase]
+                start = time.perf_counter()
+                call()
+                wall = time.perf_counter() - start
+        finally:
+            sys.stdout = stdout
+
+    # ru_maxrss: KiB en Linux, bytes en macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss //= 1024
+    print(json.dumps({'wall_s': wall, 'peak_rss_kb': rss, 'files': files}))
+
+
+def measure(root, phase, jobs=None):
+    """Lanza una fase en un proceso nuevo y devuelve sus métricas."""
+    shutil.rmtree(Path(root) / '.verify_cache', ignore_errors=True)
+    cmd = [sys.executable, str(Path(__file__).resolve()), '_phase', str(root), phase]
+    if jobs:
+        cmd += ['--jobs', str(jobs)]
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result['files_per_s'] = result['files'] / result['wall_s'] if result['wall_s'] > 0 else None
+    return result
+
+
+def run_suite(sizes, density, jobs=None, seed=0, phases=PHASES, keep=None):
+    results = []
+    for size in sizes:
+        workdir = Path(keep) / f'docs-{size}' if keep else Path(tempfile.mkdtemp(prefix=f'pml-bench-{size}-'))
+        try:
+            start = time.perf_counter()
+            generate_tree(workdir, size, density=density, seed=seed)
+            print(f"🏗️  Árbol sintético de {size} DOCs generado en {time.perf_counter() - start:.2f}s")
+            for phase in phases:
+                result = measure(workdir, phase, jobs)
+                result.update({'size': size, 'density': density, 'phase': phase})
+                results.append(result)
+                print(f"   {phase:<32} {result['wall_s']:>9.4f}s  {result['peak_rss_kb']:>8} KiB  "
+                      f"{result['files_per_s'] or 0:>10.0f} archivos/s")
+        finally:
+            if not keep:
+                shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'jobs': jobs,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+# ----------------------------------------------------------------------------
+# Comparación con una línea base
+# ----------------------------------------------------------------------------
+
+def compare(baseline, current, threshold=0.2, min_delta=0.005):
+    """Devuelve las fases más lentas que la línea base por encima del umbral.
+
+    `min_delta` (segundos) evita marcar como regresión el ruido de fases muy cortas.
+    """
+    before = {(r['size'], r['density'], r['phase']): r for r in baseline['results']}
+    regressions = []
+    for r in current['results']:
+        old = before.get((r['size'], r['density'], r['phase']))
+        if old is None or old['wall_s'] <= 0:
+            continue
+        ratio = r['wall_s'] / old['wall_s']
+        if ratio > 1 + threshold and r['wall_s'] - old['wall_s'] > min_delta:
+            regressions.append({
+                'size': r['size'],
+                'phase': r['phase'],
+                'baseline_s': old['wall_s'],
+                'current_s': r['wall_s'],
+                'ratio': ratio,
+            })
+    return regressions
+
+
+def _report_regressions(regressions, threshold):
+    if not regressions:
+        print(f"✅ Sin regresiones (umbral {threshold:.0%})")
+        return 0
+    print(f"❗ {len(regressions)} regresiones (umbral {threshold:.0%}):")
+    for r in regressions:
+        print(f"   - {r['phase']} @ {r['size']} DOCs: {r['baseline_s']:.4f}s → {r['current_s']:.4f}s (x{r['ratio']:.2f})")
+    return 1
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de los verificadores de Prompt Manager Lite")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help="genera árboles sintéticos y mide todas las fases")
+    run.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                     help="número de DOCs por árbol (p. ej. 100 1000 10000 100000)")
+    run.add_argument('--density', type=float, default=0.3,
+                     help="fracción de líneas con placeholder (0-1)")
+    run.add_argument('--phases', nargs='+', choices=PHASES, default=PHASES)
+    run.add_argument('--jobs', '-j', type=int, default=None, metavar='N')
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--output', '-o', help="archivo JSON de resultados")
+    run.add_argument('--baseline', help="JSON de una ejecución anterior con el que comparar")
+    run.add_argument('--threshold', type=float, default=0.2,
+                     help="ralentización relativa tolerada antes de marcar regresión")
+    run.add_argument('--keep', metavar='DIR', help="conserva los árboles generados en DIR")
+
+    cmp_ = sub.add_parser('compare', help="compara dos JSON de resultados")
+    cmp_.add_argument('baseline')
+    cmp_.add_argument('current')
+    cmp_.add_argument('--threshold', type=float, default=0.2)
+
+    gen = sub.add_parser('generate', help="solo genera un árbol sintético")
+    gen.add_argument('root')
+    gen.add_argument('--docs', type=int, default=1000)
+    gen.add_argument('--density', type=float, default=0.3)
+    gen.add_argument('--seed', type=int, default=0)
+
+    phase = sub.add_parser('_phase')  # uso interno: una fase en un proceso hijo
+    phase.add_argument('root')
+    phase.add_argument('phase', choices=PHASES)
+    phase.add_argument('--jobs', type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == '_phase':
+        _run_phase(args.root, args.phase, args.jobs)
+        return 0
+    if args.command == 'generate':
+        print(json.dumps(generate_tree(args.root, args.docs, args.density, args.seed)))
+        return 0
+    if args.command == 'compare':
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.current, encoding='utf-8') as f:
+            current = json.load(f)
+        return _report_regressions(compare(baseline, current, args.threshold), args.threshold)
+
+    report = run_suite(args.sizes, args.density, jobs=args.jobs, seed=args.seed,
+                       phases=args.phases, keep=args.keep)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Resultados guardados en {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        return _report_regressions(compare(baseline, report, args.threshold), args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Resultados tipados de los verificadores y destinos de salida (--format)
+
+Cada comprobación genera `Finding` (código, severidad, mensaje, ruta y DOCs o
+schemas relacionados) a medida que avanza; un `Sink` los escribe en cuanto
+llegan, sin acumular el informe ni truncarlo:
+
+- text:   salida legible (la de siempre), una línea por hallazgo
+- ndjson: un objeto JSON por línea; al final un registro "summary"
+- sarif:  SARIF 2.1.0 escrito en streaming (results primero, reglas al cerrar)
+
+Con --fail-fast el sink lanza `FailFast` tras escribir el primer error; los
+verificadores lo capturan y terminan con código 1.
+"""
+from __future__ import annotations
+import json
+import sys
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+SEVERITIES = ("error", "warning", "note")
+# Comprobación superada: la generan los check_* (listas "ok") pero los sinks no la emiten
+PASS = "none"
+FORMATS = ("text", "ndjson", "sarif")
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# Iconos de la salida de texto; por defecto se usa el de la severidad
+_ICONS = {
+    "error": "❌",
+    "warning": "⚠️ ",
+    "note": "ℹ️ ",
+    "integrity/completed": "✅",
+    "integrity/in-progress": "🔄",
+    "integrity/modified": "⚠️ ",
+    "integrity/template": "📝",
+    "integrity/unchanged": "✨",
+    "integrity/missing": "🚫",
+    "integrity/new": "🆕",
+    "integrity/sections": "   📑",
+}
+
+
+class FailFast(Exception):
+    """Se lanza tras emitir el primer error cuando se pidió --fail-fast."""
+
+    def __init__(self, finding: "Finding"):
+        super().__init__(finding.message)
+        self.finding = finding
+
+
+class Finding:
+    """Un hallazgo de una comprobación."""
+
+    __slots__ = ("code", "severity", "message", "path", "related")
+
+    def __init__(self, code: str, severity: str, message: str,
+                 path: Optional[str] = None, related: Iterable[str] = ()):
+        self.code = code
+        self.severity = severity
+        self.message = message
+        self.path = path
+        self.related = tuple(related)
+
+    def to_dict(self) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"code": self.code, "severity": self.severity, "message": self.message}
+        if self.path:
+            record["path"] = self.path
+        if self.related:
+            record["related"] = list(self.related)
+        return record
+
+    def __repr__(self) -> str:
+        return f"Finding({self.code!r}, {self.severity!r}, {self.message!r})"
+
+
+class Sink(ABC):
+    """Destino de hallazgos; solo guarda contadores por severidad.
+
+    Las subclases implementan write() (un hallazgo ya contado).
+    """
+
+    human = False
+
+    def __init__(self, stream: TextIO, tool: str, fail_fast: bool = False):
+        self.stream = stream
+        self.tool = tool
+        self.fail_fast = fail_fast
+        self.counts: Dict[str, int] = {s: 0 for s in SEVERITIES}
+
+    def emit(self, finding: Finding) -> None:
+        if finding.severity == PASS:
+            return
+        self.counts[finding.severity] += 1
+        self.write(finding)
+        if self.fail_fast and finding.severity == "error":
+            raise FailFast(finding)
+
+    def emit_all(self, findings: Iterable[Finding]) -> None:
+        for finding in findings:
+            self.emit(finding)
+
+    @abstractmethod
+    def write(self, finding: Finding) -> None:
+        """Escribe un hallazgo que no es PASS."""
+
+    def info(self, text: str = "") -> None:
+        """Texto para personas (cabeceras, resúmenes); los formatos de máquina lo ignoran."""
+
+    def close(self, summary: Optional[Dict[str, Any]] = None) -> None:
+        self.stream.flush()
+
+    @property
+    def failed(self) -> bool:
+        return self.counts["error"] > 0
+
+
+def text_line(finding: Finding) -> str:
+    """Línea legible de un hallazgo, con el icono de su código o de su severidad."""
+    icon = _ICONS.get(finding.code) or _ICONS[finding.severity]
+    return f"{icon} {finding.message}"
+
+
+class TextSink(Sink):
+    human = True
+
+    def write(self, finding: Finding) -> None:
+        print(text_line(finding), file=self.stream)
+
+    def info(self, text: str = "") -> None:
+        print(text, file=self.stream)
+
+
+class NdjsonSink(Sink):
+    def write(self, finding: Finding) -> None:
+        record = {"type": "finding", "tool": self.tool, **finding.to_dict()}
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+    def close(self, summary: Optional[Dict[str, Any]] = None) -> None:
+        record = {"type": "summary", "tool": self.tool, "counts": self.counts}
+        if summary:
+            record.update(summary)
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        super().close()
+
+
+class SarifSink(Sink):
+    """SARIF 2.1.0 en streaming: los results se escriben según llegan.
+
+    Las reglas (un id por código) se acumulan y se escriben en `tool` al
+    cerrar; su número está acotado por los códigos existentes, no por el
+    tamaño del árbol.
+    """
+
+    def __init__(self, stream: TextIO, tool: str, fail_fast: bool = False):
+        super().__init__(stream, tool, fail_fast)
+        self.rules: Dict[str, str] = {}
+        self._first = True
+        self.stream.write(
+            '{"version": "2.1.0", "$schema": ' + json.dumps(SARIF_SCHEMA)
+            + ', "runs": [{"results": ['
+        )
+
+    def write(self, finding: Finding) -> None:
+        self.rules.setdefault(finding.code, finding.severity)
+        result: Dict[str, Any] = {
+            "ruleId": finding.code,
+            "level": finding.severity,
+            "message": {"text": finding.message},
+        }
+        if finding.path:
+            result["locations"] = [{"physicalLocation": {"artifactLocation": {"uri": finding.path}}}]
+        if finding.related:
+            result["properties"] = {"related": list(finding.related)}
+        self.stream.write(("\n" if self._first else ",\n") + json.dumps(result, ensure_ascii=False))
+        self._first = False
+        self.stream.flush()
+
+    def close(self, summary: Optional[Dict[str, Any]] = None) -> None:
+        driver = {
+            "name": self.tool,
+            "rules": [
+                {"id": code, "defaultConfiguration": {"level": level}}
+                for code, level in sorted(self.rules.items())
+            ],
+        }
+        properties = {"counts": self.counts, **(summary or {})}
+        self.stream.write(
+            "\n], " + '"tool": ' + json.dumps({"driver": driver}, ensure_ascii=False)
+            + ', "properties": ' + json.dumps(properties, ensure_ascii=False) + "}]}\n"
+        )
+        super().close()
+
+
+class ListSink(Sink):
+    """Guarda los hallazgos en memoria (uso como biblioteca); no escribe nada."""
+
+    def __init__(self, tool: str, fail_fast: bool = False):
+        super().__init__(None, tool, fail_fast)
+        self.findings: List[Finding] = []
+
+    def write(self, finding: Finding) -> None:
+        self.findings.append(finding)
+
+    def close(self, summary: Optional[Dict[str, Any]] = None) -> None:
+        pass
+
+
+_SINKS = {"text": TextSink, "ndjson": NdjsonSink, "sarif": SarifSink}
+
+
+def make_sink(fmt: str, tool: str, stream: Optional[TextIO] = None, fail_fast: bool = False) -> Sink:
+    return _SINKS[fmt](stream or sys.stdout, tool, fail_fast)
+
+
+def add_report_arguments(parser) -> None:
+    """Añade --format, --output y --fail-fast a un parser de argparse."""
+    parser.add_argument("--format", choices=FORMATS, default="text",
+                        help="formato de salida de los hallazgos (por defecto: text)")
+    parser.add_argument("--output", "-o", default=None, metavar="ARCHIVO",
+                        help="escribe los hallazgos en ARCHIVO en lugar de la salida estándar")
+    parser.add_argument("--fail-fast", action="store_true",
+                        help="se detiene en el primer error (código de salida 1)")
+
+
+def open_sink(args, tool: str) -> Sink:
+    stream = open(args.output, "w", encoding="utf-8") if args.output else None
+    return make_sink(args.format, tool, stream, args.fail_fast)
+
+
+def close_sink(sink: Sink, summary: Optional[Dict[str, Any]] = None) -> None:
+    sink.close(summary)
+    if sink.stream not in (None, sys.stdout):
+        sink.stream.close()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Índice de metadatos de los DOCs (frontmatter)
+
+Lee solo el bloque de frontmatter inicial de cada DOC (`---` … `---`) y se
+detiene en el delimitador de cierre, sin cargar el cuerpo. Los DOCs sin
+frontmatter cuestan una línea. Si no hay delimitador de cierre en las
+primeras MAX_HEADER_LINES líneas, el `---` inicial se trata como una
+línea horizontal y no como frontmatter.
+
+Entiende el subconjunto de YAML de la plantilla recomendada en
+guides/USO_PLAYBOOKS_DOCS.md:
+- `clave: valor`, con comillas opcionales y `# comentarios`
+- listas en línea (`clave: [a, b]`) y en bloque (`clave:` seguido de `  - a`)
+
+Lo demás (mapas anidados, multilínea) se ignora. Los resultados se cachean
+por stat (mtime y tamaño) en .verify_cache/frontmatter.json, así que un DOC
+que no cambió no se vuelve a abrir.
+"""
+from __future__ import annotations
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DELIMITER = "---"
+# YAML también admite `...` como cierre del documento
+CLOSERS = ("---", "...")
+MAX_HEADER_LINES = 200
+CACHE_VERSION = 1
+
+_KEY = re.compile(r"^([A-Za-z_][\w-]*)\s*:(?:\s+|$)(.*)$")
+
+
+def read_header(path: Path) -> Optional[List[str]]:
+    """Líneas entre los delimitadores del frontmatter inicial, o None si no tiene."""
+    with open(path, "r", encoding="utf-8") as f:
+        if f.readline().rstrip() != DELIMITER:
+            return None
+        lines: List[str] = []
+        for line in f:
+            line = line.rstrip("\r\n")
+            if line.rstrip() in CLOSERS:
+                return lines
+            if len(lines) == MAX_HEADER_LINES:
+                break
+            lines.append(line)
+    return None
+
+
+def _scalar(text: str) -> str:
+    text = text.strip()
+    if text[:1] in ("'", '"'):
+        end = text.find(text[0], 1)
+        if end != -1:
+            return text[1:end]
+    cut = text.find(" #")
+    if cut != -1:
+        text = text[:cut]
+    return "" if text.startswith("#") else text.rstrip()
+
+
+def parse_header(lines: List[str]) -> Dict[str, Any]:
+    """Claves de primer nivel del frontmatter: cadenas o listas de cadenas."""
+    meta: Dict[str, Any] = {}
+    key = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if line[0] in " \t-":
+            # Elemento de una lista en bloque de la última clave sin valor
+            if key is not None and (stripped == "-" or stripped.startswith("- ")):
+                if meta[key] == "":
+                    meta[key] = []
+                if isinstance(meta[key], list):
+                    meta[key].append(_scalar(stripped[1:]))
+            continue
+        match = _KEY.match(line)
+        if match is None:
+            key = None
+            continue
+        key, raw = match.group(1), match.group(2).strip()
+        if raw.startswith("[") and raw.endswith("]"):
+            meta[key] = [_scalar(item) for item in raw[1:-1].split(",") if item.strip()]
+        else:
+            meta[key] = _scalar(raw)
+    return meta
+
+
+def read_frontmatter(path: Path) -> Optional[Dict[str, Any]]:
+    """Frontmatter de un archivo ya interpretado, o None si no tiene."""
+    lines = read_header(path)
+    return None if lines is None else parse_header(lines)
+
+
+def as_list(value: Any) -> List[str]:
+    """Valor de una clave que admite lista o cadena suelta (`schemaRefs: x.json`)."""
+    if isinstance(value, list):
+        return value
+    return [value] if value else []
+
+
+class FrontmatterIndex:
+    """Frontmatter de los DOCs de un proyecto, cacheado por stat."""
+
+    def __init__(self, base: Path, cache_dir: Optional[Path] = None):
+        self.base = Path(base)
+        self.cache_path = Path(cache_dir) / "frontmatter.json" if cache_dir else None
+        self.entries: Dict[str, list] = {}
+        self.dirty = False
+        self.read = 0  # archivos abiertos (no servidos desde la caché)
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(cached, dict) and cached.get("version") == CACHE_VERSION:
+            self.entries = cached.get("entries", {})
+
+    def get(self, path: Path, st: Optional[os.stat_result] = None) -> Optional[Dict[str, Any]]:
+        """Frontmatter de `path` (None si no tiene); `st` evita otro stat si ya se conoce.
+
+        Lanza OSError o UnicodeDecodeError si el archivo no se puede leer.
+        """
+        try:
+            rel = path.relative_to(self.base).as_posix()
+        except ValueError:
+            rel = path.as_posix()
+        st = st or os.stat(path)
+        entry = self.entries.get(rel)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2]
+        meta = read_frontmatter(path)
+        self.read += 1
+        self.entries[rel] = [st.st_mtime_ns, st.st_size, meta]
+        self.dirty = True
+        return meta
+
+    def save(self) -> None:
+        if not self.dirty or self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "entries": self.entries}, f, ensure_ascii=False)
+        os.replace(tmp, self.cache_path)
+        self.dirty = False
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Prompt Manager Lite - Lectura directa de `.git/index`
+
+Modo `--git` de verify_integrity.py: el índice de git ya guarda, para cada
+archivo versionado, su blob id y los datos de stat con los que se calculó.
+Si el stat actual coincide con el del índice (y la entrada no es "racy"), el
+contenido del archivo es exactamente ese blob y no hace falta abrirlo.
+
+Solo lee archivos locales del repositorio (sin ejecutar git ni usar red).
+Soporta las versiones 2, 3 y 4 del índice y repos SHA-1 o SHA-256. Con un
+índice dividido (split index) no se puede confiar en las entradas y se
+devuelve None, igual que fuera de un repositorio git.
+"""
+
+import hashlib
+import os
+import struct
+from pathlib import Path
+
+_HEADER = struct.Struct('>4sLL')
+_ENTRY = struct.Struct('>10L')  # ctime s/ns, mtime s/ns, dev, ino, mode, uid, gid, size
+
+_FLAG_ASSUME_VALID = 0x8000
+_FLAG_EXTENDED = 0x4000
+_EXT_SKIP_WORKTREE = 0x4000
+_EXT_INTENT_TO_ADD = 0x2000
+_NAME_MASK = 0x0FFF
+_MASK32 = 0xFFFFFFFF
+
+
+class GitIndexError(Exception):
+    """El archivo de índice no tiene un formato que sepamos leer."""
+
+
+def find_git_dir(start):
+    """Devuelve (raíz del árbol de trabajo, directorio git) subiendo desde start, o None."""
+    start = Path(start).resolve()
+    for top in (start, *start.parents):
+        dot_git = top / '.git'
+        if dot_git.is_dir():
+            return top, dot_git
+        if dot_git.is_file():
+            # Worktrees y submódulos: ".git" es un archivo "gitdir: <ruta>"
+            with open(dot_git, 'r', encoding='utf-8') as f:
+                line = f.readline().strip()
+            if line.startswith('gitdir:'):
+                return top, (top / line[len('gitdir:'):].strip()).resolve()
+    return None
+
+
+def _object_format(git_dir):
+    """'sha1' o 'sha256' según extensions.objectformat de la config del repo."""
+    common = git_dir
+    commondir = git_dir / 'commondir'
+    if commondir.exists():
+        common = (git_dir / commondir.read_text(encoding='utf-8').strip()).resolve()
+    config = common / 'config'
+    if config.exists():
+        for line in config.read_text(encoding='utf-8', errors='replace').splitlines():
+            key, _, value = line.partition('=')
+            if key.strip().lower() == 'objectformat' and value.strip().lower() == 'sha256':
+                return 'sha256'
+    return 'sha1'
+
+
+def blob_id(data, algo='sha1'):
+    """Id de objeto git de un blob con este contenido (sin filtros de limpieza)."""
+    h = hashlib.new(algo)
+    h.update(b'blob %d\0' % len(data))
+    h.update(data)
+    return h.hexdigest()
+
+
+def _varint(data, pos):
+    """Entero de longitud variable del índice v4 (codificación "offset" de git)."""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, pos
+
+
+def parse_index(data, hash_size=20, prefix=''):
+    """Genera (ruta, stat_fields, blob_hex, flags, ext_flags) de las entradas bajo prefix."""
+    signature, version, count = _HEADER.unpack_from(data, 0)
+    if signature != b'DIRC' or version not in (2, 3, 4):
+        raise GitIndexError(f"índice git no soportado (firma {signature!r}, versión {version})")
+    pos = _HEADER.size
+    previous = b''
+    prefix_b = prefix.encode('utf-8')
+    for _ in range(count):
+        start = pos
+        fields = _ENTRY.unpack_from(data, pos)
+        pos += _ENTRY.size
+        blob = data[pos:pos + hash_size].hex()
+        pos += hash_size
+        (flags,) = struct.unpack_from('>H', data, pos)
+        pos += 2
+        ext_flags = 0
+        if version >= 3 and flags & _FLAG_EXTENDED:
+            (ext_flags,) = struct.unpack_from('>H', data, pos)
+            pos += 2
+        if version == 4:
+            strip, pos = _varint(data, pos)
+            end = data.index(b'\0', pos)
+            name = previous[:len(previous) - strip] + data[pos:end]
+            pos = end + 1
+        else:
+            length = flags & _NAME_MASK
+            end = pos + length if length < _NAME_MASK else data.index(b'\0', pos)
+            name = data[pos:end]
+            # Relleno con NUL hasta múltiplo de 8 (al menos un NUL)
+            pos = start + ((end - start) // 8 + 1) * 8
+        previous = name
+        if name.startswith(prefix_b):
+            yield name[len(prefix_b):].decode('utf-8', 'surrogateescape'), fields, blob, flags, ext_flags
+    # Extensiones: con split index las entradas anteriores no están completas
+    limit = len(data) - hash_size
+    while pos + 8 <= limit:
+        sig, size = struct.unpack_from('>4sL', data, pos)
+        if sig == b'link':
+            raise GitIndexError("índice dividido (split index) no soportado")
+        pos += 8 + size
+
+
+class GitIndex:
+    """Entradas de `.git/index` bajo una carpeta base, con su comprobación de limpieza."""
+
+    def __init__(self, entries, algo, index_mtime_ns):
+        self.entries = entries
+        self.algo = algo
+        self.index_mtime_ns = index_mtime_ns
+
+    @classmethod
+    def load(cls, base):
+        """Lee el índice del repositorio que contiene base; None si no hay repo o índice legible."""
+        found = find_git_dir(base)
+        if found is None:
+            return None
+        top, git_dir = found
+        index_path = git_dir / 'index'
+        try:
+            with open(index_path, 'rb') as f:
+                index_mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+                data = f.read()
+        except OSError:
+            return None
+        algo = _object_format(git_dir)
+        prefix = Path(base).resolve().relative_to(top).as_posix()
+        prefix = '' if prefix == '.' else prefix + '/'
+        entries = {}
+        try:
+            for rel, fields, blob, flags, ext_flags in parse_index(
+                data, hashlib.new(algo).digest_size, prefix
+            ):
+                entries[rel] = (fields, blob, flags, ext_flags)
+        except (GitIndexError, struct.error, ValueError, IndexError):
+            return None
+        return cls(entries, algo, index_mtime_ns)
+
+    def blob_for(self, rel, st):
+        """Blob id de rel si el archivo está limpio respecto al índice; si no, None.
+
+        Limpio significa: entrada en stage 0, sin assume-valid / skip-worktree /
+        intent-to-add, mismo stat (mtime, ctime, inode, uid, gid, tamaño) y
+        mtime anterior al del propio índice (si no, git tampoco puede fiarse).
+        """
+        entry = self.entries.get(rel)
+        if entry is None or st is None:
+            return None
+        fields, blob, flags, ext_flags = entry
+        if flags & 0x3000 or flags & _FLAG_ASSUME_VALID:
+            return None
+        if ext_flags & (_EXT_SKIP_WORKTREE | _EXT_INTENT_TO_ADD):
+            return None
+        ctime_s, ctime_ns, mtime_s, mtime_ns, _dev, ino, _mode, uid, gid, size = fields
+        mtime = st.st_mtime_ns
+        if mtime >= self.index_mtime_ns:
+            return None
+        ctime = st.st_ctime_ns
+        if (
+            (mtime // 1_000_000_000) & _MASK32 != mtime_s
+            or mtime % 1_000_000_000 != mtime_ns
+            or (ctime // 1_000_000_000) & _MASK32 != ctime_s
+            or ctime % 1_000_000_000 != ctime_ns
+            or st.st_ino & _MASK32 != ino
+            or st.st_uid & _MASK32 != uid
+            or st.st_gid & _MASK32 != gid
+            or st.st_size & _MASK32 != size
+        ):
+            return None
+        return blob
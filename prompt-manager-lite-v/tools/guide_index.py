@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Índice de cobertura de guías
+
+Responde "¿aparece X en la guía?" en O(1) tras un único recorrido del texto:
+todas las subcadenas buscadas (nombres de DOC, rutas de schemas) y los
+códigos que deben aparecer como palabra completa (DOC###, equivalente a
+`\\bDOC###\\b`) se compilan en un autómata Aho-Corasick y la guía se escanea
+una sola vez.
+
+El resultado se cachea en disco por guía, indexado por el SHA-256 de su
+contenido: mientras la guía no cambie solo se escanean las consultas nuevas.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class Automaton:
+    """Autómata Aho-Corasick sobre un conjunto de cadenas."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[str]] = [[]]
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._link()
+
+    def _add(self, pattern: str) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append(pattern)
+
+    def _link(self) -> None:
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def scan(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Genera (índice_final, patrón) por cada aparición en el texto."""
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for pattern in out[state]:
+                    yield i, pattern
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def find_present(text: str, substrings: Set[str], words: Set[str]) -> Tuple[Set[str], Set[str]]:
+    """Devuelve (subcadenas presentes, palabras presentes como palabra completa)."""
+    found_sub: Set[str] = set()
+    found_words: Set[str] = set()
+    if not substrings and not words:
+        return found_sub, found_words
+    n = len(text)
+    for end, pattern in Automaton(substrings | words).scan(text):
+        if pattern in substrings:
+            found_sub.add(pattern)
+        if pattern in words and pattern not in found_words:
+            start = end - len(pattern) + 1
+            before_ok = start == 0 or not _is_word_char(text[start - 1])
+            after_ok = end + 1 >= n or not _is_word_char(text[end + 1])
+            if before_ok and after_ok:
+                found_words.add(pattern)
+    return found_sub, found_words
+
+
+class GuideIndex:
+    """Presencia de subcadenas y palabras en una guía, cacheada por hash del contenido."""
+
+    def __init__(self, guide_path: Path, cache_dir: Optional[Path] = None, data: Optional[bytes] = None):
+        self.guide_path = Path(guide_path)
+        self.cache_path = (
+            Path(cache_dir) / f"guide-{self.guide_path.name}.json" if cache_dir else None
+        )
+        self._raw = b""
+        self._text: Optional[str] = None
+        self.digest = ""
+        self.substrings: Dict[str, bool] = {}
+        self.words: Dict[str, bool] = {}
+        self._load(data)
+
+    def _load(self, data: Optional[bytes] = None) -> None:
+        if data is None:
+            data = self.guide_path.read_bytes()
+        self.digest = hashlib.sha256(data).hexdigest()
+        self._raw = data
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return
+        if cached.get("sha256") == self.digest:
+            self.substrings = cached.get("substrings", {})
+            self.words = cached.get("words", {})
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self._raw.decode("utf-8")
+        return self._text
+
+    def prepare(self, substrings: Iterable[str] = (), words: Iterable[str] = ()) -> None:
+        """Escanea la guía una vez para todas las consultas que aún no están en caché."""
+        missing_sub = {s for s in substrings if s not in self.substrings}
+        missing_words = {w for w in words if w not in self.words}
+        if not missing_sub and not missing_words:
+            return
+        found_sub, found_words = find_present(self.text, missing_sub, missing_words)
+        for s in missing_sub:
+            self.substrings[s] = s in found_sub
+        for w in missing_words:
+            self.words[w] = w in found_words
+        self._save()
+
+    def _save(self) -> None:
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"sha256": self.digest, "substrings": self.substrings, "words": self.words},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp, self.cache_path)
+
+    def contains(self, needle: str) -> bool:
+        """Equivale a `needle in texto_guía` (requiere prepare() previo con esa subcadena)."""
+        return self.substrings[needle]
+
+    def has_word(self, word: str) -> bool:
+        """Equivale a `re.search(rf"\\b{word}\\b", texto_guía)` (requiere prepare() previo)."""
+        return self.words[word]
+
+
+class GuidePool:
+    """GuideIndex compartidos por contenido entre proyectos (verify_batch.py).
+
+    Dos guías con el mismo SHA-256 dan las mismas respuestas estén donde
+    estén: la segunda reutiliza el índice (y las consultas ya resueltas) de la
+    primera en lugar de escanearse otra vez.
+    """
+
+    def __init__(self) -> None:
+        self._by_digest: Dict[str, GuideIndex] = {}
+        self.shared = 0  # guías servidas desde el índice de otra ruta
+
+    def get(self, guide_path: Path, cache_dir: Optional[Path] = None) -> GuideIndex:
+        data = Path(guide_path).read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        guide = self._by_digest.get(digest)
+        if guide is None:
+            guide = GuideIndex(guide_path, cache_dir, data)
+            self._by_digest[digest] = guide
+        elif guide.guide_path != Path(guide_path):
+            self.shared += 1
+        return guide
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Grafo de dependencias y re-verificación por impacto (--changed-since)
+
+El grafo une los archivos que el resto de herramientas comprueban por
+separado (archivo → lo que depende de él):
+
+- schema   → schemas que lo referencian con `$ref` (master_blueprint_schema.json
+             compone master_blueprint_parts/*.json, que a su vez usan definitions.json)
+- schema   → DOCs que lo declaran en `schemaRefs` del manifest
+- playbook → el DOC cuyo playbook canónico (o alias) es
+- DOC      → el contraste de su frontmatter con el manifest
+- manifest → sus entradas, la validación contra su schema, la cobertura de
+             schemaRefs y el contraste con el frontmatter de los DOCs
+- guía     → la comprobación de cobertura de esa guía
+
+Dado un conjunto de cambios (git diff contra una referencia, o stat frente a
+la línea base de integridad) calcula qué comprobaciones y qué documentos se
+ven afectados y ejecuta solo esas, de modo que la verificación de un PR es
+proporcional al tamaño del diff y no al del árbol. Todo se resuelve sobre el
+Layout del proyecto (el del RepoIndex), no sobre el que contiene tools/.
+
+Uso:
+    python3 tools/verify.py --changed-since origin/main
+    python3 tools/verify.py --changed-since :baseline    # cambios frente a la línea base de integridad
+"""
+from __future__ import annotations
+import json
+import os
+import subprocess
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import verify_docs_and_schemas as vds
+import verify_integrity as vi
+from findings import FailFast, Finding, Sink
+from frontmatter import FrontmatterIndex
+from guide_index import GuidePool
+from profiling import Profiler, phase
+from repo_index import RepoIndex, classify
+from schema_validator import SchemaRegistry
+
+ADDED, MODIFIED, DELETED = "added", "modified", "deleted"
+# Referencia especial: cambios frente a la línea base de integridad en lugar de git
+BASELINE_REF = ":baseline"
+
+_GIT_STATUS = {"A": ADDED, "M": MODIFIED, "T": MODIFIED, "D": DELETED}
+# Aristas $ref por schema, cacheadas por (mtime_ns, tamaño) en el .verify_cache del proyecto
+EDGES_CACHE_NAME = "schema_deps.json"
+
+Changes = Dict[str, str]  # ruta relativa a la raíz del proyecto -> added | modified | deleted
+Key = Tuple[str, ...]
+
+
+class ChangeSourceError(Exception):
+    """No se pudo obtener la lista de cambios (referencia git inválida, sin repo, sin línea base…)."""
+
+
+def report_source_error(sink: Sink, error: ChangeSourceError) -> None:
+    """Informa por el sink (válido también en ndjson/sarif) de que no hay lista de cambios."""
+    try:
+        sink.emit(Finding("changes/source-error", "error", f"--changed-since: {error}"))
+    except FailFast:
+        pass
+
+
+def _schema_key(rel: str) -> str:
+    """Forma canónica 'schemas/...' de una ruta de schema (estructura antigua o nueva)."""
+    prefix = "real_structure_documentation/"
+    return rel[len(prefix):] if rel.startswith(prefix + "schemas/") else rel
+
+
+def _iter_refs(node: Any) -> Iterator[str]:
+    """Valores de `$ref` de un documento JSON, en cualquier profundidad."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                yield ref
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def _is_doc(rel: str, layout: vds.Layout) -> bool:
+    """Mismo criterio que vds.list_docs (DOC*.md directamente en una carpeta docs/)."""
+    path = layout.base / rel
+    return path.parent in layout.docs_dirs and path.name.startswith("DOC") and path.name.endswith(".md")
+
+
+def layout_of(index: RepoIndex) -> vds.Layout:
+    """Layout del proyecto indexado (el por defecto si es el que contiene tools/)."""
+    return vds.LAYOUT if index.base == vds.BASE else vds.Layout(index.base)
+
+
+class DependencyGraph:
+    """Aristas entre schemas, entradas del manifest, DOCs, playbooks y guías."""
+
+    def __init__(self, index: RepoIndex, manifest: dict, layout: Optional[vds.Layout] = None):
+        self.index = index
+        self.manifest = manifest
+        self.layout = layout = layout or layout_of(index)
+        self.docs = vds.list_docs(index, layout)
+        self.schemas = vds.list_schema_files(index, layout)
+        # schema -> schemas que lo referencian directamente con $ref
+        self.referenced_by: Dict[str, Set[str]] = defaultdict(set)
+        # clave canónica de schema -> DOCs que lo declaran en schemaRefs
+        self.schema_docs: Dict[str, Set[str]] = defaultdict(set)
+        # nombre de playbook (canónico o alias) -> DOCs
+        self.playbook_docs: Dict[str, Set[str]] = defaultdict(set)
+        for rel, refs in self._schema_edges().items():
+            for target in refs:
+                self.referenced_by[target].add(rel)
+        for entry in manifest.get("documents", []):
+            if not isinstance(entry, dict) or not isinstance(entry.get("path"), str):
+                continue
+            for sref in entry.get("schemaRefs", []):
+                self.schema_docs[_schema_key(sref)].add(entry["path"])
+        for doc in self.docs:
+            basename = doc.name[:-3]
+            for name in (vds.CANONICAL_PB_PATTERN.format(doc_basename=basename), *vds.ALIASES.get(basename, ())):
+                self.playbook_docs[name].add(layout.rel(doc))
+        manifest_schema = next(
+            (d / vds.MANIFEST_SCHEMA_REL for d in layout.schemas_dirs if (d / vds.MANIFEST_SCHEMA_REL).exists()), None
+        )
+        self.manifest_schema = layout.rel(manifest_schema) if manifest_schema else None
+
+    def _schema_edges(self) -> Dict[str, List[str]]:
+        """{schema: [schemas a los que apunta con $ref]}; solo se relee lo que cambió de stat."""
+        cache_path = self.layout.cache_dir / EDGES_CACHE_NAME
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
+        edges: Dict[str, List[str]] = {}
+        entries: Dict[str, list] = {}
+        dirty = False
+        for path in self.schemas:
+            rel = self.layout.rel(path)
+            st = self.index.stat(rel)
+            sig = [st.st_mtime_ns, st.st_size] if st else None
+            hit = cached.get(rel)
+            if hit is not None and sig is not None and hit[:2] == sig:
+                refs = hit[2]
+            else:
+                dirty = True
+                refs = self._read_refs(path, self.layout)
+            edges[rel] = refs
+            entries[rel] = [*(sig or [0, 0]), refs]
+        if dirty or entries.keys() != cached.keys():
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = cache_path.with_name(cache_path.name + ".tmp")
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(entries, f)
+                os.replace(tmp, cache_path)
+            except OSError:
+                pass
+        return edges
+
+    @staticmethod
+    def _read_refs(path: Path, layout: vds.Layout) -> List[str]:
+        try:
+            document = vds.load_json(path)
+        except (OSError, ValueError):
+            return []
+        targets: Set[str] = set()
+        for ref in _iter_refs(document):
+            file_part = ref.partition("#")[0]
+            if not file_part or file_part.startswith(("http://", "https://")):
+                continue
+            targets.add(layout.rel(Path(os.path.normpath(path.parent / file_part))))
+        return sorted(targets)
+
+    def dependents(self, schema_rel: str) -> Dict[str, str]:
+        """Schemas afectados por un cambio en schema_rel (él incluido) → schema del que dependen."""
+        reached = {schema_rel: schema_rel}
+        stack = [schema_rel]
+        while stack:
+            current = stack.pop()
+            for parent in self.referenced_by.get(current, ()):
+                if parent not in reached:
+                    reached[parent] = current
+                    stack.append(parent)
+        return reached
+
+    def impact(self, changes: Changes, old_manifest: Optional[dict] = None) -> "Impact":
+        """Comprobaciones y DOCs afectados por un conjunto de cambios."""
+        impact = Impact()
+        layout = self.layout
+        manifest_rel = layout.rel(layout.manifest_path)
+        guide_conn = layout.rel(layout.guide_conn)
+        guide_pb_docs = layout.rel(layout.guide_pb_docs)
+        for rel, status in sorted(changes.items()):
+            parts = tuple(rel.split("/"))
+            kind = classify(parts) if len(parts) >= 2 else None
+            if kind is None:
+                continue
+            impact.integrity.add(rel)
+            listed = status != MODIFIED
+            if kind == "doc" and _is_doc(rel, layout):
+                impact.checks.add(("frontmatter", rel))
+            if kind == "doc" and listed and _is_doc(rel, layout):
+                impact.checks.update({("manifest",), ("playbook", rel), ("guide_doc", rel)})
+            elif kind == "playbook" and listed:
+                for doc in self.playbook_docs.get(parts[-1], ()):
+                    impact.checks.add(("playbook", doc))
+            elif kind == "schema":
+                for schema, via in self.dependents(rel).items():
+                    if schema == self.manifest_schema:
+                        impact.checks.add(("manifest_schema",))
+                    for doc in self.schema_docs.get(_schema_key(schema), ()):
+                        impact.add_doc(doc, rel if schema == rel else f"{rel} (vía {schema})")
+                if listed:
+                    impact.checks.update({("schema_ref", rel), ("guide_schema", rel)})
+                    impact.checks.update(("frontmatter", layout.rel(d)) for d in self.docs)
+                    if _schema_key(rel) in self.schema_docs:
+                        impact.checks.add(("manifest",))
+            elif kind == "manifest" and rel == manifest_rel:
+                impact.checks.update({("manifest",), ("manifest_schema",)})
+                impact.checks.update(("schema_ref", layout.rel(s)) for s in self.schemas)
+                impact.checks.update(("frontmatter", layout.rel(d)) for d in self.docs)
+                for doc in self._changed_entries(old_manifest):
+                    impact.add_doc(doc, f"{manifest_rel} (entrada modificada)")
+            elif kind == "guide" and rel == guide_conn:
+                impact.checks.update(("guide_schema", layout.rel(s)) for s in self.schemas)
+            elif kind == "guide" and rel == guide_pb_docs:
+                impact.checks.update(("guide_doc", layout.rel(d)) for d in self.docs)
+        return impact
+
+    def _changed_entries(self, old_manifest: Optional[dict]) -> List[str]:
+        """DOCs cuya entrada del manifest cambió (solo si se conoce la versión anterior)."""
+        if old_manifest is None:
+            return []
+
+        def by_path(manifest: dict) -> Dict[str, Any]:
+            return {
+                d["path"]: d for d in manifest.get("documents", [])
+                if isinstance(d, dict) and isinstance(d.get("path"), str)
+            }
+
+        old, new = by_path(old_manifest), by_path(self.manifest)
+        return sorted(path for path in new if old.get(path) != new[path])
+
+
+class Impact:
+    """Resultado del análisis de impacto."""
+
+    __slots__ = ("checks", "integrity", "docs")
+
+    def __init__(self) -> None:
+        self.checks: Set[Key] = set()
+        self.integrity: Set[str] = set()  # archivos cuyo estado de integridad hay que recalcular
+        self.docs: Dict[str, List[str]] = {}  # DOC -> cambios que lo afectan
+
+    def add_doc(self, doc: str, reason: str) -> None:
+        reasons = self.docs.setdefault(doc, [])
+        if reason not in reasons:
+            reasons.append(reason)
+
+    def selected(self, kind: str) -> Set[str]:
+        return {key[1] for key in self.checks if key[0] == kind}
+
+    def findings(self) -> Iterator[Finding]:
+        for doc, reasons in sorted(self.docs.items()):
+            yield Finding("impact/doc-affected", "note",
+                          f"DOC afectado por cambios en {', '.join(reasons)}: {doc}", doc,
+                          related=[r.split(" ", 1)[0] for r in reasons])
+
+
+# -- origen de los cambios -----------------------------------------------------
+
+def _git(base: Path, *args: str) -> bytes:
+    """Salida de git ejecutado en la raíz del proyecto (las rutas de --relative son relativas a ella)."""
+    try:
+        result = subprocess.run(["git", *args], cwd=base, capture_output=True, check=False)
+    except OSError as e:
+        raise ChangeSourceError(f"no se pudo ejecutar git: {e}")
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", "replace").strip().splitlines()
+        raise ChangeSourceError(f"git {args[0]}: {message[-1] if message else 'error'}")
+    return result.stdout
+
+
+def changes_since_git(ref: str, base: Path = vds.BASE) -> Changes:
+    """Archivos del proyecto en base que difieren entre ref y el árbol de trabajo, más los no versionados."""
+    # Fuera de un repo `git diff` compara rutas (--no-index) y solo imprime su uso
+    _git(base, "rev-parse", "--git-dir")
+    try:
+        _git(base, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+    except ChangeSourceError:
+        raise ChangeSourceError(f"referencia git desconocida: {ref}")
+    changes: Changes = {}
+    fields = _git(base, "diff", "--name-status", "-z", "--no-renames", "--relative", ref, "--").split(b"\0")
+    for status, name in zip(fields[::2], fields[1::2]):
+        if status:
+            changes[os.fsdecode(name)] = _GIT_STATUS.get(status.decode()[:1], MODIFIED)
+    for name in _git(base, "ls-files", "--others", "--exclude-standard", "-z").split(b"\0"):
+        if name:
+            changes[os.fsdecode(name)] = ADDED
+    return changes
+
+
+def manifest_at(ref: str, layout: vds.Layout = vds.LAYOUT) -> Optional[dict]:
+    """Manifest en la revisión ref, o None si no existía o no es JSON válido."""
+    try:
+        data = _git(layout.base, "show", f"{ref}:./{layout.rel(layout.manifest_path)}")
+        return json.loads(data.decode("utf-8"))
+    except (ChangeSourceError, ValueError):
+        return None
+
+
+def changes_since_baseline(index: RepoIndex, backend: str = vi.DEFAULT_BACKEND) -> Changes:
+    """Cambios frente a la línea base de integridad.
+
+    Los archivos de la línea base se comparan por stat (como verify_integrity);
+    el resto de archivos indexados (manifest, guías, playbooks…) cuentan como
+    modificados si su mtime es posterior a la última escritura de la línea base.
+    Los borrados solo se detectan para archivos de la línea base.
+    """
+    store = vi.open_baseline(backend, index.base)
+    if not store.exists() and backend != "json" and (index.base / vi.HASH_FILE.name).exists():
+        # Como verify: se lee el JSON sin crear el sqlite
+        store = vi.open_baseline("json", index.base)
+    if not store.exists():
+        raise ChangeSourceError(f"{store.path} no existe (python3 tools/verify_integrity.py store)")
+    try:
+        _, baseline = store.load(placeholders=False)
+        written_ns = os.stat(store.path).st_mtime_ns
+    finally:
+        store.close()
+    changes: Changes = {}
+    for rel, record in baseline.items():
+        st = index.stat(rel)
+        if st is None:
+            changes[rel] = DELETED
+        elif not vi.stat_matches(record.get("stats"), st, store.racy_ns(rel)):
+            changes[rel] = MODIFIED
+    tracked = {f.rel for f in vi.tracked_files(index)}
+    for rel, indexed in index.files.items():
+        if rel in baseline:
+            continue
+        if rel in tracked:
+            changes[rel] = ADDED
+        elif indexed.stat.st_mtime_ns >= written_ns:
+            changes[rel] = MODIFIED
+    return changes
+
+
+def collect_changes(ref: str, index: RepoIndex, backend: str = vi.DEFAULT_BACKEND) -> Tuple[Changes, Optional[dict]]:
+    """(cambios, manifest anterior si se conoce) para --changed-since."""
+    if ref == BASELINE_REF:
+        return changes_since_baseline(index, backend), None
+    return changes_since_git(ref, index.base), manifest_at(ref, layout_of(index))
+
+
+# -- ejecución -----------------------------------------------------------------
+
+def _subset(paths: Iterable[Path], rels: Set[str], layout: vds.Layout) -> List[Path]:
+    return [p for p in paths if layout.rel(p) in rels]
+
+
+def run_checks(index: RepoIndex, changes: Changes, sink: Sink, profiler: Optional[Profiler] = None,
+               old_manifest: Optional[dict] = None, layout: Optional[vds.Layout] = None,
+               registry: Optional[SchemaRegistry] = None, guides: Optional[GuidePool] = None) -> Impact:
+    """Ejecuta las comprobaciones de verify_docs_and_schemas afectadas por changes.
+
+    layout, registry y guides son los de vds.main (proyecto verificado,
+    schemas compilados y guías compartidas). Devuelve el Impact para que el
+    llamador limite la verificación de integridad a `impact.integrity`.
+    """
+    layout = layout or layout_of(index)
+    manifest_path = layout.manifest_path
+    if manifest_path.exists():
+        with phase(profiler, "carga del manifest"):
+            manifest = vds.load_json(manifest_path)
+    else:
+        manifest = {"documents": []}
+        sink.emit(Finding("manifest/not-found", "warning", f"Manifest no encontrado: {manifest_path}",
+                          layout.rel(manifest_path)))
+    with phase(profiler, "grafo de dependencias"):
+        graph = DependencyGraph(index, manifest, layout)
+        impact = graph.impact(changes, old_manifest)
+
+    docs = graph.docs
+    playbook_docs = _subset(docs, impact.selected("playbook"), layout)
+    frontmatter_docs = _subset(docs, impact.selected("frontmatter"), layout)
+    guide_docs = _subset(docs, impact.selected("guide_doc"), layout)
+    ref_schemas = _subset(graph.schemas, impact.selected("schema_ref"), layout)
+    guide_schemas = _subset(graph.schemas, impact.selected("guide_schema"), layout)
+    total_checks = 3 + 3 * len(docs) + 2 * len(graph.schemas)
+    selected = (
+        len({("manifest",), ("manifest_schema",)} & impact.checks)
+        + len(playbook_docs) + len(frontmatter_docs) + len(guide_docs) + len(ref_schemas) + len(guide_schemas)
+    )
+    sink.info(f"🎯 {len(changes)} cambio(s) → {selected}/{total_checks} comprobaciones, "
+              f"{len(impact.docs)} DOC(s) afectados por schemas o manifest, "
+              f"{len(impact.integrity)} archivo(s) para integridad")
+
+    schema_paths = vds.schema_path_set(graph.schemas, layout)
+    if ("manifest",) in impact.checks:
+        with phase(profiler, "check_manifest"):
+            sink.emit_all(vds.iter_manifest(manifest, docs, layout, schema_paths))
+    if frontmatter_docs:
+        with phase(profiler, "check_frontmatter"):
+            frontmatter = FrontmatterIndex(layout.base, layout.cache_dir)
+            sink.emit_all(vds.iter_frontmatter(manifest, frontmatter_docs, frontmatter, schema_paths, index, layout))
+            frontmatter.save()
+    if ("manifest_schema",) in impact.checks:
+        with phase(profiler, "check_manifest_schema"):
+            sink.emit_all(vds.iter_manifest_schema(manifest, registry, layout))
+    if playbook_docs:
+        with phase(profiler, "check_playbooks"):
+            sink.emit_all(vds.iter_playbooks(playbook_docs, vds.list_playbooks(index, layout), layout))
+    if guide_schemas:
+        with phase(profiler, "check_schemas_covered_in_guide"):
+            guide = vds.pooled_guide(guides, layout.guide_conn, layout)
+            sink.emit_all(vds.iter_schemas_covered_in_guide(guide_schemas, layout.guide_conn, guide, layout))
+    if ref_schemas:
+        with phase(profiler, "check_schema_refs_coverage"):
+            sink.emit_all(vds.iter_schema_refs_coverage(ref_schemas, manifest, layout))
+    if guide_docs:
+        with phase(profiler, "check_docs_indexed_in_guide"):
+            guide = vds.pooled_guide(guides, layout.guide_pb_docs, layout)
+            sink.emit_all(vds.iter_docs_indexed_in_guide(guide_docs, layout.guide_pb_docs, guide, layout))
+    sink.emit_all(impact.findings())
+    return impact
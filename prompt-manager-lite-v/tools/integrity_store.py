@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Prompt Manager Lite - Almacenes de línea base para verify_integrity.py
+
+Dos backends intercambiables con la misma interfaz:
+
+- SqliteStore: base de datos sqlite3 (stdlib). Claves relativas al repo,
+  placeholders internados en una única tabla, escrituras atómicas por
+  transacción y actualizaciones de un archivo en O(1).
+- JsonStore: el formato histórico `file_integrity.json`. Se mantiene para
+  exportar/diffear y como origen del importador.
+
+Los registros que devuelven ambos backends tienen los mismos campos que
+`analyze_file` (path, hash, placeholder_count, placeholders, stats,
+analyzed_at), con `path` relativo a la raíz del repo, `blob` (id de objeto
+git) cuando la línea base se guardó con --git, y `sections` / `merkle`
+(hash y placeholders por encabezado y raíz Merkle del archivo, ver
+sections.py). `root()` devuelve la raíz Merkle de toda la línea base y
+`scanner()` la versión del escáner de placeholders con que se contó (None si
+es anterior a placeholders.py).
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+from sections import repo_root
+
+# Raíces de la estructura nueva y de la antigua, para relativizar rutas absolutas
+# guardadas en otra máquina (p. ej. /home/<usuario>/.../real_structure_documentation/docs/...)
+_LAYOUT_ROOTS = ('real_structure_documentation', 'streaming_files')
+_LEGACY_ROOTS = ('docs', 'features', 'bugs', 'operations', 'proposals', 'schemas')
+
+_STAT_FIELDS = ('size', 'modified', 'mtime_ns', 'inode', 'lines', 'chars', 'words')
+
+
+def _root_of(merkles):
+    """Raíz de la línea base, o None si algún archivo no tiene raíz (línea base anterior a las secciones)."""
+    if any(not m for m in merkles.values()):
+        return None
+    return repo_root(merkles)
+
+
+def relative_key(path, base):
+    """Convierte una ruta (absoluta o relativa) en clave relativa a la raíz del repo."""
+    p = Path(path)
+    if not p.is_absolute():
+        return p.as_posix()
+    try:
+        return p.relative_to(base).as_posix()
+    except ValueError:
+        pass
+    parts = p.parts
+    for roots in (_LAYOUT_ROOTS, _LEGACY_ROOTS):
+        for i in range(len(parts) - 1, -1, -1):
+            if parts[i] in roots:
+                return Path(*parts[i:]).as_posix()
+    return p.as_posix()
+
+
+class JsonStore:
+    """Backend histórico: un único JSON reescrito completo en cada guardado."""
+
+    name = 'json'
+
+    def __init__(self, path, base):
+        self.path = Path(path)
+        self.base = Path(base)
+        self._racy_ns = 0
+        self._root = None
+        self._scanner = None
+
+    def exists(self):
+        return self.path.exists()
+
+    def load(self, placeholders=True):
+        """Devuelve (created_at, {clave_relativa: registro})."""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self._racy_ns = os.fstat(f.fileno()).st_mtime_ns
+            state = json.load(f)
+        self._root = state.get('root')
+        self._scanner = state.get('scanner')
+        files = {}
+        for path_str, record in state.get('files', {}).items():
+            rel = relative_key(path_str, self.base)
+            record = dict(record, path=rel)
+            if not placeholders:
+                record.pop('placeholders', None)
+            files[rel] = record
+        return state['created_at'], files
+
+    def racy_ns(self, rel):
+        """Entradas con mtime >= a este valor pudieron cambiar tras ser analizadas."""
+        return self._racy_ns
+
+    def root(self):
+        """Raíz Merkle guardada con la línea base (tras load), o None."""
+        return self._root
+
+    def scanner(self):
+        return self._scanner
+
+    def save(self, created_at, records, scanner=None):
+        """Reescribe el archivo completo de forma atómica (tmp + os.replace)."""
+        files = {record['path']: record for record in records}
+        state = {'created_at': created_at, 'files': files}
+        if scanner:
+            state['scanner'] = scanner
+        self._scanner = scanner
+        root = _root_of({rel: record.get('merkle') for rel, record in files.items()})
+        if root:
+            state['root'] = root
+        self._root = root
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def put(self, record):
+        """Actualiza un registro. En JSON implica reescribir todo (O(n))."""
+        created_at, files = self.load()
+        files[record['path']] = record
+        self.save(created_at, files.values(), self._scanner)
+
+    def delete(self, rel):
+        created_at, files = self.load()
+        if files.pop(rel, None) is not None:
+            self.save(created_at, files.values(), self._scanner)
+
+    def close(self):
+        pass
+
+
+class SqliteStore:
+    """Backend sqlite3: una fila por archivo y placeholders internados."""
+
+    name = 'sqlite'
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS placeholders (
+        id INTEGER PRIMARY KEY,
+        text TEXT NOT NULL UNIQUE
+    );
+    CREATE TABLE IF NOT EXISTS files (
+        path TEXT PRIMARY KEY,
+        hash TEXT,
+        placeholder_count INTEGER,
+        size INTEGER,
+        modified REAL,
+        mtime_ns INTEGER,
+        inode INTEGER,
+        lines INTEGER,
+        chars INTEGER,
+        words INTEGER,
+        analyzed_at TEXT,
+        recorded_ns INTEGER,
+        blob TEXT,
+        merkle TEXT
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS file_placeholders (
+        path TEXT NOT NULL,
+        placeholder_id INTEGER NOT NULL,
+        PRIMARY KEY (path, placeholder_id)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS sections (
+        path TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        heading TEXT NOT NULL,
+        hash TEXT NOT NULL,
+        placeholder_count INTEGER NOT NULL,
+        PRIMARY KEY (path, position)
+    ) WITHOUT ROWID;
+    """
+    # Columnas añadidas después de la primera versión (bases creadas antes de --git / secciones)
+    _ADDED_COLUMNS = (('blob', 'TEXT'), ('merkle', 'TEXT'))
+
+    def __init__(self, path, base):
+        self.path = Path(path)
+        self.base = Path(base)
+        self._conn = None
+        self._recorded = {}
+
+    def exists(self):
+        return self.path.exists()
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.executescript(self._SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(files)")}
+            for name, sql_type in self._ADDED_COLUMNS:
+                if name not in columns:
+                    with self._conn:
+                        self._conn.execute(f"ALTER TABLE files ADD COLUMN {name} {sql_type}")
+        return self._conn
+
+    def load(self, placeholders=True):
+        """Devuelve (created_at, {clave_relativa: registro})."""
+        conn = self.conn
+        row = conn.execute("SELECT value FROM meta WHERE key = 'created_at'").fetchone()
+        created_at = row[0] if row else None
+        files = {}
+        self._recorded = {}
+        for row in conn.execute(
+            "SELECT path, hash, placeholder_count, size, modified, mtime_ns, inode,"
+            " lines, chars, words, analyzed_at, recorded_ns, blob, merkle FROM files ORDER BY path"
+        ):
+            files[row[0]] = self._record(row)
+            self._recorded[row[0]] = row[11] or 0
+        for path, heading, h, count in conn.execute(
+            "SELECT path, heading, hash, placeholder_count FROM sections ORDER BY path, position"
+        ):
+            if path in files:
+                files[path].setdefault('sections', []).append([heading, h, count])
+        if placeholders:
+            for record in files.values():
+                record['placeholders'] = []
+            for path, text in conn.execute(
+                "SELECT fp.path, p.text FROM file_placeholders fp"
+                " JOIN placeholders p ON p.id = fp.placeholder_id ORDER BY fp.path, p.text"
+            ):
+                if path in files:
+                    files[path]['placeholders'].append(text)
+        return created_at, files
+
+    @staticmethod
+    def _record(row):
+        stats = None
+        if row[3] is not None:
+            stats = dict(zip(_STAT_FIELDS, row[3:10]))
+            if stats['mtime_ns'] is None:
+                del stats['mtime_ns'], stats['inode']
+        record = {
+            'path': row[0],
+            'hash': row[1],
+            'placeholder_count': row[2],
+            'stats': stats,
+            'analyzed_at': row[10],
+        }
+        if row[12]:
+            record['blob'] = row[12]
+        if row[13]:
+            record['merkle'] = row[13]
+        return record
+
+    def racy_ns(self, rel):
+        """Momento en que se escribió el registro: un mtime igual o posterior es "racy"."""
+        return self._recorded.get(rel, 0)
+
+    def root(self):
+        """Raíz Merkle de la línea base; se recalcula (y guarda) solo si un put/delete la invalidó."""
+        conn = self.conn
+        row = conn.execute("SELECT value FROM meta WHERE key = 'root'").fetchone()
+        if row:
+            return row[0]
+        root = _root_of(dict(conn.execute("SELECT path, merkle FROM files")))
+        if root:
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('root', ?)", (root,))
+        return root
+
+    def scanner(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'scanner'").fetchone()
+        return int(row[0]) if row else None
+
+    def placeholders(self, rel):
+        """Lista de placeholders de un archivo."""
+        return [text for (text,) in self.conn.execute(
+            "SELECT p.text FROM file_placeholders fp"
+            " JOIN placeholders p ON p.id = fp.placeholder_id"
+            " WHERE fp.path = ? ORDER BY p.text", (rel,)
+        )]
+
+    def _write(self, conn, record):
+        stats = record.get('stats') or {}
+        conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                record['path'], record['hash'], record['placeholder_count'],
+                *(stats.get(k) for k in _STAT_FIELDS),
+                record.get('analyzed_at'), None, record.get('blob'), record.get('merkle'),
+            ),
+        )
+        conn.execute("DELETE FROM sections WHERE path = ?", (record['path'],))
+        conn.executemany(
+            "INSERT INTO sections VALUES (?, ?, ?, ?, ?)",
+            ((record['path'], i, heading, h, count)
+             for i, (heading, h, count) in enumerate(record.get('sections') or ())),
+        )
+        conn.execute("DELETE FROM file_placeholders WHERE path = ?", (record['path'],))
+        texts = record.get('placeholders') or []
+        if texts:
+            conn.executemany(
+                "INSERT OR IGNORE INTO placeholders (text) VALUES (?)", ((t,) for t in texts)
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO file_placeholders"
+                " SELECT ?, id FROM placeholders WHERE text = ?",
+                ((record['path'], t) for t in texts),
+            )
+
+    def save(self, created_at, records, scanner=None):
+        """Sustituye la línea base completa en una sola transacción."""
+        conn = self.conn
+        with conn:
+            conn.execute("DELETE FROM files")
+            conn.execute("DELETE FROM file_placeholders")
+            conn.execute("DELETE FROM placeholders")
+            conn.execute("DELETE FROM sections")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('created_at', ?)", (created_at,)
+            )
+            merkles = {}
+            for record in records:
+                self._write(conn, record)
+                merkles[record['path']] = record.get('merkle')
+            for key, value in (('root', _root_of(merkles)), ('scanner', scanner)):
+                if value:
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+                else:
+                    conn.execute("DELETE FROM meta WHERE key = ?", (key,))
+        self._stamp()
+
+    def put(self, record):
+        """Inserta o actualiza un único archivo (O(1) respecto al tamaño del repo)."""
+        conn = self.conn
+        with conn:
+            self._write(conn, record)
+            conn.execute("DELETE FROM meta WHERE key = 'root'")
+        self._stamp(record['path'])
+
+    def _stamp(self, rel=None):
+        """Marca los registros recién escritos (todos o `rel`) con el mtime de la base tras el commit.
+
+        Igual que en JsonStore, el corte "racy" usa el reloj del sistema de
+        archivos y no el del proceso: pueden diferir en resolución y, en
+        sistemas de archivos remotos, ir desfasados.
+        """
+        recorded_ns = os.stat(self.path).st_mtime_ns
+        with self.conn as conn:
+            if rel is None:
+                conn.execute("UPDATE files SET recorded_ns = ?", (recorded_ns,))
+            else:
+                conn.execute("UPDATE files SET recorded_ns = ? WHERE path = ?", (recorded_ns, rel))
+
+    def delete(self, rel):
+        conn = self.conn
+        with conn:
+            conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+            conn.execute("DELETE FROM file_placeholders WHERE path = ?", (rel,))
+            conn.execute("DELETE FROM sections WHERE path = ?", (rel,))
+            conn.execute("DELETE FROM meta WHERE key = 'root'")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+BACKENDS = {
+    'sqlite': SqliteStore,
+    'json': JsonStore,
+}
+
+
+def open_store(backend, path, base):
+    """Instancia el backend indicado ('sqlite' o 'json')."""
+    return BACKENDS[backend](path, base)
+
+
+def import_json(json_path, store, base):
+    """Importa una línea base `file_integrity.json` existente en otro backend."""
+    source = JsonStore(json_path, base)
+    created_at, files = source.load()
+    store.save(created_at, files.values(), source.scanner())
+    return len(files)
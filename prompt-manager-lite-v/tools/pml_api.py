@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Prompt Manager Lite - API importable
+
+Las comprobaciones de verify_docs_and_schemas.py y verify_integrity.py como
+funciones que reciben la raíz del proyecto y devuelven registros compactos
+(clases con __slots__, como Finding), sin imprimir nada ni depender de dónde
+está tools/. Permite ejecutar miles de verificaciones en un mismo proceso sin pagar el
+arranque del intérprete ni interpretar la salida con emojis:
+
+    import sys; sys.path.insert(0, "prompt-manager-lite-v/tools")
+    import pml_api
+
+    result = pml_api.verify("/ruta/al/proyecto")
+    if not result.ok:
+        for finding in result.docs.findings:
+            print(finding.code, finding.path, finding.message)
+
+Importar este módulo solo carga pathlib y typing: los verificadores
+(hashlib, sqlite, el validador de schemas…) se importan la primera vez que
+se usan. Por defecto el análisis es en serie (jobs=1); arrancar un pool de
+procesos por proyecto no compensa cuando se verifican muchos. Para muchos
+proyectos en un mismo proceso, `SharedCaches` compila una sola vez los
+schemas idénticos y escanea una sola vez las guías idénticas (verify_batch.py
+reparte además los proyectos entre procesos).
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from findings import Finding
+    from guide_index import GuidePool
+    from repo_index import RepoIndex
+    from schema_validator import SchemaRegistry
+
+PathLike = Union[str, Path]
+
+DEFAULT_BACKEND = "sqlite"
+
+
+class ProjectError(Exception):
+    """La ruta no tiene la estructura de un proyecto Prompt Manager Lite."""
+
+
+class SharedCaches:
+    """Schemas compilados y guías compartidos por contenido entre proyectos.
+
+    `cache_dir` guarda los schemas empaquetados en un directorio común (sus
+    nombres llevan el hash del contenido); sin él solo se comparten en memoria.
+    """
+
+    __slots__ = ("schemas", "guides")
+
+    def __init__(self, cache_dir: Optional[PathLike] = None):
+        from guide_index import GuidePool
+        from schema_validator import SchemaRegistry
+
+        self.schemas: SchemaRegistry = SchemaRegistry(Path(cache_dir) if cache_dir else None)
+        self.guides: GuidePool = GuidePool()
+
+    @property
+    def shared(self) -> Dict[str, int]:
+        """Cuántos schemas y guías se sirvieron desde el compilado de otro proyecto."""
+        return {"schemas": self.schemas.shared, "guides": self.guides.shared}
+
+
+class DocsResult:
+    """Resultado de verify_docs_and_schemas para un proyecto."""
+
+    __slots__ = ("root", "errors", "warnings", "findings")
+
+    def __init__(self, root: str, errors: int, warnings: int, findings: Tuple[Finding, ...]):
+        self.root = root
+        self.errors = errors
+        self.warnings = warnings
+        self.findings = findings
+
+    @property
+    def ok(self) -> bool:
+        return self.errors == 0
+
+    def __repr__(self) -> str:
+        return f"DocsResult({self.root!r}, errors={self.errors}, warnings={self.warnings})"
+
+
+class IntegrityResult:
+    """Resultado de verify_integrity para un proyecto: contadores por estado y hallazgos."""
+
+    __slots__ = ("root", "has_baseline", "counts", "errors", "findings")
+
+    def __init__(self, root: str, has_baseline: bool, counts: Dict[str, int], errors: int,
+                 findings: Tuple[Finding, ...]):
+        self.root = root
+        self.has_baseline = has_baseline
+        # completed, in_progress, modified, templates, unchanged, missing, reused…
+        self.counts = counts
+        self.errors = errors
+        self.findings = findings
+
+    def __getattr__(self, name: str) -> int:
+        # result.templates, result.missing… como atajo de counts
+        try:
+            return self.counts[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    @property
+    def ok(self) -> bool:
+        return self.has_baseline and self.errors == 0
+
+    def __repr__(self) -> str:
+        return f"IntegrityResult({self.root!r}, has_baseline={self.has_baseline}, counts={self.counts})"
+
+
+class VerifyResult:
+    """Ambos verificadores sobre un mismo recorrido del árbol."""
+
+    __slots__ = ("docs", "integrity")
+
+    def __init__(self, docs: DocsResult, integrity: IntegrityResult):
+        self.docs = docs
+        self.integrity = integrity
+
+    @property
+    def ok(self) -> bool:
+        return self.docs.ok and self.integrity.ok
+
+    def __repr__(self) -> str:
+        return f"VerifyResult({self.docs!r}, {self.integrity!r})"
+
+
+def project_root(path: PathLike) -> Path:
+    """Raíz absoluta del proyecto; ProjectError si no tiene manifests/ y guides/."""
+    root = Path(path).resolve()
+    if not ((root / "manifests").is_dir() and (root / "guides").is_dir()):
+        raise ProjectError(f"{root} no es un proyecto Prompt Manager Lite (faltan manifests/ o guides/)")
+    return root
+
+
+def build_index(root: PathLike) -> RepoIndex:
+    """Recorrido único del proyecto, reutilizable entre check_docs y check_integrity."""
+    from repo_index import RepoIndex
+
+    return RepoIndex.build(project_root(root))
+
+
+def check_docs(root: PathLike, index: Optional[RepoIndex] = None,
+               caches: Optional[SharedCaches] = None) -> DocsResult:
+    """Manifest, playbooks, guías y schemaRefs de un proyecto."""
+    import verify_docs_and_schemas as vds
+    from findings import ListSink
+
+    base = project_root(root) if index is None else index.base
+    sink = ListSink("verify_docs_and_schemas")
+    vds.main(index=index, sink=sink, layout=vds.Layout(base),
+             registry=caches.schemas if caches else None, guides=caches.guides if caches else None)
+    return DocsResult(str(base), sink.counts["error"], sink.counts["warning"], tuple(sink.findings))
+
+
+def check_integrity(root: PathLike, index: Optional[RepoIndex] = None, backend: str = DEFAULT_BACKEND,
+                    paranoid: bool = False, git: bool = False, jobs: int = 1) -> IntegrityResult:
+    """Estado de los archivos de un proyecto frente a su línea base."""
+    import verify_integrity as vi
+    from findings import ListSink
+
+    base = project_root(root) if index is None else index.base
+    sink = ListSink("verify_integrity")
+    counts = vi.verify_file_integrity(paranoid=paranoid, jobs=jobs, backend=backend, index=index,
+                                      sink=sink, git=git, base=base)
+    return IntegrityResult(str(base), counts is not None, counts or {}, sink.counts["error"], tuple(sink.findings))
+
+
+def store_baseline(root: PathLike, index: Optional[RepoIndex] = None, backend: str = DEFAULT_BACKEND,
+                   git: bool = False, jobs: int = 1) -> int:
+    """Guarda la línea base de integridad de un proyecto; devuelve cuántos archivos registró."""
+    import verify_integrity as vi
+
+    base = project_root(root) if index is None else index.base
+    return vi.store_initial_state(jobs=jobs, backend=backend, index=index, git=git, base=base, quiet=True)
+
+
+def verify(root: PathLike, backend: str = DEFAULT_BACKEND, paranoid: bool = False, git: bool = False,
+           jobs: int = 1, caches: Optional[SharedCaches] = None) -> VerifyResult:
+    """check_docs + check_integrity compartiendo un solo recorrido del árbol."""
+    index = build_index(root)
+    return VerifyResult(
+        check_docs(root, index, caches),
+        check_integrity(root, index, backend=backend, paranoid=paranoid, git=git, jobs=jobs),
+    )
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Instrumentación opcional de los verificadores (--profile)
+
+Registra tiempos por fase (recorrido, carga de línea base, análisis, checks
+de manifest/playbooks/guías/schemaRefs) y por archivo (lectura, hash,
+escaneo de placeholders y bytes leídos). Imprime la tabla de archivos más
+lentos y escribe una traza en formato Chrome trace-event (abrir con
+chrome://tracing o https://ui.perfetto.dev). Con --format ndjson/sarif sin
+--output, el informe va a stderr para no mezclarse con los hallazgos.
+
+Sin --profile no se crea ningún Profiler: las llamadas usan `phase(None, ...)`,
+que devuelve un contexto nulo compartido, y el análisis de archivos no mide nada.
+"""
+from __future__ import annotations
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, Optional, TextIO
+
+_NULL = nullcontext()
+
+
+def phase(profiler: Optional["Profiler"], name: str, **args: Any):
+    """Contexto que mide una fase si hay profiler; si no, no hace nada."""
+    if profiler is None:
+        return _NULL
+    return profiler.phase(name, **args)
+
+
+def clock_us() -> float:
+    """Reloj monótono en microsegundos, común a todos los procesos del pool."""
+    return time.perf_counter_ns() / 1000
+
+
+class Profiler:
+    """Acumula fases, archivos y eventos de traza de una ejecución."""
+
+    def __init__(self, tool: str):
+        self.tool = tool
+        self.pid = os.getpid()
+        self.origin = clock_us()
+        self.events: List[Dict[str, Any]] = []
+        self.phases: Dict[str, float] = {}
+        self.phase_bytes: Dict[str, int] = {}
+        self.files: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def phase(self, name: str, **args: Any):
+        start = clock_us()
+        try:
+            yield self
+        finally:
+            end = clock_us()
+            self.phases[name] = self.phases.get(name, 0.0) + (end - start) / 1e6
+            self.add_event(name, "phase", start, end, args=args or None)
+
+    def add_bytes(self, name: str, count: int) -> None:
+        """Bytes leídos atribuidos a una fase (p. ej. el texto de una guía)."""
+        self.phase_bytes[name] = self.phase_bytes.get(name, 0) + count
+
+    def add_event(self, name: str, cat: str, start: float, end: float,
+                  pid: Optional[int] = None, args: Optional[Dict[str, Any]] = None) -> None:
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": start - self.origin,
+            "dur": end - start,
+            "pid": pid or self.pid,
+            "tid": threading.get_ident() if pid in (None, self.pid) else pid,
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def add_file(self, path: str, timing: Dict[str, Any]) -> None:
+        """Registra la medición de un archivo devuelta por el análisis (posiblemente de otro proceso)."""
+        record = {"path": path, **timing}
+        self.files.append(record)
+        self.add_event(
+            os.path.basename(path), "file", timing["start"], timing["end"], pid=timing.get("pid"),
+            args={k: timing[k] for k in ("bytes", "read_s", "hash_s", "scan_s") if k in timing},
+        )
+
+    def print_report(self, top: int = 15, stream: Optional[TextIO] = None) -> None:
+        stream = stream or sys.stdout
+        print("\n" + "-" * 60, file=stream)
+        print(f"⏱️  PERFIL ({self.tool})", file=stream)
+        for name, seconds in self.phases.items():
+            extra = f"  {self.phase_bytes[name]:>12,} B" if name in self.phase_bytes else ""
+            print(f"   {name:<34} {seconds * 1000:>10.2f} ms{extra}", file=stream)
+        if self.files:
+            total_bytes = sum(f.get("bytes", 0) for f in self.files)
+            print(f"   archivos analizados: {len(self.files)} | bytes leídos: {total_bytes:,}", file=stream)
+            slowest = sorted(self.files, key=lambda f: f["end"] - f["start"], reverse=True)[:top]
+            print(f"\n   Top {len(slowest)} archivos más lentos:", file=stream)
+            print(f"   {'ms':>9} {'lectura':>9} {'hash':>9} {'scan':>9} {'bytes':>11}  archivo", file=stream)
+            for f in slowest:
+                print(
+                    f"   {(f['end'] - f['start']) / 1000:>9.2f} {f.get('read_s', 0) * 1000:>9.2f}"
+                    f" {f.get('hash_s', 0) * 1000:>9.2f} {f.get('scan_s', 0) * 1000:>9.2f}"
+                    f" {f.get('bytes', 0):>11,}  {f['path']}",
+                    file=stream,
+                )
+
+    def write_trace(self, path: str, stream: Optional[TextIO] = None) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "traceEvents": self.events,
+                    "displayTimeUnit": "ms",
+                    "otherData": {"tool": self.tool, "phases_s": self.phases, "phase_bytes": self.phase_bytes},
+                },
+                f,
+            )
+        print(f"   🧵 Traza guardada en {path}", file=stream or sys.stdout)
+
+
+def add_profile_arguments(parser) -> None:
+    """Añade --profile [TRAZA] y --profile-top N a un parser de argparse."""
+    parser.add_argument("--profile", nargs="?", const="", default=None, metavar="TRAZA",
+                        help="mide fases y archivos; escribe una traza Chrome trace-event "
+                             "(por defecto <herramienta>.trace.json)")
+    parser.add_argument("--profile-top", type=int, default=15, metavar="N",
+                        help="archivos más lentos a listar con --profile (por defecto 15)")
+
+
+def start_profile(args, tool: str) -> Optional[Profiler]:
+    return Profiler(tool) if getattr(args, "profile", None) is not None else None
+
+
+def report_stream(args) -> TextIO:
+    """Salida del informe: stderr si los hallazgos van a stdout en un formato de máquina."""
+    if getattr(args, "format", "text") != "text" and not getattr(args, "output", None):
+        return sys.stderr
+    return sys.stdout
+
+
+def finish_profile(profiler: Optional[Profiler], args) -> None:
+    if profiler is None:
+        return
+    stream = report_stream(args)
+    profiler.print_report(args.profile_top, stream)
+    profiler.write_trace(args.profile or f"{profiler.tool}.trace.json", stream)
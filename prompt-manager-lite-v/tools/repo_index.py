@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Prompt Manager Lite - Índice del repositorio
+
+Un único recorrido con os.scandir sobre las carpetas conocidas (estructura
+antigua y nueva) que clasifica cada archivo y guarda su stat. Lo comparten
+verify_integrity.py y verify_docs_and_schemas.py para no recorrer el árbol
+varias veces.
+
+Tipos de archivo:
+- doc:       docs/**/*.md y real_structure_documentation/docs/**/*.md
+- playbook:  prompt_playbooks/documentation_playbooks/*.md
+- schema:    schemas/**/*.json y real_structure_documentation/schemas/**/*.json
+- feature, bug, operation, proposal: <carpeta>/**/* y streaming_files/<carpeta>/**/*
+- guide:     guides/*.md
+- manifest:  manifests/*.json
+"""
+
+import bisect
+import os
+import stat as stat_module
+from pathlib import Path
+
+# Carpetas de primer nivel que se recorren; el resto del repo se ignora
+_TOP_LEVEL = {
+    'docs', 'schemas', 'features', 'bugs', 'operations', 'proposals',
+    'real_structure_documentation', 'streaming_files', 'prompt_playbooks',
+    'guides', 'manifests',
+}
+_SKIP_DIRS = {'__pycache__', '.git'}
+
+_STREAMING_KINDS = {
+    'features': 'feature',
+    'bugs': 'bug',
+    'operations': 'operation',
+    'proposals': 'proposal',
+}
+
+KINDS = ('doc', 'playbook', 'schema', 'feature', 'bug', 'operation', 'proposal', 'guide', 'manifest')
+
+
+def classify(rel_parts):
+    """Devuelve el tipo de un archivo a partir de las partes de su ruta relativa, o None."""
+    if rel_parts[0] == 'real_structure_documentation' and len(rel_parts) > 2:
+        rel_parts = rel_parts[1:]
+    elif rel_parts[0] == 'streaming_files' and len(rel_parts) > 2:
+        rel_parts = rel_parts[1:]
+    if len(rel_parts) < 2:
+        return None
+    top, name = rel_parts[0], rel_parts[-1]
+    if top == 'docs' and name.endswith('.md'):
+        return 'doc'
+    if top == 'schemas' and name.endswith('.json'):
+        return 'schema'
+    if top in _STREAMING_KINDS:
+        return _STREAMING_KINDS[top]
+    if top == 'prompt_playbooks' and len(rel_parts) == 3 and rel_parts[1] == 'documentation_playbooks' and name.endswith('.md'):
+        return 'playbook'
+    if top == 'guides' and len(rel_parts) == 2 and name.endswith('.md'):
+        return 'guide'
+    if top == 'manifests' and len(rel_parts) == 2 and name.endswith('.json'):
+        return 'manifest'
+    return None
+
+
+class IndexedFile:
+    """Archivo clasificado: ruta absoluta, ruta relativa al repo, tipo y stat."""
+
+    __slots__ = ('path', 'rel', 'kind', 'stat')
+
+    def __init__(self, path, rel, kind, stat):
+        self.path = path
+        self.rel = rel
+        self.kind = kind
+        self.stat = stat
+
+    @property
+    def name(self):
+        return self.path.name
+
+
+class RepoIndex:
+    """Índice de archivos del repo construido con un solo recorrido."""
+
+    def __init__(self, base):
+        self.base = Path(base)
+        self.files = {}
+        self._by_kind = {kind: [] for kind in KINDS}
+        # Rutas de _by_kind en paralelo: bisect sin key= (Python < 3.10)
+        self._rels = {kind: [] for kind in KINDS}
+
+    @classmethod
+    def build(cls, base):
+        index = cls(base)
+        index._scan(str(index.base), ())
+        for kind, entries in index._by_kind.items():
+            entries.sort(key=lambda f: f.rel)
+            index._rels[kind] = [f.rel for f in entries]
+        return index
+
+    def _scan(self, directory, rel_parts):
+        try:
+            it = os.scandir(directory)
+        except OSError:
+            return
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in _SKIP_DIRS:
+                        continue
+                    if not rel_parts and entry.name not in _TOP_LEVEL:
+                        continue
+                    self._scan(entry.path, rel_parts + (entry.name,))
+                elif rel_parts and entry.is_file():
+                    parts = rel_parts + (entry.name,)
+                    kind = classify(parts)
+                    if kind is None:
+                        continue
+                    rel = '/'.join(parts)
+                    indexed = IndexedFile(Path(entry.path), rel, kind, entry.stat())
+                    self.files[rel] = indexed
+                    self._by_kind[kind].append(indexed)
+
+    def of_kind(self, kind, suffix=None, under=None):
+        """Archivos de un tipo, ordenados por ruta; filtra opcionalmente por sufijo o subcarpeta."""
+        selected = self._by_kind[kind]
+        if suffix is not None:
+            selected = [f for f in selected if f.rel.endswith(suffix)]
+        if under is not None:
+            needle = f'/{under}/'
+            selected = [f for f in selected if needle in f'/{f.rel}']
+        return selected
+
+    def get(self, rel):
+        return self.files.get(rel)
+
+    def refresh(self, rel):
+        """Vuelve a consultar un archivo tras un cambio; devuelve (anterior, actual).
+
+        Cualquiera de los dos es None si el archivo no existía / ya no existe
+        (o no es de un tipo indexado). Mantiene el orden de of_kind().
+        """
+        old = self.files.pop(rel, None)
+        if old is not None:
+            entries, rels = self._by_kind[old.kind], self._rels[old.kind]
+            i = bisect.bisect_left(rels, rel)
+            if i < len(entries) and entries[i] is old:
+                del entries[i]
+                del rels[i]
+        parts = tuple(rel.split('/'))
+        if len(parts) < 2 or parts[0] not in _TOP_LEVEL or _SKIP_DIRS.intersection(parts):
+            return old, None
+        kind = classify(parts)
+        if kind is None:
+            return old, None
+        path = self.base / rel
+        try:
+            st = os.stat(path)
+        except OSError:
+            return old, None
+        if not stat_module.S_ISREG(st.st_mode):
+            return old, None
+        new = IndexedFile(path, rel, kind, st)
+        self.files[rel] = new
+        i = bisect.bisect_left(self._rels[kind], rel)
+        self._by_kind[kind].insert(i, new)
+        self._rels[kind].insert(i, rel)
+        return old, new
+
+    def signatures(self):
+        """{ruta: (mtime_ns, ctime_ns, size, inode)} para detectar cambios por sondeo."""
+        return {
+            rel: (f.stat.st_mtime_ns, f.stat.st_ctime_ns, f.stat.st_size, f.stat.st_ino)
+            for rel, f in self.files.items()
+        }
+
+    def stat(self, rel):
+        """stat registrado durante el recorrido, o None si el archivo no existe."""
+        indexed = self.files.get(rel)
+        return indexed.stat if indexed else None
@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+"""
+Validador JSON Schema (draft-07) sin dependencias
+
+- Resuelve `$ref` locales (`#/definitions/x`) y entre archivos
+  (`master_blueprint_parts/projectInfo.json`, `otro.json#/definitions/y`),
+  relativos al archivo que los declara. Cada destino se resuelve una vez.
+- Compila cada schema una sola vez en closures de validación; validar una
+  instancia solo ejecuta esas closures. Las referencias recursivas
+  (p. ej. `wireframeNode`) se enlazan de forma perezosa.
+- Cachea en disco la forma "empaquetada" (todos los `$ref` resueltos a nodos
+  con id canónico) indexada por el SHA-256 del schema raíz y de cada archivo
+  del que depende: si ninguno cambió no se vuelve a parsear ni a resolver nada.
+
+`format` se trata como anotación (opcional en draft-07). No se soportan
+`$ref` remotos (http/https).
+
+Uso:
+    python3 tools/schema_validator.py <schema.json> <instancia.json> [...]
+"""
+from __future__ import annotations
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Palabras clave cuyo valor es un subschema, una lista o un mapa de subschemas
+_SUBSCHEMA = ("additionalItems", "additionalProperties", "contains", "propertyNames", "not", "if", "then", "else")
+_SUBSCHEMA_LIST = ("allOf", "anyOf", "oneOf")
+_SUBSCHEMA_MAP = ("properties", "patternProperties", "definitions")
+
+CACHE_VERSION = 1
+
+
+class SchemaError(Exception):
+    """Schema inválido o `$ref` imposible de resolver."""
+
+
+class Violation:
+    """Incumplimiento de una instancia: ruta JSON, palabra clave y mensaje."""
+
+    __slots__ = ("path", "keyword", "message")
+
+    def __init__(self, path: str, keyword: str, message: str):
+        self.path = path
+        self.keyword = keyword
+        self.message = message
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+    def __repr__(self) -> str:
+        return f"Violation({self.path!r}, {self.keyword!r}, {self.message!r})"
+
+
+Validator = Callable[[Any, str, List[Violation]], None]
+
+
+# ----------------------------------------------------------------------------
+# Resolución de $ref y empaquetado
+# ----------------------------------------------------------------------------
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _pointer(document: Any, pointer: str, where: str) -> Any:
+    node = document
+    if pointer in ("", "/"):
+        return node
+    for token in pointer.lstrip("/").split("/"):
+        token = _unescape(token)
+        if isinstance(node, list):
+            try:
+                node = node[int(token)]
+            except (ValueError, IndexError):
+                raise SchemaError(f"$ref no resoluble: {where}")
+        elif isinstance(node, dict) and token in node:
+            node = node[token]
+        else:
+            raise SchemaError(f"$ref no resoluble: {where}")
+    return node
+
+
+class _Bundler:
+    """Recorre un schema y sus referencias y produce nodos con ids canónicos."""
+
+    def __init__(self, root: Path):
+        self.root_dir = root.parent
+        self.documents: Dict[Path, Any] = {}
+        self.digests: Dict[str, str] = {}
+        self.nodes: Dict[str, Any] = {}
+
+    def _doc(self, path: Path) -> Any:
+        path = path.resolve()
+        if path not in self.documents:
+            try:
+                data = path.read_bytes()
+            except OSError as e:
+                raise SchemaError(f"No se puede leer el schema {path}: {e}")
+            rel = self._rel(path)
+            try:
+                # UnicodeDecodeError y JSONDecodeError son ValueError
+                document = json.loads(data.decode("utf-8"))
+            except ValueError as e:
+                raise SchemaError(f"Schema inválido en {rel}: {e}")
+            self.digests[rel] = hashlib.sha256(data).hexdigest()
+            self.documents[path] = document
+        return self.documents[path]
+
+    def _rel(self, path: Path) -> str:
+        return Path(os.path.relpath(path, self.root_dir)).as_posix()
+
+    def node_id(self, path: Path, pointer: str) -> str:
+        """Id canónico de un destino; lo resuelve y empaqueta la primera vez."""
+        path = path.resolve()
+        node_id = f"{self._rel(path)}#{pointer}"
+        if node_id not in self.nodes:
+            self.nodes[node_id] = None  # marca: en curso (ciclos)
+            target = _pointer(self._doc(path), pointer, node_id)
+            self.nodes[node_id] = self._normalize(target, path)
+        return node_id
+
+    def _ref(self, ref: str, path: Path) -> str:
+        if ref.startswith(("http://", "https://")):
+            raise SchemaError(f"$ref remoto no soportado: {ref}")
+        file_part, _, pointer = ref.partition("#")
+        target = (path.parent / file_part) if file_part else path
+        return self.node_id(target, pointer)
+
+    def _normalize(self, schema: Any, path: Path) -> Any:
+        if isinstance(schema, bool):
+            return schema
+        if not isinstance(schema, dict):
+            raise SchemaError(f"Schema inválido en {self._rel(path)}: {schema!r}")
+        if "$ref" in schema and isinstance(schema["$ref"], str):
+            # draft-07: $ref ignora el resto de palabras clave del objeto
+            return {"$ref": self._ref(schema["$ref"], path)}
+        out = dict(schema)
+        for key in _SUBSCHEMA:
+            if key in schema:
+                out[key] = self._normalize(schema[key], path)
+        for key in _SUBSCHEMA_LIST:
+            if key in schema:
+                out[key] = [self._normalize(s, path) for s in schema[key]]
+        for key in _SUBSCHEMA_MAP:
+            if isinstance(schema.get(key), dict):
+                out[key] = {
+                    name: self._normalize(s, path)
+                    for name, s in schema[key].items()
+                    if isinstance(s, (dict, bool))
+                }
+        if "items" in schema:
+            items = schema["items"]
+            out["items"] = (
+                [self._normalize(s, path) for s in items] if isinstance(items, list)
+                else self._normalize(items, path)
+            )
+        if isinstance(schema.get("dependencies"), dict):
+            out["dependencies"] = {
+                name: dep if isinstance(dep, list) else self._normalize(dep, path)
+                for name, dep in schema["dependencies"].items()
+            }
+        return out
+
+
+def bundle_schema(schema_path: Path) -> Dict[str, Any]:
+    """Empaqueta un schema y todo lo que referencia en {root, nodes, deps}."""
+    bundler = _Bundler(Path(schema_path).resolve())
+    root = bundler.node_id(Path(schema_path), "")
+    return {
+        "version": CACHE_VERSION,
+        "root": root,
+        "nodes": bundler.nodes,
+        "deps": bundler.digests,
+    }
+
+
+# ----------------------------------------------------------------------------
+# Compilación a closures
+# ----------------------------------------------------------------------------
+
+def _is_type(value: Any, name: str) -> bool:
+    if name == "object":
+        return isinstance(value, dict)
+    if name == "array":
+        return isinstance(value, list)
+    if name == "string":
+        return isinstance(value, str)
+    if name == "boolean":
+        return isinstance(value, bool)
+    if name == "null":
+        return value is None
+    if isinstance(value, bool):
+        return False
+    if name == "integer":
+        return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+    if name == "number":
+        return isinstance(value, (int, float))
+    return False
+
+
+def _equal(a: Any, b: Any) -> bool:
+    # En JSON Schema 1 == 1.0 pero true != 1
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def _child(where: str, key: Any) -> str:
+    return f"{where}[{key}]" if isinstance(key, int) else f"{where}.{key}"
+
+
+class CompiledSchema:
+    """Schema compilado: `validate(instancia)` devuelve la lista de incumplimientos."""
+
+    def __init__(self, bundle: Dict[str, Any]):
+        self.bundle = bundle
+        self._compiled: Dict[str, Validator] = {}
+        for node_id, node in bundle["nodes"].items():
+            self._compiled[node_id] = self._compile(node)
+        self._root = self._compiled[bundle["root"]]
+
+    def validate(self, instance: Any) -> List[Violation]:
+        errors: List[Violation] = []
+        self._root(instance, "$", errors)
+        return errors
+
+    def is_valid(self, instance: Any) -> bool:
+        return not self.validate(instance)
+
+    def _compile(self, schema: Any) -> Validator:
+        if schema is True:
+            return lambda value, where, errors: None
+        if schema is False:
+            def never(value, where, errors):
+                errors.append(Violation(where, "false", "ningún valor es válido aquí"))
+            return never
+
+        if "$ref" in schema:
+            node_id = schema["$ref"]
+            compiled = self._compiled
+
+            def ref(value, where, errors):
+                compiled[node_id](value, where, errors)
+            return ref
+
+        checks: List[Validator] = []
+        add = checks.append
+
+        if "type" in schema:
+            types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            label = " | ".join(types)
+
+            def check_type(value, where, errors):
+                if not any(_is_type(value, t) for t in types):
+                    errors.append(Violation(where, "type", f"se esperaba {label}"))
+            add(check_type)
+
+        if "enum" in schema:
+            options = schema["enum"]
+
+            def check_enum(value, where, errors):
+                if not any(_equal(value, o) for o in options):
+                    errors.append(Violation(where, "enum", f"{value!r} no está en {options}"))
+            add(check_enum)
+
+        if "const" in schema:
+            const = schema["const"]
+
+            def check_const(value, where, errors):
+                if not _equal(value, const):
+                    errors.append(Violation(where, "const", f"se esperaba {const!r}"))
+            add(check_const)
+
+        self._compile_numeric(schema, add)
+        self._compile_string(schema, add)
+        self._compile_array(schema, add)
+        self._compile_object(schema, add)
+        self._compile_combinators(schema, add)
+
+        if not checks:
+            return lambda value, where, errors: None
+        if len(checks) == 1:
+            return checks[0]
+
+        def run_all(value, where, errors):
+            for check in checks:
+                check(value, where, errors)
+        return run_all
+
+    def _compile_numeric(self, schema: Dict[str, Any], add) -> None:
+        def is_num(v):
+            return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+        bounds = [
+            ("minimum", lambda v, b: v >= b, ">="),
+            ("maximum", lambda v, b: v <= b, "<="),
+            ("exclusiveMinimum", lambda v, b: v > b, ">"),
+            ("exclusiveMaximum", lambda v, b: v < b, "<"),
+        ]
+        for keyword, ok, symbol in bounds:
+            if keyword in schema:
+                bound = schema[keyword]
+
+                def check_bound(value, where, errors, keyword=keyword, ok=ok, symbol=symbol, bound=bound):
+                    if is_num(value) and not ok(value, bound):
+                        errors.append(Violation(where, keyword, f"{value} no es {symbol} {bound}"))
+                add(check_bound)
+        if "multipleOf" in schema:
+            factor = schema["multipleOf"]
+
+            def check_multiple(value, where, errors):
+                if is_num(value):
+                    quotient = value / factor
+                    if not math.isfinite(quotient) or not float(quotient).is_integer():
+                        errors.append(Violation(where, "multipleOf", f"{value} no es múltiplo de {factor}"))
+            add(check_multiple)
+
+    def _compile_string(self, schema: Dict[str, Any], add) -> None:
+        if "minLength" in schema:
+            n = schema["minLength"]
+
+            def check_min_length(value, where, errors):
+                if isinstance(value, str) and len(value) < n:
+                    errors.append(Violation(where, "minLength", f"longitud menor que {n}"))
+            add(check_min_length)
+        if "maxLength" in schema:
+            n_max = schema["maxLength"]
+
+            def check_max_length(value, where, errors):
+                if isinstance(value, str) and len(value) > n_max:
+                    errors.append(Violation(where, "maxLength", f"longitud mayor que {n_max}"))
+            add(check_max_length)
+        if "pattern" in schema and isinstance(schema["pattern"], str):
+            regex = re.compile(schema["pattern"])
+
+            def check_pattern(value, where, errors):
+                if isinstance(value, str) and not regex.search(value):
+                    errors.append(Violation(where, "pattern", f"no cumple el patrón {regex.pattern!r}"))
+            add(check_pattern)
+
+    def _compile_array(self, schema: Dict[str, Any], add) -> None:
+        items = schema.get("items")
+        if isinstance(items, list):
+            item_checks = [self._compile(s) for s in items]
+            extra = self._compile(schema["additionalItems"]) if "additionalItems" in schema else None
+
+            def check_tuple(value, where, errors):
+                if not isinstance(value, list):
+                    return
+                for i, item in enumerate(value):
+                    if i < len(item_checks):
+                        item_checks[i](item, _child(where, i), errors)
+                    elif extra is not None:
+                        extra(item, _child(where, i), errors)
+            add(check_tuple)
+        elif items is not None:
+            item_check = self._compile(items)
+
+            def check_items(value, where, errors):
+                if isinstance(value, list):
+                    for i, item in enumerate(value):
+                        item_check(item, _child(where, i), errors)
+            add(check_items)
+        if "minItems" in schema:
+            n = schema["minItems"]
+
+            def check_min_items(value, where, errors):
+                if isinstance(value, list) and len(value) < n:
+                    errors.append(Violation(where, "minItems", f"menos de {n} elementos"))
+            add(check_min_items)
+        if "maxItems" in schema:
+            n_max = schema["maxItems"]
+
+            def check_max_items(value, where, errors):
+                if isinstance(value, list) and len(value) > n_max:
+                    errors.append(Violation(where, "maxItems", f"más de {n_max} elementos"))
+            add(check_max_items)
+        if schema.get("uniqueItems"):
+            def check_unique(value, where, errors):
+                if isinstance(value, list):
+                    for i in range(len(value)):
+                        for j in range(i):
+                            if _equal(value[i], value[j]):
+                                errors.append(Violation(where, "uniqueItems", "elementos repetidos"))
+                                return
+            add(check_unique)
+        if "contains" in schema:
+            contains = self._compile(schema["contains"])
+
+            def check_contains(value, where, errors):
+                if isinstance(value, list) and not any(_passes(contains, item) for item in value):
+                    errors.append(Violation(where, "contains", "ningún elemento cumple 'contains'"))
+            add(check_contains)
+
+    def _compile_object(self, schema: Dict[str, Any], add) -> None:
+        if "required" in schema:
+            required = list(schema["required"])
+
+            def check_required(value, where, errors):
+                if isinstance(value, dict):
+                    missing = [k for k in required if k not in value]
+                    if missing:
+                        errors.append(Violation(where, "required", f"faltan campos requeridos: {', '.join(missing)}"))
+            add(check_required)
+        if "minProperties" in schema:
+            n = schema["minProperties"]
+
+            def check_min_props(value, where, errors):
+                if isinstance(value, dict) and len(value) < n:
+                    errors.append(Violation(where, "minProperties", f"menos de {n} propiedades"))
+            add(check_min_props)
+        if "maxProperties" in schema:
+            n_max = schema["maxProperties"]
+
+            def check_max_props(value, where, errors):
+                if isinstance(value, dict) and len(value) > n_max:
+                    errors.append(Violation(where, "maxProperties", f"más de {n_max} propiedades"))
+            add(check_max_props)
+
+        properties = {k: self._compile(s) for k, s in schema.get("properties", {}).items()}
+        patterns = [(re.compile(p), self._compile(s)) for p, s in schema.get("patternProperties", {}).items()]
+        additional = schema.get("additionalProperties")
+        extra = self._compile(additional) if additional is not None else None
+        if properties or patterns or extra is not None:
+            def check_properties(value, where, errors):
+                if not isinstance(value, dict):
+                    return
+                for key, item in value.items():
+                    matched = False
+                    check = properties.get(key)
+                    if check is not None:
+                        matched = True
+                        check(item, _child(where, key), errors)
+                    for regex, pattern_check in patterns:
+                        if regex.search(key):
+                            matched = True
+                            pattern_check(item, _child(where, key), errors)
+                    if not matched and extra is not None:
+                        if additional is False:
+                            errors.append(Violation(where, "additionalProperties", f"propiedad no permitida: {key}"))
+                        else:
+                            extra(item, _child(where, key), errors)
+            add(check_properties)
+
+        if "propertyNames" in schema:
+            names = self._compile(schema["propertyNames"])
+
+            def check_names(value, where, errors):
+                if isinstance(value, dict):
+                    for key in value:
+                        names(key, _child(where, key), errors)
+            add(check_names)
+
+        if "dependencies" in schema:
+            deps: List[Tuple[str, Any]] = []
+            for name, dep in schema["dependencies"].items():
+                deps.append((name, list(dep) if isinstance(dep, list) else self._compile(dep)))
+
+            def check_dependencies(value, where, errors):
+                if not isinstance(value, dict):
+                    return
+                for name, dep in deps:
+                    if name not in value:
+                        continue
+                    if isinstance(dep, list):
+                        missing = [k for k in dep if k not in value]
+                        if missing:
+                            errors.append(Violation(where, "dependencies", f"'{name}' requiere: {', '.join(missing)}"))
+                    else:
+                        dep(value, where, errors)
+            add(check_dependencies)
+
+    def _compile_combinators(self, schema: Dict[str, Any], add) -> None:
+        if "allOf" in schema:
+            subs = [self._compile(s) for s in schema["allOf"]]
+
+            def check_all(value, where, errors):
+                for sub in subs:
+                    sub(value, where, errors)
+            add(check_all)
+        if "anyOf" in schema:
+            any_subs = [self._compile(s) for s in schema["anyOf"]]
+
+            def check_any(value, where, errors):
+                if not any(_passes(sub, value) for sub in any_subs):
+                    errors.append(Violation(where, "anyOf", "no cumple ninguna alternativa de anyOf"))
+            add(check_any)
+        if "oneOf" in schema:
+            one_subs = [self._compile(s) for s in schema["oneOf"]]
+
+            def check_one(value, where, errors):
+                matches = sum(1 for sub in one_subs if _passes(sub, value))
+                if matches != 1:
+                    errors.append(Violation(where, "oneOf", f"cumple {matches} alternativas de oneOf (se esperaba 1)"))
+            add(check_one)
+        if "not" in schema:
+            negated = self._compile(schema["not"])
+
+            def check_not(value, where, errors):
+                if _passes(negated, value):
+                    errors.append(Violation(where, "not", "cumple el schema de 'not'"))
+            add(check_not)
+        if "if" in schema and ("then" in schema or "else" in schema):
+            cond = self._compile(schema["if"])
+            then = self._compile(schema["then"]) if "then" in schema else None
+            other = self._compile(schema["else"]) if "else" in schema else None
+
+            def check_if(value, where, errors):
+                branch = then if _passes(cond, value) else other
+                if branch is not None:
+                    branch(value, where, errors)
+            add(check_if)
+
+
+def _passes(validator: Validator, value: Any) -> bool:
+    probe: List[Violation] = []
+    validator(value, "$", probe)
+    return not probe
+
+
+# ----------------------------------------------------------------------------
+# Registro con memoización y caché en disco
+# ----------------------------------------------------------------------------
+
+class SchemaRegistry:
+    """Compila cada schema una vez por proceso y reutiliza el empaquetado en disco.
+
+    Los schemas compilados se indexan también por el SHA-256 de su contenido:
+    un mismo registro usado para varios proyectos (verify_batch.py) compila
+    una sola vez los schemas idénticos, estén donde estén. Los ids de nodo son
+    relativos al schema raíz, así que el compilado no depende de la ruta.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._compiled: Dict[Path, CompiledSchema] = {}
+        self._by_digest: Dict[str, CompiledSchema] = {}
+        self.shared = 0  # schemas servidos desde el compilado de otra ruta
+
+    def get(self, schema_path: Path) -> CompiledSchema:
+        schema_path = Path(schema_path).resolve()
+        compiled = self._compiled.get(schema_path)
+        if compiled is None:
+            digest = hashlib.sha256(schema_path.read_bytes()).hexdigest()
+            compiled = self._by_digest.get(digest)
+            if compiled is not None and self._deps_unchanged(schema_path, compiled.bundle["deps"]):
+                self.shared += 1
+            else:
+                compiled = CompiledSchema(self._bundle(schema_path, digest))
+                self._by_digest[digest] = compiled
+            self._compiled[schema_path] = compiled
+        return compiled
+
+    def _cache_file(self, schema_path: Path, digest: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"schema-{schema_path.stem}-{digest[:16]}.json"
+
+    def _bundle(self, schema_path: Path, digest: Optional[str] = None) -> Dict[str, Any]:
+        digest = digest or hashlib.sha256(schema_path.read_bytes()).hexdigest()
+        cache_file = self._cache_file(schema_path, digest)
+        if cache_file is not None and cache_file.exists():
+            try:
+                with open(cache_file, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("version") == CACHE_VERSION and self._deps_unchanged(schema_path, cached["deps"]):
+                    return cached
+            except (OSError, ValueError, KeyError):
+                pass
+        bundle = bundle_schema(schema_path)
+        if cache_file is not None:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_name(cache_file.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(bundle, f, ensure_ascii=False)
+            os.replace(tmp, cache_file)
+        return bundle
+
+    @staticmethod
+    def _deps_unchanged(schema_path: Path, deps: Dict[str, str]) -> bool:
+        for rel, digest in deps.items():
+            try:
+                data = (schema_path.parent / rel).read_bytes()
+            except OSError:
+                return False
+            if hashlib.sha256(data).hexdigest() != digest:
+                return False
+        return True
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2:
+        print(__doc__.strip().splitlines()[-1].strip())
+        return 2
+    schema = SchemaRegistry().get(Path(argv[0]))
+    failures = 0
+    for instance_path in argv[1:]:
+        with open(instance_path, "r", encoding="utf-8") as f:
+            instance = json.load(f)
+        violations = schema.validate(instance)
+        if violations:
+            failures += 1
+            print(f"❌ {instance_path}: {len(violations)} incumplimientos")
+            for v in violations:
+                print(f"  - {v}")
+        else:
+            print(f"✅ {instance_path}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
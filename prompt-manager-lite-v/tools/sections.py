@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Prompt Manager Lite - Secciones por encabezado y árbol Merkle
+
+Un DOC se divide en secciones por sus encabezados markdown (`#` … `######`,
+ignorando los que están dentro de bloques de código). Cada sección tiene su
+hash y su número de placeholders; la raíz Merkle del archivo se calcula sobre
+los hashes de sus secciones y la del repositorio sobre las raíces de todos los
+archivos de la línea base.
+
+Así verify_integrity.py puede:
+- re-escanear solo las secciones cuyo hash cambió (el resto reutiliza el
+  recuento guardado),
+- decir qué secciones siguen siendo plantilla,
+- resumir "no cambió nada" en una sola comparación de raíces. La raíz del
+  repositorio se recompone con la de cada archivo, así que antes hay que
+  hacer stat de todos (y leer los que cambiaron): la verificación sigue
+  siendo O(archivos); lo que se ahorra es comparar archivo a archivo.
+
+Los archivos sin encabezados (p. ej. los schemas JSON) forman una única sección.
+"""
+
+import hashlib
+import re
+
+_HEADING = re.compile(r' {0,3}(#{1,6})(?:[ \t]+(.*?))?[ \t#]*$')
+_FENCE = re.compile(r' {0,3}(`{3,}|~{3,})')
+
+
+def split_sections(content):
+    """Divide un texto en [(encabezado, texto)]; el preámbulo tiene encabezado ''."""
+    sections = []
+    heading = ''
+    start = 0
+    pos = 0
+    fence = None
+    for line in content.splitlines(keepends=True):
+        stripped = line.rstrip('\n')
+        match = _FENCE.match(stripped)
+        if fence is not None:
+            if match and match.group(1)[0] == fence[0] and len(match.group(1)) >= len(fence):
+                fence = None
+        elif match:
+            fence = match.group(1)
+        else:
+            match = _HEADING.match(stripped)
+            if match:
+                if pos > start or sections or heading:
+                    sections.append((heading, content[start:pos]))
+                heading = f"{match.group(1)} {match.group(2) or ''}".rstrip()
+                start = pos
+        pos += len(line)
+    sections.append((heading, content[start:]))
+    return sections
+
+
+def section_hash(text):
+    return hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def merkle_root(hashes):
+    """Raíz Merkle (SHA-256 por pares, el nodo impar sube sin cambios) de hashes hex."""
+    level = [bytes.fromhex(h) for h in hashes]
+    if not level:
+        return hashlib.sha256(b'').hexdigest()
+    while len(level) > 1:
+        paired = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0].hex()
+
+
+def file_root(sections):
+    """Raíz Merkle de un archivo a partir de sus secciones [(encabezado, hash, placeholders)]."""
+    return merkle_root([h for _, h, _ in sections])
+
+
+def repo_root(roots):
+    """Raíz del repositorio a partir de {ruta relativa: raíz del archivo}."""
+    return merkle_root([
+        hashlib.sha256(f"{rel}\0{root}".encode('utf-8', 'surrogateescape')).hexdigest()
+        for rel, root in sorted(roots.items()) if root
+    ])
+
+
+def known_counts(record):
+    """{hash de sección: placeholders} de un registro de la línea base (vacío si no tiene secciones)."""
+    return {h: count for _, h, count in record.get('sections') or ()}
+
+
+def compare(initial_sections, current_sections):
+    """Estado por sección frente a la línea base.
+
+    Devuelve [(encabezado, estado, placeholders)] con estado 'template'
+    (igual y con placeholders), 'unchanged' (igual y sin placeholders),
+    'completed' (cambió y no le quedan), 'in-progress' (cambió y le quedan
+    menos), 'modified' (cambió sin bajar de placeholders) o 'new'
+    (encabezado que no existía).
+    """
+    initial = {}
+    for heading, h, count in initial_sections:
+        initial.setdefault(heading, []).append((h, count))
+    report = []
+    for heading, h, count in current_sections:
+        candidates = initial.get(heading)
+        if not candidates:
+            report.append((heading, 'new', count))
+            continue
+        before_hash, before_count = candidates.pop(0)
+        if h == before_hash:
+            state = 'template' if count else 'unchanged'
+        elif count == 0:
+            state = 'completed'
+        elif count < before_count:
+            state = 'in-progress'
+        else:
+            state = 'modified'
+        report.append((heading, state, count))
+    return report
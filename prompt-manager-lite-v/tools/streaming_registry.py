@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Prompt Manager Lite - Registro de IDs de streaming_files
+
+Cada carpeta de streaming_files (features, bugs, operations, proposals) guarda
+en su `manifest.json`, además de la descripción, un índice ordenado de sus
+elementos: ID (`F###`, `B###`, `T###`, `IDEA###`), slug, estado (campo
+`status` del frontmatter), archivo de especificación y su SHA-256, junto con
+el siguiente número libre.
+
+- `sync` recorre la carpeta una vez y solo vuelve a leer las especificaciones
+  nuevas o cuyo stat cambió (el stat vive en .verify_cache/registry.json, no
+  en el manifest versionado).
+- Búsqueda por ID con bisect y siguiente ID en O(1).
+- `new` reserva el ID bajo un lock de archivo (flock / msvcrt), crea la
+  carpeta `<ID>-<slug>` a partir de `template.md` y actualiza el manifest de
+  forma atómica: varios agentes en paralelo nunca obtienen el mismo ID, ni
+  uno que ya tenga una carpeta creada a mano sin sincronizar.
+
+Uso:
+    python3 tools/streaming_registry.py sync
+    python3 tools/streaming_registry.py list features [--status draft]
+    python3 tools/streaming_registry.py show F000
+    python3 tools/streaming_registry.py next bugs
+    python3 tools/streaming_registry.py new features login-social --title "Login social"
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+if (SCRIPT_DIR / 'manifests').exists() and (SCRIPT_DIR / 'guides').exists():
+    BASE_PATH = SCRIPT_DIR
+else:
+    BASE_PATH = SCRIPT_DIR.parent
+CACHE_DIR = BASE_PATH / '.verify_cache'
+
+# carpeta: (prefijo de ID, archivo de especificación de cada elemento)
+FOLDERS = {
+    'features': ('F', 'feature_spec.md'),
+    'bugs': ('B', 'bug_report.md'),
+    'operations': ('T', 'task_spec.md'),
+    'proposals': ('IDEA', 'idea_spec.md'),
+}
+ID_DIGITS = 3
+
+_ITEM_DIR = re.compile(r'(F|B|T|IDEA)(\d+)(?:-(.+))?')
+_ID = re.compile(r'(F|B|T|IDEA)(\d+)')
+_STATUS = re.compile(r'status:[ \t]*(.*)')
+
+
+class RegistryError(Exception):
+    """ID o carpeta que no existe en el registro."""
+
+
+def format_id(prefix, number):
+    return f'{prefix}{number:0{ID_DIGITS}d}'
+
+
+def folder_of(item_id):
+    """Carpeta de streaming_files a la que pertenece un ID (p. ej. 'F001' -> 'features')."""
+    match = _ID.fullmatch(item_id)
+    if match:
+        for folder, (prefix, _) in FOLDERS.items():
+            if prefix == match.group(1):
+                return folder
+    raise RegistryError(f'ID no válido: {item_id}')
+
+
+def slugify(text):
+    slug = re.sub(r'[^\w-]+', '-', text.strip(), flags=re.UNICODE).strip('-')
+    return re.sub(r'-{2,}', '-', slug)
+
+
+def read_status(content):
+    """Valor de `status` del frontmatter inicial (--- … ---), o None."""
+    if not content.startswith('---\n'):
+        return None
+    end = content.find('\n---', 3)
+    match = _STATUS.search(content, 4, end if end != -1 else len(content))
+    return match.group(1).strip().strip('"\'') or None if match else None
+
+
+def _write_json(path, data):
+    """Escritura atómica (tmp propio del proceso + os.replace)."""
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _locked(lock_path):
+    """Lock exclusivo entre procesos sobre lock_path (se bloquea hasta obtenerlo)."""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK reintenta 10 s; se sigue esperando
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class StatCache:
+    """{ruta relativa de la especificación: [mtime_ns, size, sha256, status]} en .verify_cache."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def lookup(self, rel, st):
+        entry = self.entries.get(rel)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2], entry[3]
+        return None
+
+    def store(self, rel, st, digest, status):
+        self.entries[rel] = [st.st_mtime_ns, st.st_size, digest, status]
+        self.dirty = True
+
+    def save(self):
+        if self.dirty:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            _write_json(self.path, self.entries)
+            self.dirty = False
+
+
+class Registry:
+    """Índice persistido de los elementos de una carpeta de streaming_files."""
+
+    def __init__(self, folder, base=BASE_PATH, cache=None):
+        if folder not in FOLDERS:
+            raise RegistryError(f'carpeta desconocida: {folder} (usa {", ".join(FOLDERS)})')
+        self.folder = folder
+        self.prefix, self.spec_name = FOLDERS[folder]
+        self.base = Path(base)
+        self.dir = self.base / 'streaming_files' / folder
+        self.manifest_path = self.dir / 'manifest.json'
+        self.lock_path = self.base / '.verify_cache' / f'registry-{folder}.lock'
+        self.cache = cache or StatCache(self.base / '.verify_cache' / 'registry.json')
+        self.manifest = {}
+        self.items = []
+        self._numbers = []
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        except FileNotFoundError:
+            self.manifest = {}
+        self._set_items(self.manifest.get('items', []))
+
+    def _set_items(self, items):
+        self.items = sorted(items, key=lambda item: item['number'])
+        self._numbers = [item['number'] for item in self.items]
+
+    def get(self, item_id):
+        """Elemento con ese ID (búsqueda binaria), o None."""
+        match = _ID.fullmatch(item_id)
+        if not match or match.group(1) != self.prefix:
+            return None
+        number = int(match.group(2))
+        i = bisect_left(self._numbers, number)
+        return self.items[i] if i < len(self._numbers) and self._numbers[i] == number else None
+
+    def next_number(self):
+        """Siguiente número libre; nunca reutiliza el de un elemento borrado.
+
+        Las carpetas creadas a mano y aún sin sincronizar también ocupan su
+        número (un scandir de la carpeta, sin leer las especificaciones).
+        """
+        last = self._numbers[-1] + 1 if self._numbers else 0
+        on_disk = self._disk_numbers()
+        return max(self.manifest.get('next', 0), last, max(on_disk) + 1 if on_disk else 0)
+
+    def next_id(self):
+        return format_id(self.prefix, self.next_number())
+
+    def _spec_path(self, item_dir):
+        spec = item_dir / self.spec_name
+        if spec.is_file():
+            return spec
+        specs = sorted(item_dir.glob('*.md'))
+        return specs[0] if specs else None
+
+    def _describe(self, item_dir, match):
+        """Entrada del índice para una carpeta de elemento (re-lee solo si cambió su stat)."""
+        spec = self._spec_path(item_dir)
+        item = {
+            'id': format_id(self.prefix, int(match.group(2))),
+            'number': int(match.group(2)),
+            'slug': match.group(3) or '',
+            'dir': item_dir.name,
+            'spec': None,
+            'status': None,
+            'sha256': None,
+        }
+        if spec is None:
+            return item
+        rel = spec.relative_to(self.base).as_posix()
+        st = spec.stat()
+        cached = self.cache.lookup(rel, st)
+        if cached is None:
+            data = spec.read_bytes()
+            cached = (hashlib.sha256(data).hexdigest(), read_status(data.decode('utf-8', 'replace')))
+            self.cache.store(rel, st, *cached)
+        item['spec'] = spec.relative_to(self.dir).as_posix()
+        item['sha256'], item['status'] = cached
+        return item
+
+    def _disk_numbers(self):
+        """Números con carpeta `<PREFIJO><n>-*` en disco, registrados o no."""
+        try:
+            entries = list(os.scandir(self.dir))
+        except FileNotFoundError:
+            return set()
+        numbers = set()
+        for entry in entries:
+            match = _ITEM_DIR.fullmatch(entry.name)
+            if match and match.group(1) == self.prefix and entry.is_dir():
+                numbers.add(int(match.group(2)))
+        return numbers
+
+    def _scan(self):
+        items = []
+        try:
+            entries = list(os.scandir(self.dir))
+        except FileNotFoundError:
+            return items
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            match = _ITEM_DIR.fullmatch(entry.name)
+            if match and match.group(1) == self.prefix:
+                items.append(self._describe(Path(entry.path), match))
+        return items
+
+    def _save(self):
+        manifest = {k: v for k, v in self.manifest.items() if k not in ('prefix', 'next', 'items')}
+        manifest.update(prefix=self.prefix, next=self.next_number(), items=self.items)
+        self.manifest = manifest
+        _write_json(self.manifest_path, manifest)
+
+    def sync(self):
+        """Actualiza el índice con la carpeta; devuelve (añadidos, cambiados, eliminados)."""
+        with _locked(self.lock_path):
+            self.load()
+            before = {item['dir']: item for item in self.items}
+            items = self._scan()
+            after = {item['dir']: item for item in items}
+            added = sorted(d for d in after if d not in before)
+            removed = sorted(d for d in before if d not in after)
+            changed = sorted(d for d in after if d in before and after[d] != before[d])
+            next_before = self.next_number()
+            self._set_items(items)
+            self.manifest['next'] = max(next_before, self.next_number())
+            if added or removed or changed or self.manifest.get('prefix') != self.prefix:
+                self._save()
+            self.cache.save()
+        return added, changed, removed
+
+    def allocate(self, slug, title=None):
+        """Reserva el siguiente ID, crea `<ID>-<slug>/<especificación>` desde template.md y lo registra."""
+        slug = slugify(slug)
+        if not slug:
+            raise RegistryError('el slug no puede estar vacío')
+        template = self.dir / 'template.md'
+        with _locked(self.lock_path):
+            self.load()
+            number = self.next_number()
+            while True:
+                item_dir = self.dir / f'{format_id(self.prefix, number)}-{slug}'
+                try:
+                    item_dir.mkdir(parents=True)
+                    break
+                except FileExistsError:
+                    number += 1
+            spec = item_dir / self.spec_name
+            if template.is_file():
+                content = template.read_text(encoding='utf-8')
+                spec.write_text(fill_frontmatter(content, title), encoding='utf-8')
+            else:
+                spec.touch()
+            item = self._describe(item_dir, _ITEM_DIR.fullmatch(item_dir.name))
+            self._set_items([i for i in self.items if i['number'] != number] + [item])
+            self.manifest['next'] = number + 1
+            self._save()
+            self.cache.save()
+        return item
+
+
+def fill_frontmatter(content, title=None):
+    """Deja el primer estado de `status: a|b|c` y, si se indica, el título."""
+    if not content.startswith('---\n'):
+        return content
+    end = content.find('\n---', 3)
+    if end == -1:
+        return content
+    head = content[:end]
+    head = re.sub(r'(?m)^status:[ \t]*([^|\n]*)\|.*$', lambda m: f'status: {m.group(1).strip()}', head, count=1)
+    if title:
+        head = re.sub(r'(?m)^title:.*$', lambda m: f'title: {json.dumps(title, ensure_ascii=False)}', head, count=1)
+    return head + content[end:]
+
+
+def open_registries(base=BASE_PATH):
+    """Un Registry por carpeta, compartiendo la caché de stat."""
+    cache = StatCache(Path(base) / '.verify_cache' / 'registry.json')
+    return {folder: Registry(folder, base, cache) for folder in FOLDERS}
+
+
+def lookup(item_id, base=BASE_PATH):
+    """Elemento de cualquier carpeta por su ID, o None."""
+    return Registry(folder_of(item_id), base).get(item_id)
+
+
+def _print_item(item):
+    status = item['status'] or '-'
+    print(f"{item['id']:<9} {status:<14} {item['dir']}/{(item['spec'] or '').rsplit('/', 1)[-1]}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Registro de IDs de streaming_files')
+    sub = parser.add_subparsers(dest='command', required=True)
+    cmd = sub.add_parser('sync', help='actualiza los manifest.json con las carpetas existentes')
+    cmd.add_argument('folders', nargs='*', metavar='carpeta', help=', '.join(FOLDERS) + ' (por defecto, todas)')
+    cmd = sub.add_parser('list', help='lista los elementos registrados')
+    cmd.add_argument('folders', nargs='*', metavar='carpeta', help=', '.join(FOLDERS) + ' (por defecto, todas)')
+    cmd.add_argument('--status', default=None)
+    cmd = sub.add_parser('show', help='muestra un elemento por su ID')
+    cmd.add_argument('id')
+    cmd = sub.add_parser('next', help='siguiente ID libre (sin reservarlo)')
+    cmd.add_argument('folder', choices=sorted(FOLDERS), metavar='carpeta')
+    cmd = sub.add_parser('new', help='reserva un ID y crea el elemento desde template.md')
+    cmd.add_argument('folder', choices=sorted(FOLDERS), metavar='carpeta')
+    cmd.add_argument('slug')
+    cmd.add_argument('--title', default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        if args.command in ('sync', 'list'):
+            cache = StatCache(CACHE_DIR / 'registry.json')
+            for folder in args.folders or FOLDERS:
+                registry = Registry(folder, cache=cache)
+                if args.command == 'sync':
+                    added, changed, removed = registry.sync()
+                    print(f"📇 {folder}: {len(registry.items)} elementos, siguiente {registry.next_id()}"
+                          f" (+{len(added)} ~{len(changed)} -{len(removed)})")
+                    continue
+                for item in registry.items:
+                    if args.status is None or item['status'] == args.status:
+                        _print_item(item)
+        elif args.command == 'show':
+            item = lookup(args.id)
+            if item is None:
+                print(f"❌ {args.id} no está registrado (¿falta ejecutar sync?)")
+                return 1
+            print(json.dumps(item, indent=2, ensure_ascii=False))
+        elif args.command == 'next':
+            print(Registry(args.folder).next_id())
+        else:
+            registry = Registry(args.folder)
+            item = registry.allocate(args.slug, args.title)
+            print(f"✅ {item['id']}: {(registry.dir / item['spec']).relative_to(BASE_PATH)}")
+    except RegistryError as e:
+        print(f"❌ {e}")
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
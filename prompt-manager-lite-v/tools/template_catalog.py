@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Prompt Manager Lite - Catálogo de huellas de plantillas
+
+Huellas direccionadas por contenido de las plantillas de origen de cada
+proyecto: los `template.md` de streaming_files/*, `template-pendingtask.md`
+y los `template-*.md` de docs/ (y real_structure_documentation/docs/). Solo
+estos archivos son plantillas por definición; los DOCs se rellenan en cada
+proyecto y no sirven como referencia. El catálogo es del proyecto, no de
+tools/: se guarda en su .verify_cache/template_catalog.json junto con un
+hash de las plantillas de origen, y se recalcula solo si ese hash o la
+versión del escáner de placeholders cambian (editar una plantilla lo
+invalida). Permite:
+
+- Plantilla intacta: un archivo cuyo SHA-256 está en el catálogo es una
+  plantilla sin tocar (esté donde esté, p. ej. un template.md recién copiado).
+  verify_integrity reutiliza entonces el análisis guardado (secciones,
+  placeholders, estadísticas de texto) sin decodificar ni escanear.
+- Copias parecidas: el texto se divide en bloques definidos por el contenido
+  (párrafos separados por líneas en blanco), así que insertar o borrar texto
+  solo cambia los bloques tocados y no desplaza los demás. Cada bloque tiene
+  un hash corto; un índice invertido hash → plantillas hace que comparar un
+  archivo cueste una consulta por bloque y solo toque las plantillas con las
+  que comparte alguno. La fracción de bloques de la plantilla que siguen
+  intactos distingue "parcialmente rellenada" de "original".
+
+Uso:
+    python3 tools/template_catalog.py [--root RAÍZ] build
+    python3 tools/template_catalog.py [--root RAÍZ] match <archivo>...
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from placeholders import SCANNER_VERSION
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+if (SCRIPT_DIR / 'manifests').exists() and (SCRIPT_DIR / 'guides').exists():
+    BASE_PATH = SCRIPT_DIR
+else:
+    BASE_PATH = SCRIPT_DIR.parent
+CATALOG_NAME = 'template_catalog.json'
+CATALOG_VERSION = 2
+STREAMING_FOLDERS = ('features', 'bugs', 'operations', 'proposals')
+
+# Bloques con menos caracteres visibles (separadores `---`, `-`, títulos de
+# una palabra…) aparecen en casi cualquier archivo y no identifican nada
+MIN_BLOCK_CHARS = 12
+# Fracción mínima de bloques de la plantilla intactos para considerar una
+# copia "parcialmente rellenada"
+PARTIAL_MIN_SHARED = 0.25
+
+TEMPLATE = 'template'
+PARTIAL = 'partial'
+ORIGINAL = 'original'
+
+_BLANK_LINES = re.compile(r'\n[ \t]*\n')
+_SPACES = re.compile(r'\s+')
+
+
+def split_blocks(content):
+    """Bloques significativos del texto (párrafos), con los espacios normalizados."""
+    blocks = []
+    for block in _BLANK_LINES.split(content):
+        block = _SPACES.sub(' ', block).strip()
+        if len(block) - block.count(' ') >= MIN_BLOCK_CHARS:
+            blocks.append(block)
+    return blocks
+
+
+def block_hashes(content):
+    """Hash corto (64 bits) de cada bloque, en orden."""
+    return [hashlib.blake2b(b.encode('utf-8'), digest_size=8).hexdigest() for b in split_blocks(content)]
+
+
+def template_sources(base):
+    """(ruta relativa, ruta) de las plantillas de origen de un proyecto, ordenadas."""
+    base = Path(base)
+    found = [base / 'template-pendingtask.md']
+    found += [base / 'streaming_files' / folder / 'template.md' for folder in STREAMING_FOLDERS]
+    for docs_dir in (base / 'docs', base / 'real_structure_documentation' / 'docs'):
+        found += docs_dir.glob('template-*.md')
+    return sorted((p.relative_to(base).as_posix(), p) for p in found if p.is_file())
+
+
+def sources_digest(hashes):
+    """Hash del conjunto de plantillas de origen a partir de {ruta relativa: sha256}."""
+    h = hashlib.sha256()
+    for rel in sorted(hashes):
+        h.update(f'{rel}\0{hashes[rel]}\n'.encode('utf-8'))
+    return h.hexdigest()
+
+
+def current_sources(base):
+    """Hash de las plantillas de origen tal como están ahora en disco."""
+    hashes = {}
+    for rel, path in template_sources(base):
+        try:
+            hashes[rel] = hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            continue
+    return sources_digest(hashes)
+
+
+def catalog_path(base):
+    return Path(base) / '.verify_cache' / CATALOG_NAME
+
+
+class TemplateCatalog:
+    """Huellas de las plantillas canónicas: hash completo y hashes por bloque."""
+
+    def __init__(self, templates=None, scanner=None, sources=None):
+        # {ruta relativa: {sha256, placeholder_count, placeholders, sections, merkle, text, blocks}}
+        self.templates = templates or {}
+        self.scanner = scanner
+        self.sources = sources  # sources_digest() de las plantillas con que se calculó
+        self.by_hash = {}
+        self._blocks = {}  # hash de bloque -> rutas de las plantillas que lo contienen
+        self._distinct = {}  # bloques distintos de cada plantilla
+        for rel, entry in self.templates.items():
+            self.by_hash.setdefault(entry['sha256'], rel)
+            distinct = set(entry['blocks'])
+            self._distinct[rel] = len(distinct)
+            for h in distinct:
+                self._blocks.setdefault(h, []).append(rel)
+
+    @classmethod
+    def load(cls, path):
+        """Catálogo guardado; uno vacío si no existe o es de otra versión."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if data.get('version') != CATALOG_VERSION:
+            return cls()
+        return cls(data.get('templates', {}), data.get('scanner'), data.get('sources'))
+
+    def save(self, path):
+        data = {'version': CATALOG_VERSION, 'scanner': self.scanner, 'sources': self.sources,
+                'templates': self.templates}
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(path).with_name(f'{Path(path).name}.{os.getpid()}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, ensure_ascii=False, sort_keys=True)
+            f.write('\n')
+        os.replace(tmp, path)
+
+    def __len__(self):
+        return len(self.templates)
+
+    def lookup(self, sha256):
+        """(ruta, huella) de la plantilla con ese contenido exacto, o None."""
+        rel = self.by_hash.get(sha256)
+        return (rel, self.templates[rel]) if rel is not None else None
+
+    def nearest(self, content):
+        """(plantilla, bloques intactos, bloques de la plantilla) más parecida, o None.
+
+        Solo se consultan las plantillas que comparten algún bloque con el
+        texto (diff disperso por índice invertido).
+        """
+        shared = {}
+        for h in set(block_hashes(content)):
+            for rel in self._blocks.get(h, ()):
+                shared[rel] = shared.get(rel, 0) + 1
+        if not shared:
+            return None
+        distinct = self._distinct
+        rel = max(shared, key=lambda r: (shared[r] / distinct[r], shared[r], r))
+        return rel, shared[rel], distinct[rel]
+
+    def match(self, sha256, content=None):
+        """Clasifica un contenido: (TEMPLATE|PARTIAL|ORIGINAL, plantilla o None, fracción intacta).
+
+        Con el hash basta para reconocer una plantilla intacta; content (texto
+        decodificado) solo hace falta para comparar por bloques.
+        """
+        exact = self.lookup(sha256)
+        if exact is not None:
+            return TEMPLATE, exact[0], 1.0
+        nearest = self.nearest(content) if content is not None else None
+        if nearest is not None:
+            rel, kept, total = nearest
+            if kept / total >= PARTIAL_MIN_SHARED:
+                return PARTIAL, rel, kept / total
+        return ORIGINAL, None, 0.0
+
+
+_catalogs = {}  # raíz del proyecto -> catálogo
+
+
+def load_catalog(base=BASE_PATH):
+    """Catálogo del proyecto en base, vigente para sus plantillas actuales.
+
+    Se carga una vez por proceso y raíz (los procesos del pool lo heredan). Si
+    falta, es de otra versión del escáner o las plantillas de origen cambiaron
+    desde que se calculó, se recalcula y se guarda en .verify_cache.
+    """
+    key = Path(base).resolve()
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        catalog = TemplateCatalog.load(catalog_path(key))
+        if catalog.scanner != SCANNER_VERSION or catalog.sources != current_sources(key):
+            catalog = build(key, quiet=True)
+        _catalogs[key] = catalog
+    return catalog
+
+
+def build(base=BASE_PATH, quiet=False):
+    """Calcula las huellas de las plantillas de origen de `base` y las guarda en su catálogo."""
+    import verify_integrity as vi
+
+    base = Path(base)
+    templates = {}
+    for rel, file_path in template_sources(base):
+        # Sin catálogo: se escanea de verdad, no se copia la huella anterior
+        analysis, errors = vi._analyze(file_path, catalog=None)
+        if errors or not analysis['hash']:
+            for message in errors:
+                if not quiet:
+                    print(f"❌ {message}")
+            continue
+        content = vi.decode_text(file_path.read_bytes())
+        stats = analysis['stats']
+        templates[rel] = {
+            'sha256': analysis['hash'],
+            'placeholder_count': analysis['placeholder_count'],
+            'placeholders': analysis['placeholders'],
+            'sections': analysis['sections'],
+            'merkle': analysis['merkle'],
+            'text': {'lines': stats['lines'], 'chars': stats['chars'], 'words': stats['words']},
+            'blocks': block_hashes(content),
+        }
+        if not quiet:
+            print(f"✅ {rel}: {len(templates[rel]['blocks'])} bloques, "
+                  f"{analysis['placeholder_count']} placeholders")
+    sources = sources_digest({rel: entry['sha256'] for rel, entry in templates.items()})
+    catalog = TemplateCatalog(templates, SCANNER_VERSION, sources)
+    path = catalog_path(base)
+    try:
+        catalog.save(path)
+    except OSError as e:
+        # Proyecto de solo lectura: el catálogo vale igual en memoria
+        if not quiet:
+            print(f"⚠️  No se pudo guardar el catálogo en {path}: {e}")
+    else:
+        if not quiet:
+            print(f"\n📚 Catálogo de plantillas: {len(catalog)} plantillas → {path}")
+    _catalogs[base.resolve()] = catalog
+    return catalog
+
+
+def describe(state, template, kept, rel=None):
+    """Texto corto del resultado de match(); rel omite la plantilla si es el propio archivo."""
+    if state == TEMPLATE:
+        return "plantilla sin modificar" + ("" if template == rel else f" de {template}")
+    if state == PARTIAL:
+        return f"plantilla parcialmente rellenada, {kept:.0%} de los bloques de {template} intactos"
+    return "contenido original"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Catálogo de huellas de las plantillas de origen")
+    parser.add_argument('--root', default=None, metavar='RAÍZ',
+                        help="proyecto cuyas plantillas se usan (por defecto, el que contiene tools/)")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('build', help="recalcula el catálogo a partir de las plantillas del proyecto")
+    match = sub.add_parser('match', help="indica si cada archivo es una plantilla, una copia parcial u original")
+    match.add_argument('files', nargs='+')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    base = Path(args.root) if args.root else BASE_PATH
+    if args.command == 'build':
+        build(base)
+        return 0
+    catalog = load_catalog(base)
+    if not len(catalog):
+        print(f"❌ {base} no tiene plantillas de origen (template.md, template-*.md)")
+        return 2
+    for name in args.files:
+        try:
+            data = Path(name).read_bytes()
+            content = data.decode('utf-8')
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"❌ {name}: {e}")
+            continue
+        state, template, kept = catalog.match(hashlib.sha256(data).hexdigest(), content.replace('\r\n', '\n'))
+        print(f"{name}: {describe(state, template, kept)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
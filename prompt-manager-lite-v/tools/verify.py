@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Prompt Manager Lite - Verificación completa
+
+Ejecuta en un solo proceso y con un solo recorrido del árbol:
+1) verify_docs_and_schemas.py (manifest, playbooks, guías, schemaRefs)
+2) verify_integrity.py (estado de archivos frente a la línea base)
+
+Ambas herramientas leen del mismo RepoIndex y escriben sus hallazgos en el
+mismo destino (--format text|ndjson|sarif).
+
+`verify.py watch` mantiene ese estado en memoria y re-verifica solo lo que
+afecta a cada cambio (ver watch.py). `--changed-since REF` hace lo mismo una
+sola vez para los cambios desde REF (ver impact.py), p. ej. en un PR.
+"""
+
+import argparse
+
+import impact
+import verify_docs_and_schemas
+import verify_integrity
+import watch
+from findings import add_report_arguments, close_sink, open_sink
+from integrity_store import BACKENDS
+from profiling import add_profile_arguments, finish_profile, phase, start_profile
+from repo_index import RepoIndex
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Verificación completa de Prompt Manager Lite")
+    parser.add_argument('command', nargs='?', choices=['check', 'watch'], default='check',
+                        help="'check' (por defecto) verifica una vez; 'watch' sigue verificando según cambian los archivos")
+    parser.add_argument('--paranoid', action='store_true',
+                        help="re-hashea todos los archivos aunque su stat no haya cambiado")
+    parser.add_argument('--jobs', '-j', type=int, default=None, metavar='N',
+                        help="procesos de análisis en paralelo (por defecto: número de CPUs; 1 = serie)")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=verify_integrity.DEFAULT_BACKEND,
+                        help="almacén de la línea base de integridad")
+    parser.add_argument('--git', action='store_true',
+                        help="reconoce archivos sin cambios por su blob id en .git/index")
+    parser.add_argument('--changed-since', metavar='REF', default=None,
+                        help="solo las comprobaciones y archivos afectados por los cambios desde REF de git "
+                             f"(o '{impact.BASELINE_REF}' para compararse con la línea base de integridad)")
+    parser.add_argument('--poll', action='store_true',
+                        help="con 'watch': sondea el stat en lugar de usar inotify")
+    parser.add_argument('--interval', type=float, default=watch.DEFAULT_INTERVAL_S, metavar='S',
+                        help=f"con 'watch' y sondeo: segundos entre recorridos (por defecto {watch.DEFAULT_INTERVAL_S:g})")
+    add_profile_arguments(parser)
+    add_report_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'watch':
+        return watch.run(backend=args.backend, jobs=args.jobs, poll=args.poll, interval=args.interval)
+    profiler = start_profile(args, 'verify')
+    sink = open_sink(args, 'verify')
+    with phase(profiler, 'recorrido del árbol'):
+        index = RepoIndex.build(verify_docs_and_schemas.BASE)
+    changes = old_manifest = None
+    if args.changed_since:
+        try:
+            with phase(profiler, 'cambios desde ' + args.changed_since):
+                changes, old_manifest = impact.collect_changes(args.changed_since, index, args.backend)
+        except impact.ChangeSourceError as e:
+            impact.report_source_error(sink, e)
+            close_sink(sink)
+            finish_profile(profiler, args)
+            return 2
+
+    exit_code = verify_docs_and_schemas.main(index=index, profiler=profiler, sink=sink,
+                                             changes=changes, old_manifest=old_manifest)
+
+    summary = None
+    if not (args.fail_fast and sink.failed):
+        sink.info()
+        sink.info("=" * 60)
+        sink.info("🔍 PROMPT MANAGER LITE - VERIFICADOR DE INTEGRIDAD")
+        sink.info("=" * 60)
+        summary = verify_integrity.verify_file_integrity(
+            paranoid=args.paranoid, jobs=args.jobs, backend=args.backend, index=index,
+            profiler=profiler, sink=sink, git=args.git, only=None if changes is None else set(changes),
+        )
+    close_sink(sink, summary and {'integrity': summary})
+    finish_profile(profiler, args)
+    return 1 if sink.failed else exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Prompt Manager Lite - Verificación por lotes de muchos proyectos
+
+Verifica (docs y schemas + integridad, como verify.py) una lista de raíces de
+proyecto repartiéndolas entre procesos, sin arrancar un intérprete por
+proyecto ni depender de dónde está tools/:
+
+- Las raíces se dan como rutas o globs (`~/checkouts/*`, `repos/**/prompt-manager-lite-v`)
+  y/o en un archivo con una por línea (--from-file, `-` para la entrada
+  estándar). Lo que un glob encuentre sin manifests/ y guides/ se ignora; una
+  ruta explícita que no sea un proyecto se informa como error.
+- Cada proceso mantiene un `pml_api.SharedCaches` durante todo el lote: los
+  schemas con el mismo contenido se compilan una vez y las guías idénticas se
+  escanean una vez, aunque estén en proyectos distintos. --cache-dir guarda
+  además los schemas empaquetados en un directorio común.
+- Un solo informe agregado: una línea por proyecto (con sus errores) y un
+  resumen con el total y el rendimiento (proyectos/s y archivos/s). Con
+  --format ndjson, un registro "project" por proyecto y un "summary" final.
+
+Código de salida: 0 si todos los proyectos están OK, 1 si alguno falla y 2 si
+no se encontró ningún proyecto.
+
+Uso: python3 tools/verify_batch.py RAÍZ|GLOB... [--from-file F] [--jobs N]
+"""
+from __future__ import annotations
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import pml_api
+from integrity_store import BACKENDS
+
+FORMATS = ("text", "ndjson")
+# Estados de integridad que corresponden a un archivo verificado
+FILE_STATES = ("completed", "in_progress", "modified", "templates", "unchanged", "missing", "new")
+
+# Fallos que afectan a un solo proyecto: raíz inválida, archivos ilegibles,
+# línea base corrupta (sqlite, JSON mal formado o sin sus claves) o texto
+# que no se puede decodificar. Se informan en su proyecto sin detener el lote.
+PROJECT_ERRORS = (pml_api.ProjectError, OSError, ValueError, KeyError, sqlite3.Error)
+
+# Cachés del proceso (uno por worker; se reutiliza en todos sus proyectos)
+_caches: Optional[pml_api.SharedCaches] = None
+
+
+def _has_magic(pattern: str) -> bool:
+    return any(ch in pattern for ch in "*?[")
+
+
+def expand_roots(patterns: Iterable[str]) -> List[Tuple[str, bool]]:
+    """Rutas de proyecto sin duplicados, en orden: [(ruta, explícita)]."""
+    roots: List[Tuple[str, bool]] = []
+    seen: Dict[str, int] = {}
+    for pattern in patterns:
+        pattern = os.path.expanduser(pattern)
+        if _has_magic(pattern):
+            matches = [(m, False) for m in sorted(glob.glob(pattern, recursive=True)) if os.path.isdir(m)]
+        else:
+            matches = [(pattern, True)]
+        for path, explicit in matches:
+            key = os.path.realpath(path)
+            if key not in seen:
+                seen[key] = len(roots)
+                roots.append((path, explicit))
+            elif explicit:
+                # Nombrada explícitamente aunque un glob la encontrara antes: se informa si no es un proyecto
+                i = seen[key]
+                roots[i] = (roots[i][0], True)
+    return roots
+
+
+def read_root_list(path: str) -> List[str]:
+    """Raíces de un archivo de texto, una por línea ('#' comenta, '-' = entrada estándar)."""
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        lines = [line.strip() for line in stream]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def select_projects(roots: List[Tuple[str, bool]]) -> List[str]:
+    """Descarta lo que un glob encontró sin estructura de proyecto; las rutas explícitas se conservan."""
+    return [
+        path for path, explicit in roots
+        if explicit or (os.path.isdir(os.path.join(path, "manifests")) and os.path.isdir(os.path.join(path, "guides")))
+    ]
+
+
+def _init_worker(cache_dir: Optional[str]) -> None:
+    global _caches
+    _caches = pml_api.SharedCaches(cache_dir)
+
+
+def verify_project(root: str, backend: str = pml_api.DEFAULT_BACKEND, paranoid: bool = False,
+                   git: bool = False) -> Dict[str, Any]:
+    """Verifica un proyecto con las cachés del proceso; devuelve su resumen serializable."""
+    if _caches is None:
+        _init_worker(None)
+    shared_before = _caches.shared
+    start = time.perf_counter()
+    record: Dict[str, Any] = {"type": "project", "root": root}
+    try:
+        result = pml_api.verify(root, backend=backend, paranoid=paranoid, git=git, caches=_caches)
+    except PROJECT_ERRORS as e:
+        message = str(e) if isinstance(e, pml_api.ProjectError) else f"{type(e).__name__}: {e}"
+        record.update(ok=False, seconds=round(time.perf_counter() - start, 4), files=0, errors=1, warnings=0,
+                      findings=[{"tool": "verify_batch", "code": "batch/project-error",
+                                 "severity": "error", "message": message}])
+        return record
+    docs, integrity = result.docs, result.integrity
+    record.update(
+        root=docs.root,
+        ok=result.ok,
+        seconds=round(time.perf_counter() - start, 4),
+        files=sum(integrity.counts.get(state, 0) for state in FILE_STATES),
+        errors=docs.errors + integrity.errors,
+        warnings=docs.warnings + sum(1 for f in integrity.findings if f.severity == "warning"),
+        docs={"errors": docs.errors, "warnings": docs.warnings},
+        integrity={"has_baseline": integrity.has_baseline, "errors": integrity.errors, "counts": integrity.counts},
+        shared={kind: n - shared_before[kind] for kind, n in _caches.shared.items()},
+        findings=[
+            {"tool": tool, **finding.to_dict()}
+            for tool, findings in (("verify_docs_and_schemas", docs.findings), ("verify_integrity", integrity.findings))
+            for finding in findings
+            if finding.severity in ("error", "warning")
+        ],
+    )
+    return record
+
+
+def _verify_args(args: Tuple[str, str, bool, bool]) -> Dict[str, Any]:
+    return verify_project(*args)
+
+
+def run_batch(roots: List[str], jobs: Optional[int] = None, backend: str = pml_api.DEFAULT_BACKEND,
+              paranoid: bool = False, git: bool = False, cache_dir: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Genera el resumen de cada proyecto, en el orden de `roots`, según van terminando.
+
+    Los proyectos se reparten en bloques consecutivos entre `jobs` procesos
+    (por defecto, uno por CPU); con jobs=1 todo se ejecuta en este proceso.
+    """
+    jobs = min(jobs or os.cpu_count() or 1, len(roots))
+    tasks = [(root, backend, paranoid, git) for root in roots]
+    if jobs <= 1:
+        _init_worker(cache_dir)
+        yield from map(_verify_args, tasks)
+        return
+    chunksize = max(1, len(tasks) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(cache_dir,)) as pool:
+        yield from pool.map(_verify_args, tasks, chunksize=chunksize)
+
+
+class BatchReport:
+    """Informe agregado; escribe cada proyecto en cuanto llega y el resumen al cerrar."""
+
+    def __init__(self, stream: TextIO, fmt: str, jobs: int, total: int):
+        self.stream = stream
+        self.fmt = fmt
+        self.jobs = jobs
+        self.total = total
+        self.projects = 0
+        self.ok = 0
+        self.errors = 0
+        self.warnings = 0
+        self.files = 0
+        self.shared = {"schemas": 0, "guides": 0}
+        self.start = time.perf_counter()
+        if fmt == "text":
+            self._print("=" * 60)
+            self._print("📦 Verificación por lotes de Prompt Manager Lite")
+            self._print("=" * 60)
+            self._print(f"📁 Proyectos: {total} | Procesos: {jobs}")
+
+    def _print(self, text: str = "") -> None:
+        print(text, file=self.stream)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self.projects += 1
+        self.ok += record["ok"]
+        self.errors += record["errors"]
+        self.warnings += record["warnings"]
+        self.files += record["files"]
+        for kind, n in record.get("shared", {}).items():
+            self.shared[kind] += n
+        if self.fmt == "ndjson":
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.stream.flush()
+            return
+        ms = record["seconds"] * 1000
+        if "docs" not in record:
+            self._print(f"❌ {record['root']} ({ms:.0f} ms)")
+        else:
+            integrity = record["integrity"]
+            state = f"{record['files']} archivos" if integrity["has_baseline"] else "sin línea base"
+            self._print(
+                f"{'✅' if record['ok'] else '❌'} {record['root']} — docs: {record['docs']['errors']} errores, "
+                f"{record['docs']['warnings']} advertencias | integridad: {state}, "
+                f"{integrity['errors']} errores ({ms:.0f} ms)"
+            )
+        for finding in record["findings"]:
+            if finding["severity"] == "error":
+                self._print(f"   ❌ {finding['message']}")
+
+    def close(self) -> Dict[str, Any]:
+        seconds = time.perf_counter() - self.start
+        summary = {
+            "type": "summary",
+            "projects": self.projects,
+            "ok": self.ok,
+            "failed": self.projects - self.ok,
+            "errors": self.errors,
+            "warnings": self.warnings,
+            "files": self.files,
+            "jobs": self.jobs,
+            "shared": self.shared,
+            "seconds": round(seconds, 3),
+            "projects_per_s": round(self.projects / seconds, 1) if seconds else None,
+            "files_per_s": round(self.files / seconds) if seconds else None,
+        }
+        if self.fmt == "ndjson":
+            self.stream.write(json.dumps(summary, ensure_ascii=False) + "\n")
+        else:
+            self._print("\n" + "-" * 60)
+            self._print("RESULTADO")
+            self._print(f"✅ Proyectos OK: {self.ok}/{self.projects}")
+            self._print(f"❌ Errores: {self.errors}")
+            self._print(f"⚠️  Advertencias: {self.warnings}")
+            self._print(f"♻️  Compartidos entre proyectos: {self.shared['schemas']} schemas, "
+                        f"{self.shared['guides']} guías")
+            self._print(f"⏱️  {self.projects} proyectos, {self.files} archivos en {seconds:.2f} s "
+                        f"({summary['projects_per_s']} proyectos/s, {summary['files_per_s']} archivos/s)")
+            self._print("-" * 60)
+            self._print("✔️  OK" if self.ok == self.projects else "❗ Revisión necesaria")
+        self.stream.flush()
+        return summary
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Verificación por lotes de muchos proyectos Prompt Manager Lite")
+    parser.add_argument("roots", nargs="*", metavar="RAÍZ",
+                        help="raíz de proyecto o glob (p. ej. '~/checkouts/*'; entre comillas para que lo expanda la herramienta)")
+    parser.add_argument("--from-file", "-f", action="append", default=[], metavar="ARCHIVO",
+                        help="archivo con una raíz o glob por línea ('-' para la entrada estándar)")
+    parser.add_argument("--jobs", "-j", type=int, default=None, metavar="N",
+                        help="procesos en paralelo (por defecto: número de CPUs; 1 = serie)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=pml_api.DEFAULT_BACKEND,
+                        help="almacén de la línea base de integridad")
+    parser.add_argument("--paranoid", action="store_true",
+                        help="re-hashea todos los archivos aunque su stat no haya cambiado")
+    parser.add_argument("--git", action="store_true",
+                        help="reconoce archivos sin cambios por su blob id en .git/index")
+    parser.add_argument("--cache-dir", default=None, metavar="DIR",
+                        help="directorio común para los schemas empaquetados (indexados por contenido)")
+    parser.add_argument("--format", choices=FORMATS, default="text",
+                        help="formato del informe (por defecto: text)")
+    parser.add_argument("--output", "-o", default=None, metavar="ARCHIVO",
+                        help="escribe el informe en ARCHIVO en lugar de la salida estándar")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    patterns = list(args.roots)
+    try:
+        for path in args.from_file:
+            patterns += read_root_list(path)
+    except OSError as e:
+        print(f"❌ --from-file: {e}", file=sys.stderr)
+        return 2
+    roots = select_projects(expand_roots(patterns))
+    if not roots:
+        print("❌ No se encontró ningún proyecto (se necesitan manifests/ y guides/)", file=sys.stderr)
+        return 2
+
+    jobs = min(args.jobs or os.cpu_count() or 1, len(roots))
+    stream = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        report = BatchReport(stream, args.format, jobs, len(roots))
+        for record in run_batch(roots, jobs, args.backend, args.paranoid, args.git, args.cache_dir):
+            report.add(record)
+        summary = report.close()
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
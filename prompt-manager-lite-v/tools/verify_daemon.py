@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Daemon local de verificación con API de consultas (integración con editores)
+
+`serve` levanta un servidor HTTP en 127.0.0.1 que mantiene caliente el estado
+del modo watch (RepoIndex, análisis de cada archivo con sus placeholders,
+manifest, cobertura de schemaRefs y de guías) y lo refresca de forma
+incremental según cambian los archivos. Las consultas se responden desde
+memoria, en milisegundos, sin volver a recorrer el árbol.
+
+El puerto (por defecto, uno libre elegido por el sistema), el pid y un token
+aleatorio se publican en .verify_cache/daemon.json (legible solo por el
+usuario); los subcomandos cliente lo leen de ahí. Toda petición debe llevar
+el token en la cabecera X-Verify-Token y un Host 127.0.0.1:<puerto> o
+localhost:<puerto>: una página web no puede detener el daemon con un POST
+entre orígenes ni leer sus respuestas con DNS rebinding.
+
+Endpoints (JSON):
+    GET  /status                       contadores, vigilancia, última actualización
+    GET  /file?path=<ruta|DOC###>      estado de integridad de un archivo
+    GET  /placeholders?doc=<DOC###>    placeholders actuales de un DOC
+    GET  /doc?doc=<DOC###>             estado, playbook, guía y entrada del manifest
+    GET  /coverage                     schemas sin schemaRefs, sin mención en guía, DOCs sin playbook…
+    GET  /findings?code=<prefijo>&severity=<s>
+    POST /refresh                      reescaneo completo
+    POST /shutdown
+
+Uso:
+    python3 tools/verify_daemon.py serve [--port N] [--poll]
+    python3 tools/verify_daemon.py status | file <ruta> | placeholders DOC008 | doc DOC008
+    python3 tools/verify_daemon.py coverage | findings [--code playbook/] | refresh | stop
+"""
+from __future__ import annotations
+import argparse
+import hmac
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.error import URLError
+from urllib.parse import parse_qs, urlencode, urlparse
+from urllib.request import Request, urlopen
+
+import verify_docs_and_schemas as vds
+import verify_integrity as vi
+import watch
+from findings import Finding, text_line
+
+STATE_FILE = vds.CACHE_DIR / "daemon.json"
+HOST = "127.0.0.1"
+TOKEN_HEADER = "X-Verify-Token"
+
+# Informe de cobertura: (código del hallazgo, True si el elemento es su ruta y no el final del mensaje)
+_COVERAGE = {
+    "schemas_without_schema_refs": ("manifest/schema-unreferenced", True),
+    "schemas_not_in_guide": ("guide/schema-unmentioned", False),
+    "docs_not_in_guide": ("guide/doc-unindexed", False),
+    "docs_not_in_manifest": ("manifest/doc-unlisted", True),
+    "missing_playbooks": ("playbook/missing", False),
+}
+
+
+class QueryError(Exception):
+    """Consulta inválida; se responde con el código HTTP indicado."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+class Daemon:
+    """Sesión de watch compartida entre el hilo de refresco y las peticiones HTTP."""
+
+    def __init__(self, backend: str, jobs: Optional[int], poll: bool, interval: float):
+        self.lock = threading.Lock()
+        started = time.perf_counter()
+        self.session = watch.WatchSession(backend, jobs, placeholders=True)
+        self.session.start()
+        self.watcher = watch.make_watcher(vds.BASE, self.session.index, poll, interval)
+        self.startup_ms = (time.perf_counter() - started) * 1000
+        self.refreshed_at = time.time()
+        self.refreshes = 0
+        self.stopping = threading.Event()
+
+    # -- refresco --------------------------------------------------------------
+
+    def refresh_loop(self) -> None:
+        while not self.stopping.is_set():
+            changed = self.watcher.wait(0.5)
+            if changed:
+                self.apply(changed)
+
+    def apply(self, changed) -> watch.Report:
+        started = time.perf_counter()
+        with self.lock:
+            report = self.session.apply(changed)
+            if isinstance(self.watcher, watch.InotifyWatcher):
+                self.watcher.index = self.session.index
+            self.refreshed_at = time.time()
+            self.refreshes += 1
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"🔁 {len(changed) if '*' not in changed else 'reescaneo'} cambio(s) → Δ {len(report)} en {elapsed:.1f} ms")
+        for line in watch.format_report(report):
+            print(line)
+        return report
+
+    # -- consultas (con el lock tomado) ------------------------------------------
+
+    def resolve(self, query: str) -> str:
+        """Ruta relativa a partir de una ruta, un nombre de archivo o un código DOC###."""
+        session = self.session
+        query = query.strip().lstrip("./")
+        if query in session.baseline or session.index.get(query) is not None:
+            return query
+        code = query[:-3] if query.endswith(".md") else query
+        matches = [
+            rel for rel in session.baseline
+            if rel.rsplit("/", 1)[-1] == query or rel.rsplit("/", 1)[-1].startswith(code + "-")
+        ]
+        if not matches:
+            matches = [vds._rel(d) for d in session.docs if d.name == query or d.name.startswith(code + "-")]
+        if not matches:
+            raise QueryError(f"no se encontró: {query}", 404)
+        if len(matches) > 1:
+            raise QueryError(f"ambiguo: {query} → {', '.join(sorted(matches))}")
+        return matches[0]
+
+    def findings(self, keys=None, code: str = "", severity: str = "") -> List[Dict[str, Any]]:
+        out = []
+        for key, state in sorted(self.session.results.items()):
+            if keys is not None and key not in keys:
+                continue
+            for f_code, f_severity, message, path in sorted(state):
+                if f_code.startswith(code) and (not severity or f_severity == severity):
+                    out.append(Finding(f_code, f_severity, message, path or None).to_dict())
+        return out
+
+    def file_status(self, rel: str) -> Dict[str, Any]:
+        session = self.session
+        initial = session.baseline.get(rel)
+        result: Dict[str, Any] = {"path": rel, "tracked": initial is not None}
+        if initial is None:
+            result["exists"] = session.index.get(rel) is not None
+            return result
+        current = session.current.get(rel)
+        status = vi.status_finding(initial, current)
+        result.update(
+            exists=current is not None,
+            status=status.code.split("/", 1)[1],
+            message=status.message,
+            baseline_placeholders=initial["placeholder_count"],
+            placeholders=current["placeholder_count"] if current else None,
+            hash_changed=bool(current) and current["hash"] != initial["hash"],
+        )
+        return result
+
+    def placeholders(self, rel: str) -> Dict[str, Any]:
+        current = self.session.current.get(rel)
+        if current is None:
+            indexed = self.session.index.get(rel)
+            if indexed is None:
+                raise QueryError(f"no existe: {rel}", 404)
+            # Archivo fuera de la línea base: se analiza al vuelo
+            current, _ = vi._analyze(indexed.path)
+        return {
+            "path": rel,
+            "count": current["placeholder_count"],
+            "placeholders": current.get("placeholders", []),
+        }
+
+    def doc(self, rel: str) -> Dict[str, Any]:
+        entry = next(
+            (d for d in self.session.manifest.get("documents", [])
+             if isinstance(d, dict) and str(d.get("path", "")).rsplit("/", 1)[-1] == rel.rsplit("/", 1)[-1]),
+            None,
+        )
+        keys = {("playbook", rel), ("guide_doc", rel), ("integrity", rel)}
+        return {
+            **self.file_status(rel),
+            "manifest_entry": entry,
+            "findings": self.findings(keys),
+        }
+
+    def coverage(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {}
+        for name, (code, by_path) in _COVERAGE.items():
+            report[name] = sorted({
+                f["path"] if by_path else f["message"].rsplit(": ", 1)[-1]
+                for f in self.findings(code=code)
+            })
+        return report
+
+    def status(self) -> Dict[str, Any]:
+        counts = self.session.counts()
+        integrity: Dict[str, int] = {}
+        for rel, initial in self.session.baseline.items():
+            code = vi.classify(initial, self.session.current.get(rel))[0].split("/", 1)[1]
+            integrity[code] = integrity.get(code, 0) + 1
+        return {
+            "base": str(vds.BASE),
+            "pid": os.getpid(),
+            "watcher": self.watcher.name,
+            "startup_ms": round(self.startup_ms, 1),
+            "refreshes": self.refreshes,
+            "refreshed_at": self.refreshed_at,
+            "errors": counts["error"],
+            "warnings": counts["warning"],
+            "files": len(self.session.baseline),
+            "integrity": integrity,
+        }
+
+    def handle(self, method: str, path: str, query: Dict[str, str]) -> Dict[str, Any]:
+        if method == "POST" and path == "/refresh":
+            self.apply({"*"})
+            with self.lock:
+                return self.status()
+        if method == "POST" and path == "/shutdown":
+            # El handler activa `stopping` tras enviar la respuesta
+            return {"stopping": True}
+        if method != "GET":
+            raise QueryError(f"método no soportado: {method} {path}", 405)
+        with self.lock:
+            if path == "/status":
+                return self.status()
+            if path == "/file":
+                return self.file_status(self.resolve(_required(query, "path")))
+            if path == "/placeholders":
+                return self.placeholders(self.resolve(_required(query, "doc")))
+            if path == "/doc":
+                return self.doc(self.resolve(_required(query, "doc")))
+            if path == "/coverage":
+                return self.coverage()
+            if path == "/findings":
+                return {"findings": self.findings(code=query.get("code", ""), severity=query.get("severity", ""))}
+        raise QueryError(f"ruta desconocida: {path}", 404)
+
+
+def _required(query: Dict[str, str], name: str) -> str:
+    if not query.get(name):
+        raise QueryError(f"falta el parámetro '{name}'")
+    return query[name]
+
+
+def check_request(headers, port: int, token: str) -> None:
+    """Rechaza (QueryError 403) las peticiones que no vienen de un cliente local con el token."""
+    hosts = {f"{HOST}:{port}", f"localhost:{port}"}
+    # Host ajeno: DNS rebinding (una página que resuelve su dominio a 127.0.0.1)
+    if headers.get("Host") not in hosts:
+        raise QueryError(f"Host no permitido: {headers.get('Host')}", 403)
+    origin = headers.get("Origin")
+    if origin is not None and origin not in {f"http://{h}" for h in hosts}:
+        raise QueryError(f"Origin no permitido: {origin}", 403)
+    if not hmac.compare_digest(headers.get(TOKEN_HEADER, ""), token):
+        raise QueryError(f"falta o no es válida la cabecera {TOKEN_HEADER}", 403)
+
+
+def _handler(daemon: Daemon, token: str):
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "verify-daemon/1"
+
+        def _dispatch(self, method: str) -> None:
+            started = time.perf_counter()
+            url = urlparse(self.path)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            allowed = False
+            try:
+                check_request(self.headers, self.server.server_address[1], token)
+                allowed = True
+                status, body = 200, daemon.handle(method, url.path, query)
+            except QueryError as e:
+                status, body = e.status, {"error": str(e)}
+            except Exception as e:
+                # Fallo interno: se responde igualmente, en lugar de cortar la conexión
+                print(f"❌ {method} {url.path}: {type(e).__name__}: {e}", file=sys.stderr)
+                status, body = 500, {"error": f"error interno: {type(e).__name__}: {e}"}
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("X-Elapsed-Ms", f"{(time.perf_counter() - started) * 1000:.2f}")
+            self.end_headers()
+            self.wfile.write(data)
+            self.wfile.flush()
+            if allowed and status == 200 and method == "POST" and url.path == "/shutdown":
+                daemon.stopping.set()
+
+        def do_GET(self) -> None:
+            self._dispatch("GET")
+
+        def do_POST(self) -> None:
+            self._dispatch("POST")
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+def serve(port: int = 0, backend: str = vi.DEFAULT_BACKEND, jobs: Optional[int] = None,
+          poll: bool = False, interval: float = watch.DEFAULT_INTERVAL_S) -> int:
+    daemon = Daemon(backend, jobs, poll, interval)
+    token = secrets.token_hex(16)
+    server = ThreadingHTTPServer((HOST, port), _handler(daemon, token))
+    server.daemon_threads = True
+    port = server.server_address[1]
+    _write_state({"host": HOST, "port": port, "pid": os.getpid(), "token": token})
+    threading.Thread(target=daemon.refresh_loop, daemon=True).start()
+    threading.Thread(target=lambda: (daemon.stopping.wait(), server.shutdown()), daemon=True).start()
+    status = daemon.status()
+    print(f"🛰️  Daemon en http://{HOST}:{port} ({daemon.watcher.name}) — {status['files']} archivos,"
+          f" ❌ {status['errors']} ⚠️  {status['warnings']}, arranque {status['startup_ms']} ms")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stopping.set()
+        server.server_close()
+        daemon.watcher.close()
+        try:
+            if json.loads(STATE_FILE.read_text(encoding="utf-8")).get("pid") == os.getpid():
+                STATE_FILE.unlink()
+        except (OSError, ValueError):
+            pass
+        print("👋 Daemon detenido")
+    return 0
+
+
+def _write_state(state: Dict[str, Any]) -> None:
+    """Publica daemon.json con permisos 0600 (contiene el token)."""
+    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_FILE.with_name(f"{STATE_FILE.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, STATE_FILE)
+
+
+# -- cliente -------------------------------------------------------------------
+
+def request(method: str, path: str, params: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, Any], float]:
+    """Llama al daemon; devuelve (código HTTP, cuerpo JSON, ms de servidor)."""
+    try:
+        state = json.loads(STATE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        raise ConnectionError("no hay daemon en marcha (python3 tools/verify_daemon.py serve)")
+    url = f"http://{state['host']}:{state['port']}{path}"
+    if params:
+        url += "?" + urlencode(params)
+    req = Request(url, method=method, data=b"" if method == "POST" else None,
+                  headers={TOKEN_HEADER: state.get("token", "")})
+    try:
+        with urlopen(req, timeout=30) as resp:
+            return resp.status, json.load(resp), float(resp.headers.get("X-Elapsed-Ms", 0))
+    except URLError as e:
+        if hasattr(e, "code"):
+            return e.code, json.load(e), float(e.headers.get("X-Elapsed-Ms", 0))
+        raise ConnectionError(f"el daemon no responde en {url}: {e.reason}")
+
+
+def _print_human(command: str, body: Dict[str, Any]) -> None:
+    if command == "status":
+        print(f"🛰️  {body['base']} (pid {body['pid']}, {body['watcher']}) — {body['files']} archivos,"
+              f" ❌ {body['errors']} ⚠️  {body['warnings']}, {body['refreshes']} refrescos")
+        for code, count in sorted(body["integrity"].items()):
+            print(f"   {code:<12} {count}")
+    elif command in ("file", "doc"):
+        if not body.get("tracked"):
+            print(f"{body['path']}: fuera de la línea base" + ("" if body.get("exists") else " (no existe)"))
+        else:
+            print(f"{body['path']}: {body['message']}")
+        if command == "doc":
+            entry = body.get("manifest_entry")
+            print(f"   manifest: {entry.get('title')} [{entry.get('status', '-')}]" if entry else "   manifest: sin entrada")
+            for f in body["findings"]:
+                if f["code"].split("/", 1)[0] != "integrity":
+                    print("   " + text_line(Finding(f["code"], f["severity"], f["message"])))
+    elif command == "placeholders":
+        print(f"{body['path']}: {body['count']} placeholders")
+        for text in body["placeholders"]:
+            print(f"   - {text}")
+    elif command == "coverage":
+        for name, items in body.items():
+            print(f"{name}: {len(items)}")
+            for item in items:
+                print(f"   - {item}")
+    elif command == "findings":
+        for f in body["findings"]:
+            print(text_line(Finding(f["code"], f["severity"], f["message"])))
+    else:
+        print(json.dumps(body, ensure_ascii=False))
+
+
+_CLIENT = {
+    "status": ("GET", "/status", None),
+    "file": ("GET", "/file", "path"),
+    "placeholders": ("GET", "/placeholders", "doc"),
+    "doc": ("GET", "/doc", "doc"),
+    "coverage": ("GET", "/coverage", None),
+    "findings": ("GET", "/findings", None),
+    "refresh": ("POST", "/refresh", None),
+    "stop": ("POST", "/shutdown", None),
+}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Daemon de verificación de Prompt Manager Lite y su cliente")
+    sub = parser.add_subparsers(dest="command", required=True)
+    srv = sub.add_parser("serve", help="arranca el daemon")
+    srv.add_argument("--port", type=int, default=0, help="puerto en 127.0.0.1 (por defecto, uno libre)")
+    srv.add_argument("--backend", choices=sorted(vi.BACKENDS), default=vi.DEFAULT_BACKEND)
+    srv.add_argument("--jobs", "-j", type=int, default=None, metavar="N")
+    srv.add_argument("--poll", action="store_true", help="sondea el stat en lugar de usar inotify")
+    srv.add_argument("--interval", type=float, default=watch.DEFAULT_INTERVAL_S, metavar="S")
+    for name, (_, _, param) in _CLIENT.items():
+        cmd = sub.add_parser(name)
+        if param:
+            cmd.add_argument("target", help="ruta relativa, nombre de archivo o código DOC###")
+        if name == "findings":
+            cmd.add_argument("--code", default="", help="prefijo de código (p. ej. playbook/)")
+            cmd.add_argument("--severity", choices=["error", "warning", "note"], default="")
+        cmd.add_argument("--json", action="store_true", help="imprime la respuesta JSON tal cual")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.command == "serve":
+        return serve(args.port, args.backend, args.jobs, args.poll, args.interval)
+    method, path, param = _CLIENT[args.command]
+    params = {param: args.target} if param else {}
+    if args.command == "findings":
+        params = {k: v for k, v in (("code", args.code), ("severity", args.severity)) if v}
+    try:
+        status, body, elapsed = request(method, path, params)
+    except ConnectionError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    if status != 200:
+        print(f"❌ {body.get('error', status)}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(body, ensure_ascii=False, indent=2))
+    else:
+        _print_human(args.command, body)
+        print(f"⏱️  {elapsed:.2f} ms en el daemon", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
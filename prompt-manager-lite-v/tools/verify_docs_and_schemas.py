@@ -5,6 +5,7 @@ Verificador de Documentación y Schemas
 Comprueba:
 1) Manifiesto de documentación (manifests/documentation_manifest.json)
    - Campos requeridos por el schema
+   - Validación completa contra documentationManifest.json (draft-07)
    - Existencia de cada archivo DOC
 2) Cobertura de playbooks de documentación
    - Existe playbook canónico por cada DOC
@@ -16,10 +17,48 @@ Comprueba:
 No requiere dependencias externas.
 """
 from __future__ import annotations
+import argparse
 import json
+import posixpath
 import re
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from findings import PASS, FailFast, Finding, Sink, add_report_arguments, close_sink, make_sink, open_sink
+from frontmatter import FrontmatterIndex, as_list
+from guide_index import GuideIndex, GuidePool
+from profiling import Profiler, add_profile_arguments, finish_profile, phase, start_profile
+from repo_index import RepoIndex
+
+if TYPE_CHECKING:
+    # El validador de schemas solo se importa al validar el manifest
+    from schema_validator import SchemaRegistry
+
+
+class Layout:
+    """Rutas de un proyecto con la estructura de Prompt Manager Lite, a partir de su raíz."""
+
+    __slots__ = ("base", "docs_dirs", "pb_docs_dir", "schemas_dirs", "guide_conn", "guide_pb_docs",
+                 "manifest_path", "cache_dir")
+
+    def __init__(self, base: Path):
+        base = Path(base)
+        self.base = base
+        self.docs_dirs = [base / "docs", base / "real_structure_documentation" / "docs"]
+        self.pb_docs_dir = base / "prompt_playbooks" / "documentation_playbooks"
+        self.schemas_dirs = [base / "schemas", base / "real_structure_documentation" / "schemas"]
+        self.guide_conn = base / "guides" / "CONEXION_SCHEMAS_DOCS.md"
+        self.guide_pb_docs = base / "guides" / "USO_PLAYBOOKS_DOCS.md"
+        self.manifest_path = base / "manifests" / "documentation_manifest.json"
+        # Cachés locales (índices de guías, etc.); no se versionan
+        self.cache_dir = base / ".verify_cache"
+
+    def rel(self, p: Path) -> str:
+        try:
+            return p.relative_to(self.base).as_posix()
+        except ValueError:
+            return p.as_posix()
+
 
 # Detect repo root even if script is inside tools/
 SCRIPT_DIR = Path(__file__).resolve().parent
@@ -27,12 +66,15 @@ if (SCRIPT_DIR / 'manifests').exists() and (SCRIPT_DIR / 'guides').exists():
     BASE = SCRIPT_DIR
 else:
     BASE = SCRIPT_DIR.parent
-DOCS_DIRS = [BASE / "docs", BASE / "real_structure_documentation" / "docs"]
-PB_DOCS_DIR = BASE / "prompt_playbooks" / "documentation_playbooks"
-SCHEMAS_DIRS = [BASE / "schemas", BASE / "real_structure_documentation" / "schemas"]
-GUIDE_CONN = BASE / "guides" / "CONEXION_SCHEMAS_DOCS.md"
-GUIDE_PB_DOCS = BASE / "guides" / "USO_PLAYBOOKS_DOCS.md"
-MANIFEST_PATH = BASE / "manifests" / "documentation_manifest.json"
+# Proyecto por defecto (el que contiene tools/); las funciones aceptan otro con layout=
+LAYOUT = Layout(BASE)
+DOCS_DIRS = LAYOUT.docs_dirs
+PB_DOCS_DIR = LAYOUT.pb_docs_dir
+SCHEMAS_DIRS = LAYOUT.schemas_dirs
+GUIDE_CONN = LAYOUT.guide_conn
+GUIDE_PB_DOCS = LAYOUT.guide_pb_docs
+MANIFEST_PATH = LAYOUT.manifest_path
+CACHE_DIR = LAYOUT.cache_dir
 
 ALIASES = {
     "DOC017-ADR-Index": {"playbook-v2-DOC017-ADRIndex.md"},
@@ -41,8 +83,15 @@ ALIASES = {
     "DOC020-CodeOfConduct": {"playbook-v2-DOC020-CodeofConduct.md"},
 }
 
+MANIFEST_SCHEMA_REL = "master_blueprint_parts/documentationManifest.json"
+# Incumplimientos que check_manifest ya informa con su propio mensaje
+_HAND_CHECKED = re.compile(r"^\$\.documents\[\d+\](\.status)?$")
+
 CANONICAL_PB_PATTERN = "playbook-v2-{doc_basename}.md"
 
+# Valores válidos de `status` (manifest y frontmatter de los DOCs)
+DOC_STATUSES = ("draft", "review", "approved")
+
 # Schemas meta que no deben contarse para cobertura por schemaRefs
 EXCLUDED_SCHEMA_COVERAGE: Set[str] = {
     "schemas/master_blueprint_schema.json",
@@ -57,149 +106,329 @@ def load_json(path: Path):
         return json.load(f)
 
 
-def list_docs() -> List[Path]:
+def list_docs(index: Optional[RepoIndex] = None, layout: Optional[Layout] = None) -> List[Path]:
+    layout = layout or LAYOUT
+    if index is not None:
+        return sorted(
+            f.path for f in index.of_kind("doc")
+            if f.path.parent in layout.docs_dirs and f.name.startswith("DOC")
+        )
     files: List[Path] = []
-    for d in DOCS_DIRS:
+    for d in layout.docs_dirs:
         if d.exists():
             files.extend(d.glob("DOC*.md"))
     return sorted(set(files))
 
 
-def list_playbooks() -> Set[str]:
-    if not PB_DOCS_DIR.exists():
+def list_playbooks(index: Optional[RepoIndex] = None, layout: Optional[Layout] = None) -> Set[str]:
+    if index is not None:
+        return {f.name for f in index.of_kind("playbook") if f.name.startswith("playbook-v2-")}
+    pb_docs_dir = (layout or LAYOUT).pb_docs_dir
+    if not pb_docs_dir.exists():
         return set()
-    return {p.name for p in PB_DOCS_DIR.glob("playbook-v2-*.md")}
+    return {p.name for p in pb_docs_dir.glob("playbook-v2-*.md")}
 
 
-def list_schema_files() -> List[Path]:
+def list_schema_files(index: Optional[RepoIndex] = None, layout: Optional[Layout] = None) -> List[Path]:
+    if index is not None:
+        return sorted(f.path for f in index.of_kind("schema"))
     files: List[Path] = []
-    for d in SCHEMAS_DIRS:
+    for d in (layout or LAYOUT).schemas_dirs:
         if d.exists():
             files.extend(d.rglob("*.json"))
     return sorted(set(files))
 
 
-def check_manifest(manifest: dict, docs_on_disk: List[Path]) -> Tuple[List[str], List[str], List[str]]:
-    errors: List[str] = []
-    warnings: List[str] = []
-    ok: List[str] = []
+def _rel(p: Path) -> str:
+    return LAYOUT.rel(p)
+
+
+def _split(findings: Iterable[Finding]) -> Tuple[List[str], List[str], List[str]]:
+    """Reparte los hallazgos en (ok, advertencias, errores), como devolvían los check_*."""
+    buckets: Dict[str, List[str]] = {PASS: [], "warning": [], "error": []}
+    for f in findings:
+        buckets[f.severity].append(f.message)
+    return buckets[PASS], buckets["warning"], buckets["error"]
+
+
+def schema_path_set(schema_files: List[Path], layout: Optional[Layout] = None) -> Set[str]:
+    """Rutas relativas a la raíz de los schemas en disco: comprobar un schemaRef es un `in`."""
+    layout = layout or LAYOUT
+    return {layout.rel(s) for s in schema_files}
 
+
+def _schema_ref_exists(sref: str, schema_paths: Set[str], layout: Layout) -> bool:
+    if posixpath.normpath(sref) in schema_paths:
+        return True
+    # Fuera de las carpetas de schemas (o sin lista de schemas): se consulta el disco
+    return (layout.base / sref).exists()
+
+
+def _canonical_schema_ref(sref: str) -> str:
+    """Forma 'schemas/…' de un schemaRef, con o sin el prefijo real_structure_documentation/."""
+    norm = posixpath.normpath(sref)
+    if norm.startswith("real_structure_documentation/schemas/"):
+        norm = norm[len("real_structure_documentation/"):]
+    return norm
+
+
+def _docs_by_path(docs_on_disk: List[Path], layout: Layout) -> Dict[str, Path]:
     # Index docs by multiple key forms (absolute, relative to BASE, and relative to docs/ and real_structure_documentation/docs)
     docs_by_path: Dict[str, Path] = {}
     for p in docs_on_disk:
         abs_key = str(p.as_posix())
-        rel_base = str(p.relative_to(BASE).as_posix())  # e.g., 'docs/DOC000-...'
+        rel_base = str(p.relative_to(layout.base).as_posix())  # e.g., 'docs/DOC000-...'
         rel_docs = f"docs/{p.name}"
         rel_docs2 = f"real_structure_documentation/docs/{p.name}"
         docs_by_path[abs_key] = p
         docs_by_path[rel_base] = p
         docs_by_path[rel_docs] = p
         docs_by_path[rel_docs2] = p
+    return docs_by_path
+
+
+def iter_manifest(manifest: dict, docs_on_disk: List[Path], layout: Optional[Layout] = None,
+                  schema_paths: Optional[Set[str]] = None) -> Iterator[Finding]:
+    layout = layout or LAYOUT
+    manifest_rel = layout.rel(layout.manifest_path)
+    docs_by_path = _docs_by_path(docs_on_disk, layout)
+    # schemaRefs: un conjunto precalculado (schema_path_set) en lugar de un stat por referencia
+    schema_paths = schema_paths or set()
 
     # Validate structure
     if "documents" not in manifest or not isinstance(manifest["documents"], list):
-        errors.append("Manifest: campo 'documents' ausente o inválido")
-        return ok, warnings, errors
+        yield Finding("manifest/invalid", "error", "Manifest: campo 'documents' ausente o inválido", manifest_rel)
+        return
 
     # Check each entry
-    manifest_paths = set()
     covered_docs: Set[Path] = set()
     for i, d in enumerate(manifest["documents"]):
         missing = [k for k in ("title", "path", "ownerAgent") if k not in d]
         if missing:
-            errors.append(f"Manifest.documents[{i}]: faltan campos requeridos: {', '.join(missing)}")
+            yield Finding("manifest/missing-fields", "error",
+                          f"Manifest.documents[{i}]: faltan campos requeridos: {', '.join(missing)}", manifest_rel)
             continue
-        status = d.get("status")
-        if status and status not in {"draft", "review", "approved"}:
-            warnings.append(f"Manifest.documents[{i}]: status '{status}' no está en ['draft','review','approved']")
         path = d["path"]
-        manifest_paths.add(path)
+        status = d.get("status")
+        if status and status not in DOC_STATUSES:
+            yield Finding("manifest/status", "warning",
+                          f"Manifest.documents[{i}]: status '{status}' no está en ['draft','review','approved']",
+                          manifest_rel, related=[path])
         if path not in docs_by_path:
-            errors.append(f"Manifest: archivo no existe en disco: {path}")
+            yield Finding("manifest/doc-missing", "error", f"Manifest: archivo no existe en disco: {path}", path)
         else:
-            ok.append(f"Manifest OK: {path}")
+            yield Finding("manifest/doc-ok", PASS, f"Manifest OK: {path}", path)
             covered_docs.add(docs_by_path[path])
 
         # Soft-check: schemaRefs existence (optional field)
         schema_refs = d.get("schemaRefs", [])
         for sref in schema_refs:
-            # Normalizamos: permitir relativos al repo
-            sref_path = (BASE / sref).resolve()
-            if not sref_path.exists():
-                warnings.append(f"Manifest: schemaRef no encontrado: {sref}")
+            # Rutas relativas al repo
+            if not _schema_ref_exists(sref, schema_paths, layout):
+                yield Finding("manifest/schema-ref-missing", "warning",
+                              f"Manifest: schemaRef no encontrado: {sref}", sref, related=[path])
 
     # Ensure every DOC on disk appears in manifest
     for p in docs_on_disk:
         if p not in covered_docs:
-            warnings.append(f"Manifest: DOC en disco no listado: {p.as_posix()}")
+            yield Finding("manifest/doc-unlisted", "warning",
+                          f"Manifest: DOC en disco no listado: {p.as_posix()}", layout.rel(p))
 
-    return ok, warnings, errors
 
+def check_manifest(manifest: dict, docs_on_disk: List[Path]) -> Tuple[List[str], List[str], List[str]]:
+    return _split(iter_manifest(manifest, docs_on_disk))
+
+
+def iter_frontmatter(manifest: dict, docs_on_disk: List[Path], frontmatter: FrontmatterIndex,
+                     schema_paths: Optional[Set[str]] = None, index: Optional[RepoIndex] = None,
+                     layout: Optional[Layout] = None) -> Iterator[Finding]:
+    """Contrasta docId, status y schemaRefs del frontmatter de cada DOC con su entrada del manifest.
+
+    Solo se lee la cabecera de cada DOC (ver frontmatter.py) y con `index` se
+    reutiliza el stat del recorrido. Los DOCs sin frontmatter, o sin ninguna
+    de esas claves, no generan hallazgos.
+    """
+    layout = layout or LAYOUT
+    schema_paths = schema_paths or set()
+    entries: Dict[Path, dict] = {}
+    docs_by_path = _docs_by_path(docs_on_disk, layout)
+    for d in manifest.get("documents", []) if isinstance(manifest.get("documents"), list) else ():
+        if isinstance(d, dict) and d.get("path") in docs_by_path:
+            entries.setdefault(docs_by_path[d["path"]], d)
+    for doc in docs_on_disk:
+        rel = layout.rel(doc)
+        try:
+            meta = frontmatter.get(doc, index.stat(rel) if index is not None else None)
+        except (OSError, UnicodeDecodeError) as e:
+            yield Finding("frontmatter/unreadable", "warning", f"Frontmatter ilegible en {rel}: {e}", rel)
+            continue
+        if not meta or not {"docId", "status", "schemaRefs"} & meta.keys():
+            continue
+        entry = entries.get(doc)
+        if entry is None:
+            continue  # check_manifest ya informa del DOC no listado
+        problems = 0
+        doc_id, entry_id = meta.get("docId"), entry.get("id")
+        if doc_id and entry_id and doc_id != entry_id:
+            problems += 1
+            yield Finding("frontmatter/doc-id-mismatch", "warning",
+                          f"Frontmatter: docId '{doc_id}' distinto del id del manifest '{entry_id}' en {rel}", rel)
+        status, entry_status = meta.get("status"), entry.get("status")
+        if status and status not in DOC_STATUSES:
+            problems += 1
+            yield Finding("frontmatter/status", "warning",
+                          f"Frontmatter: status '{status}' no está en {list(DOC_STATUSES)} en {rel}", rel)
+        elif status and entry_status and status != entry_status:
+            problems += 1
+            yield Finding("frontmatter/status-mismatch", "warning",
+                          f"Frontmatter: status '{status}' en {rel} pero '{entry_status}' en el manifest", rel)
+        if "schemaRefs" in meta:
+            refs = as_list(meta["schemaRefs"])
+            for sref in refs:
+                if not _schema_ref_exists(sref, schema_paths, layout):
+                    problems += 1
+                    yield Finding("frontmatter/schema-ref-missing", "warning",
+                                  f"Frontmatter: schemaRef no encontrado en {rel}: {sref}", rel, [sref])
+            declared = {_canonical_schema_ref(r) for r in refs}
+            listed = {_canonical_schema_ref(r) for r in entry.get("schemaRefs", [])}
+            if declared != listed:
+                problems += 1
+                detail = []
+                if declared - listed:
+                    detail.append(f"solo en frontmatter: {', '.join(sorted(declared - listed))}")
+                if listed - declared:
+                    detail.append(f"solo en manifest: {', '.join(sorted(listed - declared))}")
+                yield Finding("frontmatter/schema-refs-mismatch", "warning",
+                              f"Frontmatter y manifest.schemaRefs difieren en {rel} ({'; '.join(detail)})",
+                              rel, sorted(declared ^ listed))
+        if not problems:
+            yield Finding("frontmatter/ok", PASS, f"Frontmatter coherente con el manifest: {rel}", rel)
+
+
+def iter_manifest_schema(manifest: dict, registry: Optional[SchemaRegistry] = None,
+                         layout: Optional[Layout] = None) -> Iterator[Finding]:
+    from schema_validator import SchemaError, SchemaRegistry
+
+    layout = layout or LAYOUT
+    schema_path = next(
+        (d / MANIFEST_SCHEMA_REL for d in layout.schemas_dirs if (d / MANIFEST_SCHEMA_REL).exists()), None
+    )
+    if schema_path is None:
+        yield Finding("manifest/schema-not-found", "warning",
+                      f"Schema del manifest no encontrado: {MANIFEST_SCHEMA_REL}")
+        return
+    schema_rel = layout.rel(schema_path)
+    registry = registry or SchemaRegistry(layout.cache_dir)
+    try:
+        schema = registry.get(schema_path)
+    except SchemaError as e:
+        yield Finding("schema/invalid", "error", f"Schema del manifest inválido: {e}", schema_rel)
+        return
+    conforms = True
+    for v in schema.validate(manifest):
+        if v.keyword in ("required", "enum") and _HAND_CHECKED.match(v.path):
+            continue
+        conforms = False
+        yield Finding("manifest/schema-violation", "error", f"Manifest no conforme al schema: {v}",
+                      layout.rel(layout.manifest_path), related=[schema_rel])
+    if conforms:
+        yield Finding("manifest/schema-ok", PASS, f"Manifest conforme a {MANIFEST_SCHEMA_REL}",
+                      layout.rel(layout.manifest_path), related=[schema_rel])
 
-def check_playbooks(docs_on_disk: List[Path], pb_names: Set[str]) -> Tuple[List[str], List[str], List[str]]:
-    ok: List[str] = []
-    warnings: List[str] = []
-    errors: List[str] = []
 
+def check_manifest_schema(manifest: dict, registry: Optional[SchemaRegistry] = None) -> Tuple[List[str], List[str], List[str]]:
+    return _split(iter_manifest_schema(manifest, registry))
+
+
+def iter_playbooks(docs_on_disk: List[Path], pb_names: Set[str], layout: Optional[Layout] = None) -> Iterator[Finding]:
+    layout = layout or LAYOUT
+    pb_dir = layout.rel(layout.pb_docs_dir)
     for doc in docs_on_disk:
         basename = doc.name  # e.g., DOC017-ADR-Index.md
         doc_basename = basename[:-3]  # sin .md
         canonical = CANONICAL_PB_PATTERN.format(doc_basename=doc_basename)
+        doc_rel = [layout.rel(doc)]
 
         if canonical in pb_names:
-            ok.append(f"Playbook OK: {canonical}")
+            yield Finding("playbook/ok", PASS, f"Playbook OK: {canonical}", f"{pb_dir}/{canonical}", doc_rel)
             continue
 
         # check aliases
         alias_set = ALIASES.get(doc_basename, set())
         if any(a in pb_names for a in alias_set):
-            warnings.append(f"Playbook alias presente para {doc_basename}: {sorted(alias_set)} (falta canónico {canonical})")
+            yield Finding("playbook/alias", "warning",
+                          f"Playbook alias presente para {doc_basename}: {sorted(alias_set)} (falta canónico {canonical})",
+                          f"{pb_dir}/{canonical}", doc_rel)
         else:
-            errors.append(f"Playbook faltante: {canonical}")
+            yield Finding("playbook/missing", "error", f"Playbook faltante: {canonical}",
+                          f"{pb_dir}/{canonical}", doc_rel)
 
-    return ok, warnings, errors
 
+def check_playbooks(docs_on_disk: List[Path], pb_names: Set[str]) -> Tuple[List[str], List[str], List[str]]:
+    return _split(iter_playbooks(docs_on_disk, pb_names))
 
-def check_schemas_covered_in_guide(schema_files: List[Path], guide_path: Path) -> Tuple[List[str], List[str]]:
+
+def _schema_rels(s: Path, layout: Optional[Layout] = None) -> Set[str]:
+    # nombres relativos a cada base de schemas/
+    rels: Set[str] = set()
+    for base_dir in (layout or LAYOUT).schemas_dirs:
+        try:
+            rels.add(s.relative_to(base_dir).as_posix())
+        except ValueError:
+            pass
+    return rels
+
+
+def iter_schemas_covered_in_guide(schema_files: List[Path], guide_path: Path,
+                                  guide: Optional[GuideIndex] = None,
+                                  layout: Optional[Layout] = None) -> Iterator[Finding]:
+    layout = layout or LAYOUT
+    guide_rel = layout.rel(guide_path)
     if not guide_path.exists():
-        return [], [f"Guía no encontrada: {guide_path}"]
-    guide_text = guide_path.read_text(encoding="utf-8")
-    ok: List[str] = []
-    warnings: List[str] = []
+        yield Finding("guide/not-found", "warning", f"Guía no encontrada: {guide_path}", guide_rel)
+        return
+    # Un solo escaneo de la guía para todos los nombres y rutas (cacheado por hash)
+    rels_by_schema = {s: _schema_rels(s, layout) for s in schema_files}
+    needles: Set[str] = set()
+    for s, rels in rels_by_schema.items():
+        needles.add(s.name)
+        for rel in rels:
+            needles.add(f"schemas/{rel}")
+            needles.add(f"real_structure_documentation/schemas/{rel}")
+    # Un GuideIndex ya cargado (p. ej. el del modo watch) evita releer la guía
+    guide = guide or GuideIndex(guide_path, layout.cache_dir)
+    guide.prepare(substrings=needles)
     for s in schema_files:
-        # nombres relativos a cada base de schemas/
-        rels: Set[str] = set()
-        for base_dir in SCHEMAS_DIRS:
-            try:
-                rels.add(s.relative_to(base_dir).as_posix())
-            except ValueError:
-                pass
+        rels = rels_by_schema[s]
         name = s.name
         mentioned = False
         for rel in rels:
             if (
-                name in guide_text
-                or f"schemas/{rel}" in guide_text
-                or f"real_structure_documentation/schemas/{rel}" in guide_text
+                guide.contains(name)
+                or guide.contains(f"schemas/{rel}")
+                or guide.contains(f"real_structure_documentation/schemas/{rel}")
             ):
                 mentioned = True
-                ok.append(f"Schema mencionado en guía: {rel}")
+                yield Finding("guide/schema-ok", PASS, f"Schema mencionado en guía: {rel}", guide_rel, [layout.rel(s)])
                 break
         if not mentioned:
             # report one sample rel for clarity
             sample = next(iter(rels)) if rels else s.name
-            warnings.append(f"Schema NO mencionado en guía: {sample}")
-    return ok, warnings
+            yield Finding("guide/schema-unmentioned", "warning", f"Schema NO mencionado en guía: {sample}",
+                          guide_rel, [layout.rel(s)])
 
 
-def check_schema_refs_coverage(schema_files: List[Path], manifest: dict) -> Tuple[List[str], List[str]]:
-    ok: List[str] = []
-    warnings: List[str] = []
+def check_schemas_covered_in_guide(schema_files: List[Path], guide_path: Path) -> Tuple[List[str], List[str]]:
+    return _split(iter_schemas_covered_in_guide(schema_files, guide_path))[:2]
+
+
+def iter_schema_refs_coverage(schema_files: List[Path], manifest: dict,
+                              layout: Optional[Layout] = None) -> Iterator[Finding]:
     # Build a canonical set of rel paths like 'schemas/...' for all schemas on disk.
     # We'll accept either prefix in inputs but normalize to this canonical form for coverage.
     all_rel: Set[str] = set()
     for s in schema_files:
-        for base_dir in SCHEMAS_DIRS:
+        for base_dir in (layout or LAYOUT).schemas_dirs:
             try:
                 rel = s.relative_to(base_dir).as_posix()
                 all_rel.add(f"schemas/{rel}")
@@ -220,90 +449,178 @@ def check_schema_refs_coverage(schema_files: List[Path], manifest: dict) -> Tupl
     # Evaluate coverage
     for schema, docs in sorted(refs.items()):
         if docs:
-            ok.append(f"Schema referenciado en manifest: {schema} ← {', '.join(docs)}")
+            yield Finding("manifest/schema-referenced", PASS,
+                          f"Schema referenciado en manifest: {schema} ← {', '.join(docs)}", schema, docs)
         else:
-            warnings.append(f"Schema SIN referencia en manifest.schemaRefs: {schema}")
-    return ok, warnings
+            yield Finding("manifest/schema-unreferenced", "warning",
+                          f"Schema SIN referencia en manifest.schemaRefs: {schema}", schema)
 
 
-def check_docs_indexed_in_guide(docs_on_disk: List[Path], guide_path: Path) -> Tuple[List[str], List[str]]:
+def check_schema_refs_coverage(schema_files: List[Path], manifest: dict) -> Tuple[List[str], List[str]]:
+    return _split(iter_schema_refs_coverage(schema_files, manifest))[:2]
+
+
+def iter_docs_indexed_in_guide(docs_on_disk: List[Path], guide_path: Path,
+                               guide: Optional[GuideIndex] = None,
+                               layout: Optional[Layout] = None) -> Iterator[Finding]:
+    layout = layout or LAYOUT
+    guide_rel = layout.rel(guide_path)
     if not guide_path.exists():
-        return [], [f"Guía no encontrada: {guide_path}"]
-    text = guide_path.read_text(encoding="utf-8")
-    ok: List[str] = []
-    warnings: List[str] = []
-    for doc in docs_on_disk:
-        doc_basename = doc.name[:-3]
-        # Presencia del código DOC### en el índice
-        code_match = re.search(rf"\b{re.escape(doc_basename.split('-')[0])}\b", text)
-        if code_match and doc_basename in text:
-            ok.append(f"DOC indexado en guía: {doc_basename}")
+        yield Finding("guide/not-found", "warning", f"Guía no encontrada: {guide_path}", guide_rel)
+        return
+    # Un solo escaneo de la guía para todos los DOCs (cacheado por hash)
+    basenames = [doc.name[:-3] for doc in docs_on_disk]
+    # Un GuideIndex ya cargado (p. ej. el del modo watch) evita releer la guía
+    guide = guide or GuideIndex(guide_path, layout.cache_dir)
+    guide.prepare(substrings=basenames, words=[b.split("-")[0] for b in basenames])
+    for doc, doc_basename in zip(docs_on_disk, basenames):
+        # Presencia del código DOC### (como palabra completa) en el índice
+        code_match = guide.has_word(doc_basename.split("-")[0])
+        if code_match and guide.contains(doc_basename):
+            yield Finding("guide/doc-ok", PASS, f"DOC indexado en guía: {doc_basename}", guide_rel, [layout.rel(doc)])
         else:
-            warnings.append(f"DOC NO indexado claramente en guía: {doc_basename}")
-    return ok, warnings
+            yield Finding("guide/doc-unindexed", "warning", f"DOC NO indexado claramente en guía: {doc_basename}",
+                          guide_rel, [layout.rel(doc)])
+
+
+def check_docs_indexed_in_guide(docs_on_disk: List[Path], guide_path: Path) -> Tuple[List[str], List[str]]:
+    return _split(iter_docs_indexed_in_guide(docs_on_disk, guide_path))[:2]
 
 
-def main() -> int:
-    print("=" * 60)
-    print("🔎 Verificador de Documentación y Schemas")
-    print("=" * 60)
+def pooled_guide(guides: Optional[GuidePool], path: Path, layout: Layout) -> Optional[GuideIndex]:
+    """Guía del GuidePool (las idénticas de otros proyectos no se re-escanean), o None sin pool."""
+    return guides.get(path, layout.cache_dir) if guides is not None and path.exists() else None
 
-    errors_total: List[str] = []
-    warnings_total: List[str] = []
 
+def _run_checks(index: RepoIndex, profiler: Optional[Profiler], sink: Sink, layout: Optional[Layout] = None,
+                registry: Optional[SchemaRegistry] = None, guides: Optional[GuidePool] = None) -> None:
+    layout = layout or LAYOUT
+
+    def guide(path: Path) -> Optional[GuideIndex]:
+        return pooled_guide(guides, path, layout)
+
+    manifest_path = layout.manifest_path
     # 1) Manifest
-    if MANIFEST_PATH.exists():
-        manifest = load_json(MANIFEST_PATH)
+    if manifest_path.exists():
+        with phase(profiler, "carga del manifest"):
+            manifest = load_json(manifest_path)
+        if profiler:
+            profiler.add_bytes("carga del manifest", manifest_path.stat().st_size)
     else:
         manifest = {"documents": []}
-        warnings_total.append(f"Manifest no encontrado: {MANIFEST_PATH}")
-
-    docs_on_disk = list_docs()
-    pb_names = list_playbooks()
-    schemas = list_schema_files()
-
-    ok, warn, err = check_manifest(manifest, docs_on_disk)
-    warnings_total.extend(warn)
-    errors_total.extend(err)
-    print(f"📁 DOCs en disco: {len(docs_on_disk)} | Playbooks: {len(pb_names)} | Schemas: {len(schemas)}")
+        sink.emit(Finding("manifest/not-found", "warning", f"Manifest no encontrado: {manifest_path}",
+                          layout.rel(manifest_path)))
+
+    docs_on_disk = list_docs(index, layout)
+    pb_names = list_playbooks(index, layout)
+    schemas = list_schema_files(index, layout)
+    sink.info(f"📁 DOCs en disco: {len(docs_on_disk)} | Playbooks: {len(pb_names)} | Schemas: {len(schemas)}")
+
+    schema_paths = schema_path_set(schemas, layout)
+    with phase(profiler, "check_manifest"):
+        sink.emit_all(iter_manifest(manifest, docs_on_disk, layout, schema_paths))
+    with phase(profiler, "check_frontmatter"):
+        frontmatter = FrontmatterIndex(layout.base, layout.cache_dir)
+        sink.emit_all(iter_frontmatter(manifest, docs_on_disk, frontmatter, schema_paths, index, layout))
+        frontmatter.save()
+    with phase(profiler, "check_manifest_schema"):
+        sink.emit_all(iter_manifest_schema(manifest, registry, layout))
 
     # 2) Playbooks
-    ok2, warn2, err2 = check_playbooks(docs_on_disk, pb_names)
-    warnings_total.extend(warn2)
-    errors_total.extend(err2)
+    with phase(profiler, "check_playbooks"):
+        sink.emit_all(iter_playbooks(docs_on_disk, pb_names, layout))
 
     # 3) Schemas en guía de conexión
-    ok3, warn3 = check_schemas_covered_in_guide(schemas, GUIDE_CONN)
-    warnings_total.extend(warn3)
+    with phase(profiler, "check_schemas_covered_in_guide"):
+        sink.emit_all(iter_schemas_covered_in_guide(schemas, layout.guide_conn, guide(layout.guide_conn), layout))
+    if profiler and layout.guide_conn.exists():
+        profiler.add_bytes("check_schemas_covered_in_guide", layout.guide_conn.stat().st_size)
 
     # 4) Cobertura de schemaRefs en manifest (opcional, pero recomendado)
-    ok3b, warn3b = check_schema_refs_coverage(schemas, manifest)
-    warnings_total.extend(warn3b)
+    with phase(profiler, "check_schema_refs_coverage"):
+        sink.emit_all(iter_schema_refs_coverage(schemas, manifest, layout))
 
     # 5) DOCs en índice de guía playbooks-docs
-    ok4, warn4 = check_docs_indexed_in_guide(docs_on_disk, GUIDE_PB_DOCS)
-    warnings_total.extend(warn4)
+    with phase(profiler, "check_docs_indexed_in_guide"):
+        sink.emit_all(iter_docs_indexed_in_guide(docs_on_disk, layout.guide_pb_docs, guide(layout.guide_pb_docs), layout))
+    if profiler and layout.guide_pb_docs.exists():
+        profiler.add_bytes("check_docs_indexed_in_guide", layout.guide_pb_docs.stat().st_size)
+
+
+def main(index: Optional[RepoIndex] = None, profiler: Optional[Profiler] = None,
+         sink: Optional[Sink] = None, changes: Optional[Dict[str, str]] = None,
+         old_manifest: Optional[dict] = None, layout: Optional[Layout] = None,
+         registry: Optional[SchemaRegistry] = None, guides: Optional[GuidePool] = None) -> int:
+    """Ejecuta todas las comprobaciones; con `index` reutiliza un recorrido ya hecho.
+
+    Los hallazgos se envían al `sink` (texto por salida estándar por defecto)
+    según se producen; el llamador es quien lo cierra. Con `changes`
+    ({ruta: added|modified|deleted}, ver impact.py) solo se ejecutan las
+    comprobaciones afectadas por esos cambios. `layout` verifica otro
+    proyecto en lugar del que contiene tools/ (ver pml_api.py); `registry`
+    y `guides` comparten schemas compilados y guías entre proyectos (ver
+    verify_batch.py).
+    """
+    sink = sink or make_sink("text", "verify_docs_and_schemas")
+    layout = layout or (Layout(index.base) if index is not None and index.base != BASE else LAYOUT)
+    if index is None:
+        with phase(profiler, "recorrido del árbol"):
+            index = RepoIndex.build(layout.base)
+
+    sink.info("=" * 60)
+    sink.info("🔎 Verificador de Documentación y Schemas")
+    sink.info("=" * 60)
+
+    errors_before = sink.counts["error"]
+    warnings_before = sink.counts["warning"]
+    try:
+        if changes is None:
+            _run_checks(index, profiler, sink, layout, registry, guides)
+        else:
+            import impact  # importa este módulo: se carga solo en modo --changed-since
+            impact.run_checks(index, changes, sink, profiler, old_manifest, layout, registry, guides)
+    except FailFast:
+        sink.info("⛔ Detenido en el primer error (--fail-fast)")
 
     # Resumen
-    print("\n" + "-" * 60)
-    print("RESULTADO")
-    print(f"❌ Errores: {len(errors_total)}")
-    for e in errors_total[:50]:
-        print(f"  - {e}")
-    if len(errors_total) > 50:
-        print("  … (más errores omitidos) …")
-
-    print(f"⚠️  Advertencias: {len(warnings_total)}")
-    for w in warnings_total[:50]:
-        print(f"  - {w}")
-    if len(warnings_total) > 50:
-        print("  … (más advertencias omitidas) …")
-
-    exit_code = 1 if errors_total else 0
-    print("-" * 60)
-    print("✔️  OK" if exit_code == 0 else "❗ Revisión necesaria")
+    errors = sink.counts["error"] - errors_before
+    warnings = sink.counts["warning"] - warnings_before
+    sink.info("\n" + "-" * 60)
+    sink.info("RESULTADO")
+    sink.info(f"❌ Errores: {errors}")
+    sink.info(f"⚠️  Advertencias: {warnings}")
+    exit_code = 1 if errors else 0
+    sink.info("-" * 60)
+    sink.info("✔️  OK" if exit_code == 0 else "❗ Revisión necesaria")
     return exit_code
 
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Verificador de documentación y schemas")
+    parser.add_argument("--changed-since", metavar="REF", default=None,
+                        help="solo las comprobaciones afectadas por los cambios desde REF de git "
+                             "(o ':baseline' para compararse con la línea base de integridad)")
+    add_profile_arguments(parser)
+    add_report_arguments(parser)
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    raise SystemExit(main())
+    args = parse_args()
+    profiler = start_profile(args, "verify_docs_and_schemas")
+    sink = open_sink(args, "verify_docs_and_schemas")
+    index = changes = old_manifest = None
+    if args.changed_since:
+        import impact
+        index = RepoIndex.build(BASE)
+        try:
+            changes, old_manifest = impact.collect_changes(args.changed_since, index)
+        except impact.ChangeSourceError as e:
+            impact.report_source_error(sink, e)
+            close_sink(sink)
+            finish_profile(profiler, args)
+            raise SystemExit(2)
+    exit_code = main(index=index, profiler=profiler, sink=sink, changes=changes, old_manifest=old_manifest)
+    close_sink(sink)
+    finish_profile(profiler, args)
+    raise SystemExit(exit_code)
@@ -6,11 +6,22 @@ Este script analiza qué documentos han sido modificados vs cuáles siguen siend
 Usa múltiples métodos para detectar modificaciones de forma precisa.
 """
 
+import argparse
 import hashlib
-import json
-import re
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from functools import partial
+
+from findings import FailFast, Finding, add_report_arguments, close_sink, make_sink, open_sink
+from git_index import GitIndex, blob_id
+from integrity_store import BACKENDS, import_json, open_store, relative_key
+from placeholders import SCANNER_VERSION, grammar_for, scan_file, scan_text
+from profiling import add_profile_arguments, clock_us, finish_profile, phase, start_profile
+from repo_index import RepoIndex
+from sections import compare, file_root, known_counts, repo_root, section_hash, split_sections
+from template_catalog import TEMPLATE, describe, load_catalog
 
 # Configuración
 # Detecta la raíz del repo aunque el script esté dentro de tools/
@@ -19,26 +30,99 @@ if (SCRIPT_DIR / 'manifests').exists() and (SCRIPT_DIR / 'guides').exists():
     BASE_PATH = SCRIPT_DIR
 else:
     BASE_PATH = SCRIPT_DIR.parent
-# Compatibilidad transicional: aceptar estructura antigua y nueva
-DOCS_PATHS = [BASE_PATH / 'docs', BASE_PATH / 'real_structure_documentation' / 'docs']
-FEATURES_PATHS = [BASE_PATH / 'features', BASE_PATH / 'streaming_files' / 'features']
-BUGS_PATHS = [BASE_PATH / 'bugs', BASE_PATH / 'streaming_files' / 'bugs']
-OPERATIONS_PATHS = [BASE_PATH / 'operations', BASE_PATH / 'streaming_files' / 'operations']
-PROPOSALS_PATHS = [BASE_PATH / 'proposals', BASE_PATH / 'streaming_files' / 'proposals']
-SCHEMAS_PATHS = [
-    BASE_PATH / 'schemas' / 'master_blueprint_parts',
-    BASE_PATH / 'real_structure_documentation' / 'schemas' / 'master_blueprint_parts',
+# Archivos bajo seguimiento (estructura antigua y nueva, resuelta por RepoIndex):
+# (tipo, sufijo, subcarpeta requerida)
+TRACKED_KINDS = [
+    ('doc', '.md', None),
+    ('feature', '.md', None),
+    ('bug', '.md', None),
+    ('operation', '.md', None),
+    ('proposal', '.md', None),
+    ('schema', '.json', 'master_blueprint_parts'),
 ]
 HASH_FILE = BASE_PATH / 'file_integrity.json'
+STORE_FILE = BASE_PATH / 'file_integrity.sqlite'
+DEFAULT_BACKEND = 'sqlite'
 
-# Patrones de placeholders comunes
-PLACEHOLDER_PATTERNS = [
-    r'\[.*?\]',  # [Nombre del Proyecto], [placeholder], etc.
-    r'\{\{.*?\}\}',  # {{variable}}
-    r'\[ID\]',  # [ID]
-    r'\[.*?del.*?\]',  # [Nombre del Proyecto]
-    r'`\[.*?\]`',  # `[placeholder]`
-]
+# Placeholders ([Nombre del Proyecto], {{variable}}, `[x]`…): ver placeholders.py
+
+# Por debajo de este número de archivos no compensa arrancar el pool de procesos
+MIN_PARALLEL_FILES = 32
+# Secciones pendientes que se listan por archivo en el informe
+SECTIONS_SHOWN = 8
+
+def read_file_snapshot(file_path):
+    """Lee un archivo una sola vez y devuelve (bytes, os.stat_result) del mismo descriptor."""
+    with open(file_path, 'rb') as file:
+        st = os.fstat(file.fileno())
+        data = file.read()
+    return data, st
+
+def decode_text(data):
+    """Decodifica UTF-8 con la misma traducción de saltos de línea que open(..., 'r')."""
+    content = data.decode('utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+def scan_placeholders(content, grammar=None):
+    """Cuenta placeholders sobre un texto ya decodificado (gramática markdown por defecto)."""
+    return scan_text(content, grammar)
+
+def scan_sections(content, known=None, grammar=None):
+    """Hash y placeholders por sección; devuelve (secciones, total, placeholders, re-escaneadas).
+
+    Con known ({hash de sección: placeholders} de la línea base) las secciones
+    cuyo hash no cambió reutilizan su recuento sin pasar por las expresiones
+    regulares; en ese caso la lista de placeholders es None si alguna sección
+    se reutilizó (solo se conoce el total).
+    """
+    sections = []
+    total = 0
+    found = set()
+    rescanned = 0
+    incomplete = False
+    for heading, text in split_sections(content):
+        h = section_hash(text)
+        if known and h in known:
+            count = known[h]
+            incomplete = True
+        else:
+            count, patterns = scan_placeholders(text, grammar)
+            found.update(patterns)
+            rescanned += 1
+        sections.append([heading, h, count])
+        total += count
+    return sections, total, None if incomplete else sorted(found), rescanned
+
+def text_stats(content, st):
+    """Estadísticas de un archivo a partir de su texto y su stat."""
+    return {
+        'size': st.st_size,
+        'modified': st.st_mtime,
+        'mtime_ns': st.st_mtime_ns,
+        'inode': st.st_ino,
+        'lines': len(content.splitlines()),
+        'chars': len(content),
+        'words': len(content.split())
+    }
+
+def stat_matches(stats, st, racy_ns):
+    """True si (size, mtime_ns, inode) coinciden con lo registrado en la línea base.
+
+    Igual que el índice de git, una entrada cuyo mtime no es anterior al de la
+    propia línea base se considera "racy" (pudo cambiar en el mismo tick del
+    reloj) y no se reutiliza.
+    """
+    if not stats or 'mtime_ns' not in stats or 'inode' not in stats:
+        return False
+    if stats['mtime_ns'] >= racy_ns:
+        return False
+    return (
+        stats['size'] == st.st_size
+        and stats['mtime_ns'] == st.st_mtime_ns
+        and stats['inode'] == st.st_ino
+    )
 
 def generate_file_hash(file_path):
     """Genera hash SHA-256 de un archivo."""
@@ -53,21 +137,9 @@ def generate_file_hash(file_path):
         return None
 
 def count_placeholders(file_path):
-    """Cuenta placeholders en un archivo de texto."""
+    """Cuenta placeholders en un archivo de texto, leyéndolo por bloques."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        total_placeholders = 0
-        found_patterns = []
-        
-        for pattern in PLACEHOLDER_PATTERNS:
-            matches = re.findall(pattern, content)
-            if matches:
-                total_placeholders += len(matches)
-                found_patterns.extend(matches)
-        
-        return total_placeholders, list(set(found_patterns))
+        return scan_file(file_path)
     except Exception as e:
         print(f"❌ Error analizando placeholders en {file_path}: {e}")
         return 0, []
@@ -75,166 +147,556 @@ def count_placeholders(file_path):
 def get_file_stats(file_path):
     """Obtiene estadísticas completas de un archivo."""
     try:
-        stat = file_path.stat()
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        return {
-            'size': stat.st_size,
-            'modified': stat.st_mtime,
-            'lines': len(content.splitlines()),
-            'chars': len(content),
-            'words': len(content.split())
-        }
+        data, st = read_file_snapshot(file_path)
+        return text_stats(decode_text(data), st)
     except Exception as e:
         print(f"❌ Error obteniendo estadísticas de {file_path}: {e}")
         return None
 
-def analyze_file(file_path):
-    """Análisis completo de un archivo."""
-    hash_val = generate_file_hash(file_path)
-    placeholder_count, placeholders = count_placeholders(file_path)
-    stats = get_file_stats(file_path)
+def now():
+    """Marca de tiempo de la ejecución; respeta SOURCE_DATE_EPOCH para salidas reproducibles."""
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        return datetime.fromtimestamp(int(epoch))
+    return datetime.now()
+
+def catalog_entry(hash_val, base=None):
+    """Huella de la plantilla de origen del proyecto con ese SHA-256, o None."""
+    found = load_catalog(base if base is not None else BASE_PATH).lookup(hash_val)
+    return found[1] if found else None
+
+def _analyze(file_path, timing=None, blob_algo=None, known=None, catalog=BASE_PATH):
+    """Analiza un archivo sin imprimir; devuelve (análisis, mensajes de error).
+
+    Si se pasa un dict `timing` (solo con --profile) se rellenan los tiempos de
+    lectura, hash y escaneo y los bytes leídos. Con blob_algo ('sha1' o
+    'sha256', modo --git) se añade también el blob id git del contenido. Con
+    known (ver scan_sections) solo se escanean las secciones que cambiaron.
+    Si el contenido es el de una plantilla de origen del proyecto `catalog`
+    (template_catalog.py), el análisis sale de su catálogo sin decodificar ni
+    escanear; catalog=None lo evita.
+    """
+    errors = []
+    hash_val = None
+    placeholder_count, placeholders = 0, []
+    sections = None
+    rescanned = 0
+    stats = None
+    if timing is not None:
+        timing['start'] = t = clock_us()
+    try:
+        data, st = read_file_snapshot(file_path)
+    except Exception as e:
+        errors.append(f"Error leyendo {file_path}: {e}")
+    else:
+        if timing is not None:
+            timing['bytes'] = len(data)
+            timing['read_s'] = (clock_us() - t) / 1e6
+            t = clock_us()
+        hash_val = hashlib.sha256(data).hexdigest()
+        if blob_algo:
+            blob = blob_id(data, blob_algo)
+        if timing is not None:
+            timing['hash_s'] = (clock_us() - t) / 1e6
+            t = clock_us()
+        template = catalog_entry(hash_val, catalog) if catalog is not None else None
+        if template is not None:
+            sections = [list(section) for section in template['sections']]
+            placeholder_count = template['placeholder_count']
+            placeholders = list(template['placeholders'])
+            stats = dict(text_stats('', st), **template['text'])
+        else:
+            try:
+                content = decode_text(data)
+            except UnicodeDecodeError as e:
+                errors.append(f"Error analizando placeholders en {file_path}: {e}")
+            else:
+                sections, placeholder_count, placeholders, rescanned = scan_sections(
+                    content, known, grammar_for(file_path))
+                stats = text_stats(content, st)
+        if timing is not None:
+            timing['scan_s'] = (clock_us() - t) / 1e6
+    if timing is not None:
+        timing['end'] = clock_us()
+        timing['pid'] = os.getpid()
     
-    return {
+    analysis = {
         'path': str(file_path),
         'hash': hash_val,
         'placeholder_count': placeholder_count,
         'placeholders': placeholders,
         'stats': stats,
-        'analyzed_at': datetime.now().isoformat()
+        'analyzed_at': now().isoformat()
     }
+    if sections is not None:
+        analysis['sections'] = sections
+        analysis['merkle'] = file_root(sections)
+        if known is not None:
+            analysis['rescanned'] = rescanned
+    if blob_algo and hash_val:
+        analysis['blob'] = blob
+    return analysis, errors
+
+def _analyze_timed(file_path, blob_algo=None, known=None, catalog=BASE_PATH):
+    timing = {}
+    analysis, errors = _analyze(file_path, timing, blob_algo, known, catalog)
+    return analysis, errors, timing
+
+def _call(worker, file_path, known):
+    return worker(file_path, known=known)
+
+def analyze_file(file_path):
+    """Análisis completo de un archivo.
+
+    Lee el archivo una única vez: hash, estadísticas y placeholders salen del
+    mismo buffer y del mismo fstat.
+    """
+    analysis, errors = _analyze(file_path)
+    for message in errors:
+        print(f"❌ {message}")
+    return analysis
+
+def iter_analyze_files(file_paths, jobs=None, profiler=None, blob_algo=None, known=None, catalog=BASE_PATH):
+    """Genera (ruta, análisis, errores) por archivo, en paralelo si jobs > 1.
+
+    El trabajo se reparte en bloques sobre un pool de procesos y los resultados
+    llegan en el mismo orden que file_paths a medida que terminan, de modo que
+    la salida es idéntica a la de una ejecución serie. known, si se pasa, es
+    una lista paralela a file_paths con los recuentos por sección de la línea
+    base de cada archivo. catalog es la raíz cuyo catálogo de plantillas se
+    usa (None: se escanea todo).
+    """
+    file_paths = list(file_paths)
+    known = list(known) if known is not None else [None] * len(file_paths)
+    worker = _analyze if profiler is None else _analyze_timed
+    if blob_algo:
+        worker = partial(worker, blob_algo=blob_algo)
+    if catalog is not None:
+        load_catalog(catalog)  # antes de crear el pool, para que los procesos lo hereden
+    worker = partial(worker, catalog=catalog)
+    jobs = jobs or os.cpu_count() or 1
+    jobs = min(jobs, len(file_paths))
+    if jobs <= 1 or len(file_paths) < MIN_PARALLEL_FILES:
+        results = map(_call, [worker] * len(file_paths), file_paths, known)
+        pool = None
+    else:
+        chunksize = max(1, len(file_paths) // (jobs * 4))
+        pool = ProcessPoolExecutor(max_workers=jobs)
+        results = pool.map(_call, [worker] * len(file_paths), file_paths, known, chunksize=chunksize)
+    try:
+        for file_path, (analysis, errors, *timing) in zip(file_paths, results):
+            if timing:
+                profiler.add_file(relative_key(file_path, BASE_PATH), timing[0])
+            yield file_path, analysis, errors
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+def analyze_files(file_paths, jobs=None, profiler=None, blob_algo=None, quiet=False, catalog=BASE_PATH):
+    """Analiza varios archivos; devuelve los análisis en el orden de file_paths."""
+    analyses = []
+    for _, analysis, errors in iter_analyze_files(file_paths, jobs, profiler, blob_algo, catalog=catalog):
+        for message in errors:
+            if not quiet:
+                print(f"❌ {message}")
+        analyses.append(analysis)
+    return analyses
+
+def open_baseline(backend=DEFAULT_BACKEND, base=None):
+    """Abre el almacén de línea base del backend indicado (del proyecto en base, por defecto este)."""
+    base = Path(base) if base is not None else BASE_PATH
+    path = base / (STORE_FILE.name if backend == 'sqlite' else HASH_FILE.name)
+    return open_store(backend, path, base)
+
+def import_baseline(backend=DEFAULT_BACKEND, source=None, quiet=False, base=None):
+    """Importa un file_integrity.json existente (rutas absolutas incluidas) al backend."""
+    base = Path(base) if base is not None else BASE_PATH
+    source = source or base / HASH_FILE.name
+    store = open_baseline(backend, base)
+    try:
+        total = import_json(source, store, base)
+    finally:
+        store.close()
+    if not quiet:
+        print(f"📥 Línea base importada desde {source}: {total} archivos → {store.path}")
+
+def load_git_index(git, base=None, quiet=False):
+    """Índice git del repo si se pidió --git; None si no se pidió o no hay repositorio legible."""
+    if not git:
+        return None
+    git_index = GitIndex.load(base if base is not None else BASE_PATH)
+    if git_index is None and not quiet:
+        print("⚠️  --git: no hay un .git/index legible; se continúa sin blob ids")
+    return git_index
+
+def record_blob(analysis, git_index, st):
+    """Blob id a guardar: el del índice si el archivo está limpio (respeta los filtros de git)."""
+    if git_index is not None:
+        analysis['blob'] = git_index.blob_for(analysis['path'], st) or analysis['blob']
 
-def store_initial_state():
-    """Almacena el estado inicial de todos los archivos."""
-    print("🔍 Analizando estado inicial de archivos...")
+def update_baseline(file_paths, jobs=None, backend=DEFAULT_BACKEND, git=False):
+    """Re-registra solo los archivos indicados en la línea base (O(1) por archivo en sqlite)."""
+    file_paths = [Path(p).resolve() for p in file_paths]
+    git_index = load_git_index(git)
+    analyses = analyze_files(file_paths, jobs, blob_algo=git_index and git_index.algo)
+    store = open_baseline(backend)
+    try:
+        for file_path, analysis in zip(file_paths, analyses):
+            rel = relative_key(file_path, BASE_PATH)
+            if analysis['hash']:
+                analysis['path'] = rel
+                record_blob(analysis, git_index, os.stat(file_path))
+                store.put(analysis)
+                print(f"✅ Actualizado: {rel}")
+            else:
+                store.delete(rel)
+                print(f"🗑️  Eliminado de la línea base: {rel}")
+    finally:
+        store.close()
+
+def tracked_files(index=None, base=None):
+    """Archivos bajo seguimiento según el índice del repo (se construye si no se pasa)."""
+    if index is None:
+        index = RepoIndex.build(base if base is not None else BASE_PATH)
+    files = []
+    for kind, suffix, under in TRACKED_KINDS:
+        files.extend(index.of_kind(kind, suffix=suffix, under=under))
+    return files
+
+def _base_of(base, index):
+    """Raíz del proyecto: la indicada, la del índice o la que contiene tools/."""
+    if base is not None:
+        return Path(base)
+    return index.base if index is not None else BASE_PATH
+
+def store_initial_state(jobs=None, backend=DEFAULT_BACKEND, index=None, profiler=None, git=False,
+                        base=None, quiet=False):
+    """Almacena el estado inicial de todos los archivos; devuelve cuántos se guardaron.
+
+    Con git=True guarda además el blob id git de cada archivo, que permite a
+    `verify --git` reconocer archivos sin cambios leyendo solo .git/index.
+    Con quiet=True no imprime nada (uso como biblioteca, ver pml_api.py).
+    """
+    say = (lambda *_: None) if quiet else print
+    base = _base_of(base, index)
+    say("🔍 Analizando estado inicial de archivos...")
     
-    initial_state = {
-        'created_at': datetime.now().isoformat(),
-        'files': {}
-    }
+    created_at = now().isoformat()
+    records = []
+    git_index = load_git_index(git, base, quiet)
     
     # Analizar todas las carpetas (estructura antigua y nueva)
-    paths_to_analyze = []
-    for p in DOCS_PATHS:
-        paths_to_analyze.append((p, '*.md'))
-    for p in FEATURES_PATHS:
-        paths_to_analyze.append((p, '*.md'))
-    for p in BUGS_PATHS:
-        paths_to_analyze.append((p, '*.md'))
-    for p in OPERATIONS_PATHS:
-        paths_to_analyze.append((p, '*.md'))
-    for p in PROPOSALS_PATHS:
-        paths_to_analyze.append((p, '*.md'))
-    for p in SCHEMAS_PATHS:
-        paths_to_analyze.append((p, '*.json'))
-    
-    total_files = 0
-    for base_path, pattern in paths_to_analyze:
-        if base_path.exists():
-            for file_path in base_path.rglob(pattern):
-                if file_path.is_file():
-                    analysis = analyze_file(file_path)
-                    if analysis['hash']:
-                        initial_state['files'][str(file_path)] = analysis
-                        total_files += 1
-                        print(f"✅ Analizado: {file_path.name}")
-    
-    # Guardar estado inicial
-    with open(HASH_FILE, 'w', encoding='utf-8') as f:
-        json.dump(initial_state, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n📊 Estado inicial guardado:")
-    print(f"   📁 Archivos analizados: {total_files}")
-    print(f"   💾 Guardado en: {HASH_FILE}")
-
-def verify_file_integrity():
-    """Verifica integridad y cambios en archivos."""
-    if not HASH_FILE.exists():
-        print(f"❌ {HASH_FILE} no existe.")
-        print("   Ejecuta: python3 tools/verify_integrity.py store")
-        return
+    with phase(profiler, 'recorrido del árbol'):
+        files = tracked_files(index, base)
+    
+    with phase(profiler, 'analyze_file (hash + placeholders)'):
+        analyses = analyze_files([f.path for f in files], jobs, profiler, git_index and git_index.algo, quiet,
+                                 catalog=base)
+    for f, analysis in zip(files, analyses):
+        if analysis['hash']:
+            analysis['path'] = relative_key(f.path, base)
+            record_blob(analysis, git_index, f.stat)
+            records.append(analysis)
+            say(f"✅ Analizado: {f.name}")
+    
+    # Guardar estado inicial (atómico en ambos backends)
+    store = open_baseline(backend, base)
+    try:
+        with phase(profiler, 'guardado de línea base'):
+            store.save(created_at, records, scanner=SCANNER_VERSION)
+    finally:
+        store.close()
+    
+    say(f"\n📊 Estado inicial guardado:")
+    say(f"   📁 Archivos analizados: {len(records)}")
+    say(f"   💾 Guardado en: {store.path}")
+    return len(records)
+
+def classify(initial_data, current_analysis):
+    """Clasifica un archivo frente a su línea base; devuelve (código, mensaje).
+
+    current_analysis None significa que el archivo ya no existe.
+    """
+    name = Path(initial_data['path']).name
+    if current_analysis is None:
+        return 'integrity/missing', f"FALTANTE: {name}"
+    initial_count = initial_data['placeholder_count']
+    current_count = current_analysis['placeholder_count']
+    if current_analysis['hash'] != initial_data['hash']:
+        if current_count == 0:
+            return 'integrity/completed', f"COMPLETADO: {name} (0 placeholders restantes)"
+        if current_count < initial_count:
+            return 'integrity/in-progress', f"EN PROGRESO: {name} ({current_count}/{initial_count} placeholders restantes)"
+        return 'integrity/modified', f"MODIFICADO: {name} (cambios detectados)"
+    if initial_count > 0:
+        return 'integrity/template', f"PLANTILLA: {name} ({initial_count} placeholders)"
+    return 'integrity/unchanged', f"SIN CAMBIOS: {name}"
+
+def new_file_finding(file_path, rel, base=None):
+    """(Finding, estado) de un archivo que no está en la línea base, según el catálogo de plantillas de base.
+
+    Una plantilla intacta se reconoce solo por su hash; el resto se compara
+    por bloques con la plantilla más parecida. No se escanean placeholders.
+    """
+    try:
+        data = Path(file_path).read_bytes()
+        hash_val = hashlib.sha256(data).hexdigest()
+        catalog = load_catalog(base if base is not None else BASE_PATH)
+        content = None if catalog.lookup(hash_val) else decode_text(data)
+    except (OSError, UnicodeDecodeError) as e:
+        return Finding('integrity/read-error', 'error', f"Error leyendo {file_path}: {e}", path=rel), None
+    state, template, kept = catalog.match(hash_val, content)
+    return Finding('integrity/new', 'note', f"NUEVO: {rel} ({describe(state, template, kept, rel)})", path=rel), state
+
+def section_finding(initial_data, current_analysis):
+    """Finding con el avance por sección de un archivo modificado, o None si no hay secciones que comparar."""
+    if not current_analysis or not initial_data.get('sections') or not current_analysis.get('sections'):
+        return None
+    report = compare(initial_data['sections'], current_analysis['sections'])
+    done = sum(1 for _, _, count in report if count == 0)
+    pending = [
+        f"{heading.lstrip('#').strip() or '(inicio)'} ({count}{', plantilla' if state == 'template' else ''})"
+        for heading, state, count in report if count
+    ]
+    message = f"Secciones sin placeholders: {done}/{len(report)}"
+    if pending:
+        shown = ', '.join(pending[:SECTIONS_SHOWN])
+        extra = f" y {len(pending) - SECTIONS_SHOWN} más" if len(pending) > SECTIONS_SHOWN else ''
+        message += f" · pendientes: {shown}{extra}"
+    return Finding('integrity/sections', 'note', message, path=initial_data['path'])
+
+def status_finding(initial_data, current_analysis):
+    """Finding con el estado de un archivo (faltante = advertencia, el resto informativo)."""
+    code, message = classify(initial_data, current_analysis)
+    severity = 'warning' if code == 'integrity/missing' else 'note'
+    return Finding(code, severity, message, path=initial_data['path'])
+
+def verify_file_integrity(paranoid=False, jobs=None, backend=DEFAULT_BACKEND, index=None, profiler=None,
+                          sink=None, git=False, only=None, base=None):
+    """Verifica integridad y cambios en archivos.
+
+    Por defecto es incremental: si (size, mtime_ns, inode) no cambiaron desde
+    la línea base se reutilizan hash y placeholders sin abrir el archivo.
+    Con git=True, si el stat no coincide (p. ej. tras un clone o checkout) pero
+    el archivo está limpio en .git/index con el mismo blob id que guardó la
+    línea base, tampoco se abre. Solo los archivos sucios, no versionados o
+    con otro blob pasan por el análisis completo (hacen falta sus
+    placeholders). Con paranoid=True se re-analiza todo. Si se pasa un
+    RepoIndex se usan sus stat en lugar de volver a consultar el sistema de
+    archivos. Con only (conjunto de rutas relativas) solo se verifican esos
+    archivos de la línea base (modo --changed-since).
+
+    De los archivos que cambiaron solo se escanean las secciones cuyo hash
+    difiere del guardado, y de los que están en progreso o modificados se
+    informa el avance por sección. Al final, la raíz Merkle recompuesta con la
+    de cada archivo (reutilizada o recalculada) se compara con la de la línea
+    base: si coinciden, no cambió ningún archivo. No es un atajo, porque para
+    recomponerla hay que recorrer antes todos los archivos.
+
+    Cada archivo se clasifica y se envía al sink (texto por defecto) en cuanto
+    su análisis termina; solo se guardan contadores. Devuelve el resumen de
+    contadores, o None si no hay línea base o se detuvo por --fail-fast.
+    base (o index.base) verifica otro proyecto en lugar del que contiene tools/.
+    """
+    sink = sink or make_sink('text', 'verify_integrity')
+    base = _base_of(base, index)
+    store = open_baseline(backend, base)
+    if not store.exists():
+        if backend != 'json' and (base / HASH_FILE.name).exists():
+            # Verificar no escribe: se lee el JSON tal cual (`import` lo migra)
+            store = open_baseline('json', base)
+            sink.info(f"ℹ️  Sin {STORE_FILE.name}: se usa {HASH_FILE.name}"
+                      f" (python3 tools/verify_integrity.py import para migrarlo)")
+        else:
+            try:
+                sink.emit(Finding('integrity/no-baseline', 'error', f"{store.path} no existe."))
+            except FailFast:
+                pass
+            sink.info("   Ejecuta: python3 tools/verify_integrity.py store")
+            return None
     
     # Cargar estado inicial
-    with open(HASH_FILE, 'r', encoding='utf-8') as f:
-        initial_state = json.load(f)
-    
-    print("🔍 Verificando integridad de archivos...")
-    print(f"📅 Estado inicial creado: {initial_state['created_at']}")
-    print("=" * 60)
-    
-    modified_files = []
-    unchanged_files = []
-    missing_files = []
-    template_files = []  # Archivos que siguen siendo plantillas
-    completed_files = []  # Archivos que han sido completados
-    
-    for file_path_str, initial_data in initial_state['files'].items():
-        file_path = Path(file_path_str)
-        
-        if not file_path.exists():
-            missing_files.append(file_path_str)
-            print(f"🚫 FALTANTE: {file_path.name}")
-            continue
-        
-        # Análisis actual
-        current_analysis = analyze_file(file_path)
-        
-        # Comparar hashes
-        if current_analysis['hash'] != initial_data['hash']:
-            modified_files.append({
-                'path': file_path_str,
-                'initial_placeholders': initial_data['placeholder_count'],
-                'current_placeholders': current_analysis['placeholder_count'],
-                'status': 'modified'
-            })
-            
-            # Determinar si fue completado o parcialmente modificado
-            if current_analysis['placeholder_count'] == 0:
-                completed_files.append(file_path_str)
-                print(f"✅ COMPLETADO: {file_path.name} (0 placeholders restantes)")
-            elif current_analysis['placeholder_count'] < initial_data['placeholder_count']:
-                print(f"🔄 EN PROGRESO: {file_path.name} ({current_analysis['placeholder_count']}/{initial_data['placeholder_count']} placeholders restantes)")
+    try:
+        with phase(profiler, 'carga de línea base'):
+            created_at, baseline = store.load(placeholders=False)
+            baseline_root = store.root()
+            same_scanner = store.scanner() == SCANNER_VERSION
+    finally:
+        store.close()
+    if only is not None:
+        baseline = {rel: record for rel, record in baseline.items() if rel in only}
+    
+    sink.info("🔍 Verificando integridad de archivos...")
+    sink.info(f"📅 Estado inicial creado: {created_at}")
+    sink.info("=" * 60)
+    
+    counts = dict.fromkeys(
+        ('completed', 'in_progress', 'modified', 'templates', 'unchanged', 'missing', 'new', 'reused', 'reused_git',
+         'catalog', 'sections_rescanned', 'sections_reused'), 0)
+    roots = {}
+    template_names = []  # Solo para el listado final de la salida de texto
+    
+    git_index = None
+    if git and not paranoid:
+        with phase(profiler, 'lectura de .git/index'):
+            git_index = GitIndex.load(base)
+        if git_index is None:
+            sink.info("⚠️  --git: no hay un .git/index legible; se usa solo la comparación por stat")
+    
+    if index is None and only is None:
+        # Un solo recorrido: da los stat y los archivos que faltan en la línea base
+        with phase(profiler, 'recorrido del árbol'):
+            index = RepoIndex.build(base)
+    
+    # Qué archivos pueden reutilizar la línea base (stat o blob sin cambios) y cuáles hay que analizar
+    reusable = set()
+    pending = []
+    with phase(profiler, 'stat de archivos'):
+        for file_path_str, initial_data in baseline.items():
+            st = index.stat(file_path_str) if index is not None else None
+            if st is None:
+                try:
+                    st = os.stat(base / file_path_str)
+                except FileNotFoundError:
+                    continue
+            if not paranoid and stat_matches(initial_data.get('stats'), st, store.racy_ns(file_path_str)):
+                reusable.add(file_path_str)
+            elif (
+                git_index is not None and initial_data.get('blob')
+                and git_index.blob_for(file_path_str, st) == initial_data['blob']
+            ):
+                reusable.add(file_path_str)
+                counts['reused_git'] += 1
             else:
-                print(f"⚠️  MODIFICADO: {file_path.name} (cambios detectados)")
+                pending.append(file_path_str)
+    counts['reused'] = len(reusable)
+    pending_set = set(pending)
+    # Los análisis llegan en el orden de la línea base, según terminan en el pool
+    if not same_scanner:
+        sink.info("⚠️  Línea base contada con otra versión del escáner de placeholders:"
+                  " los recuentos pueden diferir hasta volver a ejecutar store")
+    known = None if paranoid or not same_scanner else [known_counts(baseline[p]) for p in pending]
+    analyses = iter_analyze_files([base / p for p in pending], jobs, profiler, known=known, catalog=None if paranoid else base)
+    
+    try:
+        with phase(profiler, 'analyze_file + clasificación'):
+            for file_path_str, initial_data in baseline.items():
+                initial_data['path'] = file_path_str
+                if file_path_str in reusable:
+                    current_analysis = initial_data
+                elif file_path_str in pending_set:
+                    _, current_analysis, errors = next(analyses)
+                    for message in errors:
+                        sink.emit(Finding('integrity/read-error', 'error', message, path=file_path_str))
+                    if not paranoid and current_analysis['hash'] and catalog_entry(current_analysis['hash'], base):
+                        counts['catalog'] += 1
+                    if current_analysis.get('sections'):
+                        rescanned = current_analysis.get('rescanned', len(current_analysis['sections']))
+                        counts['sections_rescanned'] += rescanned
+                        counts['sections_reused'] += len(current_analysis['sections']) - rescanned
+                else:
+                    current_analysis = None
+                if current_analysis is not None:
+                    roots[file_path_str] = current_analysis.get('merkle')
                 
-        else:
-            unchanged_files.append(file_path_str)
-            if initial_data['placeholder_count'] > 0:
-                template_files.append(file_path_str)
-                print(f"📝 PLANTILLA: {file_path.name} ({initial_data['placeholder_count']} placeholders)")
-            else:
-                print(f"✨ SIN CAMBIOS: {file_path.name}")
+                finding = status_finding(initial_data, current_analysis)
+                key = finding.code.split('/', 1)[1].replace('-', '_')
+                if key == 'template':
+                    key = 'templates'
+                    if sink.human:
+                        template_names.append(Path(file_path_str).name)
+                counts[key] += 1
+                sink.emit(finding)
+                if key in ('in_progress', 'modified'):
+                    detail = section_finding(initial_data, current_analysis)
+                    if detail is not None:
+                        sink.emit(detail)
+        if only is None:
+            # Archivos bajo seguimiento que la línea base no conoce (DOC nuevo, plantilla copiada)
+            with phase(profiler, 'archivos nuevos'):
+                for f in tracked_files(index, base):
+                    if f.rel in baseline:
+                        continue
+                    finding, state = new_file_finding(f.path, f.rel, base)
+                    counts['new'] += 1
+                    if state == TEMPLATE and sink.human:
+                        template_names.append(f.rel)
+                    sink.emit(finding)
+    except FailFast:
+        return None
+    finally:
+        analyses.close()
     
     # Resumen
-    print("\n" + "=" * 60)
-    print("📊 RESUMEN DE ESTADO:")
-    print(f"   ✅ Completados: {len(completed_files)}")
-    print(f"   🔄 En progreso: {len(modified_files) - len(completed_files)}")
-    print(f"   📝 Plantillas sin modificar: {len(template_files)}")
-    print(f"   ✨ Sin cambios: {len(unchanged_files) - len(template_files)}")
-    print(f"   🚫 Archivos faltantes: {len(missing_files)}")
-    
-    if template_files:
-        print(f"\n📝 ARCHIVOS QUE NECESITAN COMPLETARSE:")
-        for template in template_files:
-            print(f"   - {Path(template).name}")
+    sink.info("\n" + "=" * 60)
+    sink.info("📊 RESUMEN DE ESTADO:")
+    sink.info(f"   ✅ Completados: {counts['completed']}")
+    sink.info(f"   🔄 En progreso: {counts['in_progress'] + counts['modified']}")
+    sink.info(f"   📝 Plantillas sin modificar: {counts['templates']}")
+    sink.info(f"   ✨ Sin cambios: {counts['unchanged']}")
+    sink.info(f"   🚫 Archivos faltantes: {counts['missing']}")
+    if counts['new']:
+        sink.info(f"   🆕 Nuevos (fuera de la línea base): {counts['new']}")
+    if not paranoid:
+        sink.info(f"   ⚡ Reutilizados por stat: {counts['reused'] - counts['reused_git']}")
+    if git_index is not None:
+        sink.info(f"   🌿 Reutilizados por índice git: {counts['reused_git']}")
+    if counts['catalog']:
+        sink.info(f"   📚 Reconocidos por el catálogo de plantillas (sin escanear): {counts['catalog']}")
+    if counts['sections_rescanned'] or counts['sections_reused']:
+        sink.info(f"   📑 Secciones re-escaneadas: {counts['sections_rescanned']}"
+                  f" (reutilizadas: {counts['sections_reused']})")
+    if only is None and baseline_root and None not in roots.values():
+        if repo_root(roots) == baseline_root:
+            sink.info(f"   🌳 Raíz Merkle igual a la línea base ({baseline_root[:12]}): ningún archivo cambió")
     
-    return {
-        'completed': completed_files,
-        'templates': template_files,
-        'modified': modified_files,
-        'missing': missing_files
-    }
+    if template_names:
+        sink.info(f"\n📝 ARCHIVOS QUE NECESITAN COMPLETARSE:")
+        for name in template_names:
+            sink.info(f"   - {name}")
+    
+    return counts
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Verificador de integridad de Prompt Manager Lite")
+    parser.add_argument('command', nargs='?', choices=['verify', 'store', 'import'], default='verify',
+                        help="'store' guarda la línea base; 'verify' (por defecto) la compara; "
+                             "'import' convierte un file_integrity.json existente al backend elegido")
+    parser.add_argument('paths', nargs='*',
+                        help="con 'store': actualiza solo estos archivos en la línea base existente")
+    add_profile_arguments(parser)
+    add_report_arguments(parser)
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help=f"almacén de la línea base (por defecto: {DEFAULT_BACKEND}; "
+                             "'json' = file_integrity.json histórico)")
+    parser.add_argument('--paranoid', action='store_true',
+                        help="re-hashea todos los archivos aunque su stat no haya cambiado")
+    parser.add_argument('--jobs', '-j', type=int, default=None, metavar='N',
+                        help="procesos de análisis en paralelo (por defecto: número de CPUs; 1 = serie)")
+    parser.add_argument('--git', action='store_true',
+                        help="usa .git/index: 'store' guarda blob ids y 'verify' no abre los archivos "
+                             "limpios con el mismo blob")
+    return parser.parse_intermixed_args(argv)
 
 if __name__ == "__main__":
-    import sys
+    args = parse_args()
+    profiler = start_profile(args, 'verify_integrity')
+    sink = open_sink(args, 'verify_integrity') if args.command == 'verify' else make_sink('text', 'verify_integrity')
     
-    print("=" * 60)
-    print("🔍 PROMPT MANAGER LITE - VERIFICADOR DE INTEGRIDAD")
-    print("=" * 60)
+    sink.info("=" * 60)
+    sink.info("🔍 PROMPT MANAGER LITE - VERIFICADOR DE INTEGRIDAD")
+    sink.info("=" * 60)
     
-    if len(sys.argv) > 1 and sys.argv[1] == 'store':
-        store_initial_state()
+    summary = None
+    if args.command == 'store' and args.paths:
+        update_baseline(args.paths, jobs=args.jobs, backend=args.backend, git=args.git)
+    elif args.command == 'store':
+        store_initial_state(jobs=args.jobs, backend=args.backend, profiler=profiler, git=args.git)
+    elif args.command == 'import':
+        import_baseline(backend=args.backend)
     else:
-        verify_file_integrity()
+        summary = verify_file_integrity(paranoid=args.paranoid, jobs=args.jobs, backend=args.backend,
+                                        profiler=profiler, sink=sink, git=args.git)
+    close_sink(sink, summary and {'integrity': summary})
+    finish_profile(profiler, args)
+    raise SystemExit(1 if sink.failed else 0)
@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+Modo watch: resultados de verificación siempre al día
+
+Mantiene en memoria el RepoIndex, la línea base de integridad, el manifest y
+los índices de las guías. Detecta cambios con inotify (Linux, vía ctypes, sin
+dependencias) o, si no está disponible, sondeando el stat de los archivos
+indexados. Ante cada lote de cambios vuelve a ejecutar solo las
+comprobaciones afectadas:
+
+- DOC / feature / bug / operación / propuesta / schema editado → integridad de ese archivo
+- DOC editado → contraste de su frontmatter con el manifest
+- DOC creado o borrado → manifest, su playbook y su entrada en USO_PLAYBOOKS_DOCS.md
+- playbook creado o borrado → los DOCs cuyo playbook canónico o alias es ese
+- manifest editado → manifest, validación contra su schema, cobertura de schemaRefs y frontmatter
+- schema editado/creado/borrado → validación del manifest y cobertura en guía/schemaRefs
+- guía editada → la comprobación de esa guía
+- línea base regrabada (store) → integridad de todos los archivos
+
+e imprime solo lo que cambió (+ nuevo, - resuelto) y el tiempo en ms.
+
+Uso: python3 tools/verify.py watch [--poll] [--interval S]
+"""
+from __future__ import annotations
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import verify_docs_and_schemas as vds
+import verify_integrity as vi
+from findings import PASS, Finding, text_line
+from frontmatter import FrontmatterIndex
+from guide_index import GuideIndex
+from repo_index import _SKIP_DIRS, _TOP_LEVEL, RepoIndex
+from schema_validator import SchemaRegistry
+
+# Máscaras de inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Sin IN_CLOSE_WRITE: sqlite abre la línea base en lectura/escritura y cerrarla
+# al recargarla generaría un evento (y otra recarga) aunque no se escriba nada
+_WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+)
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+
+# Tras el primer evento se siguen leyendo eventos hasta este silencio (editores que guardan en varios pasos)
+DEBOUNCE_S = 0.05
+DEFAULT_INTERVAL_S = 1.0
+
+# Archivos de la raíz que también se vigilan (la línea base de integridad)
+_BASELINE_NAMES = {vi.HASH_FILE.name, vi.STORE_FILE.name}
+
+Key = Tuple[str, ...]
+State = FrozenSet[Tuple[str, str, str, str]]
+Report = List[Tuple[str, Finding]]  # ("+" nuevo | "-" resuelto, hallazgo)
+
+
+class InotifyWatcher:
+    """Cambios vía inotify sobre las carpetas indexadas (recursivo, se añaden las nuevas)."""
+
+    name = "inotify"
+
+    def __init__(self, base: Path, index: RepoIndex):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        init = libc.inotify_init1
+        init.argtypes = [ctypes.c_int]
+        init.restype = ctypes.c_int
+        self.fd = init(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.base = base
+        self.index = index
+        self.dirs: Dict[int, str] = {}  # wd -> ruta relativa del directorio ("" = raíz)
+        self._watch("")
+        for name in sorted(_TOP_LEVEL):
+            if (base / name).is_dir():
+                self._watch_tree(name)
+
+    def _watch(self, rel_dir: str) -> None:
+        path = os.fsencode(self.base / rel_dir if rel_dir else self.base)
+        wd = self._add_watch(self.fd, path, _WATCH_MASK)
+        if wd >= 0:
+            self.dirs[wd] = rel_dir
+
+    def _watch_tree(self, rel_dir: str) -> List[str]:
+        """Vigila rel_dir y sus subcarpetas; devuelve los archivos que ya contienen."""
+        self._watch(rel_dir)
+        files: List[str] = []
+        try:
+            entries = list(os.scandir(self.base / rel_dir))
+        except OSError:
+            return files
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in _SKIP_DIRS:
+                    files.extend(self._watch_tree(rel))
+            else:
+                files.append(rel)
+        return files
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        """Bloquea hasta el siguiente lote de cambios; devuelve las rutas relativas afectadas."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return None
+        changed: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                data = b""
+            if data:
+                if self._parse(data, changed):
+                    return {"*"}
+                continue
+            if not select.select([self.fd], [], [], DEBOUNCE_S)[0]:
+                return changed
+
+    def _parse(self, data: bytes, changed: Set[str]) -> bool:
+        """Acumula rutas en changed; devuelve True si la cola se desbordó (hay que reescanear)."""
+        pos = 0
+        while pos < len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, pos)
+            name = data[pos + _EVENT.size:pos + _EVENT.size + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+            pos += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                return True
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            rel_dir = self.dirs.get(wd)
+            if rel_dir is None or not name:
+                continue
+            rel = f"{rel_dir}/{name}" if rel_dir else name
+            if not rel_dir and not (name in _BASELINE_NAMES or (mask & IN_ISDIR and name in _TOP_LEVEL)):
+                continue
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changed.update(self._watch_tree(rel))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    prefix = rel + "/"
+                    changed.update(r for r in self.index.files if r.startswith(prefix))
+            else:
+                changed.add(rel)
+        return False
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Cambios por sondeo: un recorrido con os.scandir por intervalo y comparación de stat."""
+
+    name = "sondeo"
+
+    def __init__(self, base: Path, index: RepoIndex, interval: float = DEFAULT_INTERVAL_S):
+        self.base = base
+        self.interval = interval
+        self.snapshot = self._signatures(index)
+
+    def _signatures(self, index: RepoIndex) -> Dict[str, tuple]:
+        sigs = index.signatures()
+        for name in _BASELINE_NAMES:
+            try:
+                st = os.stat(self.base / name)
+            except OSError:
+                continue
+            sigs[name] = (st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino)
+        return sigs
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+        current = self._signatures(RepoIndex.build(self.base))
+        previous, self.snapshot = self.snapshot, current
+        changed = {rel for rel, sig in current.items() if previous.get(rel) != sig}
+        changed.update(rel for rel in previous if rel not in current)
+        return changed or None
+
+    def close(self) -> None:
+        pass
+
+
+def make_watcher(base: Path, index: RepoIndex, poll: bool = False,
+                 interval: float = DEFAULT_INTERVAL_S):
+    """inotify si el sistema lo ofrece (y no se pidió --poll); si no, sondeo."""
+    if not poll:
+        try:
+            return InotifyWatcher(base, index)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(base, index, interval)
+
+
+def _state(findings: Iterable[Finding]) -> State:
+    return frozenset((f.code, f.severity, f.message, f.path or "") for f in findings if f.severity != PASS)
+
+
+def _diff(old: State, new: State, report: Report) -> None:
+    report.extend(("-", Finding(*item)) for item in sorted(old - new))
+    report.extend(("+", Finding(*item)) for item in sorted(new - old))
+
+
+def format_report(report: Report) -> List[str]:
+    return [f"  {sign} {text_line(finding)}" for sign, finding in report]
+
+
+class WatchSession:
+    """Estado vivo de ambos verificadores y recálculo incremental por lote de cambios."""
+
+    def __init__(self, backend: str = vi.DEFAULT_BACKEND, jobs: Optional[int] = None,
+                 placeholders: bool = False):
+        self.backend = backend
+        self.jobs = jobs
+        # Con placeholders=True (daemon) se conservan las listas de placeholders de cada archivo
+        self.placeholders = placeholders
+        self.index = RepoIndex.build(vds.BASE)
+        self.results: Dict[Key, State] = {}
+        self.manifest: dict = {"documents": []}
+        self.docs: List[Path] = []
+        self.pb_names: Set[str] = set()
+        self.schemas: List[Path] = []
+        self.guides: Dict[Path, Optional[GuideIndex]] = {}
+        self.frontmatter = FrontmatterIndex(vds.BASE, vds.CACHE_DIR)
+        self.baseline: Dict[str, dict] = {}
+        self.current: Dict[str, Optional[dict]] = {}  # último análisis de cada archivo de la línea base
+        self.racy: Callable[[str], int] = lambda rel: 0
+
+    # -- carga -----------------------------------------------------------------
+
+    def _load_manifest(self) -> List[Finding]:
+        if not vds.MANIFEST_PATH.exists():
+            self.manifest = {"documents": []}
+            return [Finding("manifest/not-found", "warning", f"Manifest no encontrado: {vds.MANIFEST_PATH}",
+                            vds._rel(vds.MANIFEST_PATH))]
+        try:
+            self.manifest = vds.load_json(vds.MANIFEST_PATH)
+        except (OSError, ValueError) as e:
+            self.manifest = {"documents": []}
+            return [Finding("manifest/unreadable", "error", f"Manifest ilegible: {e}", vds._rel(vds.MANIFEST_PATH))]
+        return []
+
+    def _load_guide(self, path: Path) -> Optional[GuideIndex]:
+        guide = GuideIndex(path, vds.CACHE_DIR) if path.exists() else None
+        self.guides[path] = guide
+        return guide
+
+    def _load_baseline(self) -> None:
+        store = vi.open_baseline(self.backend)
+        if not store.exists() and self.backend != "json" and vi.HASH_FILE.exists():
+            # Como verify: se lee el JSON sin crear el sqlite (`import` lo migra)
+            store = vi.open_baseline("json")
+        if not store.exists():
+            self.baseline = {}
+            return
+        try:
+            _, self.baseline = store.load(placeholders=self.placeholders)
+        finally:
+            store.close()
+        for rel, record in self.baseline.items():
+            record["path"] = rel
+        self.racy = store.racy_ns
+
+    def _refresh_lists(self) -> None:
+        self.docs = vds.list_docs(self.index)
+        self.pb_names = vds.list_playbooks(self.index)
+        self.schemas = vds.list_schema_files(self.index)
+
+    # -- comprobaciones --------------------------------------------------------
+
+    def _set(self, key: Key, findings: Iterable[Finding], report: Report) -> None:
+        """Sustituye los hallazgos de una clave y anota las diferencias (+ nuevo / - resuelto)."""
+        new = _state(findings)
+        old = self.results.get(key, frozenset())
+        if new:
+            self.results[key] = new
+        else:
+            self.results.pop(key, None)
+        _diff(old, new, report)
+
+    def _check_manifest(self, report: Report, load_errors: Iterable[Finding] = ()) -> None:
+        schema_paths = vds.schema_path_set(self.schemas)
+        self._set(("manifest",), [*load_errors, *vds.iter_manifest(self.manifest, self.docs, schema_paths=schema_paths)],
+                  report)
+
+    def _check_frontmatter(self, report: Report) -> None:
+        # Solo se relee la cabecera de los DOCs cuyo stat cambió
+        self._set(("frontmatter",), vds.iter_frontmatter(self.manifest, self.docs, self.frontmatter,
+                                                         vds.schema_path_set(self.schemas), self.index), report)
+        self.frontmatter.save()
+
+    def _check_manifest_schema(self, report: Report) -> None:
+        # Registro nuevo: su caché en disco se invalida por hash si cambió algún schema
+        self._set(("manifest_schema",), vds.iter_manifest_schema(self.manifest, SchemaRegistry(vds.CACHE_DIR)), report)
+
+    def _check_schema_refs(self, report: Report) -> None:
+        self._set(("schema_refs",), vds.iter_schema_refs_coverage(self.schemas, self.manifest), report)
+
+    def _check_guide_schemas(self, report: Report) -> None:
+        guide = self.guides.get(vds.GUIDE_CONN)
+        self._set(("guide_schemas",), vds.iter_schemas_covered_in_guide(self.schemas, vds.GUIDE_CONN, guide), report)
+
+    def _check_doc(self, doc: Path, present: bool, report: Report) -> None:
+        """Playbook y entrada en la guía de un DOC (o retira sus hallazgos si se borró)."""
+        rel = vds._rel(doc)
+        if not present:
+            self._set(("playbook", rel), (), report)
+            self._set(("guide_doc", rel), (), report)
+            return
+        self._set(("playbook", rel), vds.iter_playbooks([doc], self.pb_names), report)
+        guide = self.guides.get(vds.GUIDE_PB_DOCS)
+        self._set(("guide_doc", rel), vds.iter_docs_indexed_in_guide([doc], vds.GUIDE_PB_DOCS, guide), report)
+
+    def _check_guide_docs(self, report: Report) -> None:
+        guide = self.guides.get(vds.GUIDE_PB_DOCS)
+        if guide is not None:
+            guide.prepare(substrings=[d.name[:-3] for d in self.docs],
+                          words=[d.name[:-3].split("-")[0] for d in self.docs])
+        for doc in self.docs:
+            self._set(("guide_doc", vds._rel(doc)), vds.iter_docs_indexed_in_guide([doc], vds.GUIDE_PB_DOCS, guide), report)
+
+    def _check_file(self, rel: str, report: Report, analysis: Optional[dict] = None,
+                    errors: Iterable[str] = ()) -> None:
+        """Estado de integridad de un archivo de la línea base (lo analiza si no se pasa el análisis)."""
+        initial = self.baseline.get(rel)
+        if initial is None:
+            return
+        indexed = self.index.get(rel)
+        if analysis is None and indexed is not None:
+            if vi.stat_matches(initial.get("stats"), indexed.stat, self.racy(rel)):
+                analysis = initial
+            else:
+                analysis, errors = vi._analyze(indexed.path)
+        self.current[rel] = analysis
+        read_errors = [Finding("integrity/read-error", "error", m, path=rel) for m in errors]
+        status = vi.status_finding(initial, analysis)
+        detail = None
+        if status.code in ("integrity/in-progress", "integrity/modified"):
+            detail = vi.section_finding(initial, analysis)
+        self._set(("integrity", rel), [*read_errors, status, *([detail] if detail else [])], report)
+
+    def _check_all_files(self, report: Report) -> None:
+        self.current = {}
+        pending = []
+        for rel, initial in self.baseline.items():
+            indexed = self.index.get(rel)
+            if indexed is None or vi.stat_matches(initial.get("stats"), indexed.stat, self.racy(rel)):
+                self._check_file(rel, report, initial if indexed else None)
+            else:
+                pending.append(rel)
+        paths = [vi.BASE_PATH / rel for rel in pending]
+        for rel, (_, analysis, errors) in zip(pending, vi.iter_analyze_files(paths, self.jobs)):
+            self._check_file(rel, report, analysis, errors)
+        for key in [k for k in self.results if k[0] == "integrity" and k[1] not in self.baseline]:
+            self._set(key, (), report)
+
+    # -- ciclo -----------------------------------------------------------------
+
+    def start(self) -> Report:
+        """Ejecución completa inicial; devuelve los errores y advertencias encontrados."""
+        report: Report = []
+        load_errors = self._load_manifest()
+        self._refresh_lists()
+        self._load_guide(vds.GUIDE_CONN)
+        self._load_guide(vds.GUIDE_PB_DOCS)
+        self._load_baseline()
+        self._check_manifest(report, load_errors)
+        self._check_frontmatter(report)
+        self._check_manifest_schema(report)
+        self._check_schema_refs(report)
+        self._check_guide_schemas(report)
+        self._check_guide_docs(report)
+        for doc in self.docs:
+            self._set(("playbook", vds._rel(doc)), vds.iter_playbooks([doc], self.pb_names), report)
+        self._check_all_files(report)
+        return [(sign, f) for sign, f in report if f.severity in ("error", "warning")]
+
+    def apply(self, changed: Set[str]) -> Report:
+        """Aplica un lote de rutas cambiadas y devuelve las diferencias de resultados."""
+        report: Report = []
+        if "*" in changed:
+            # Desbordamiento de inotify: se reconstruye todo y se informa de las diferencias
+            previous = self.results
+            self.index = RepoIndex.build(vds.BASE)
+            self.results = {}
+            self.start()
+            for key in sorted(previous.keys() | self.results.keys()):
+                _diff(previous.get(key, frozenset()), self.results.get(key, frozenset()), report)
+            return report
+
+        manifest_rel = vds._rel(vds.MANIFEST_PATH)
+        guide_rels = {vds._rel(g): g for g in (vds.GUIDE_CONN, vds.GUIDE_PB_DOCS)}
+        content: Set[str] = set()
+        playbooks_changed: Set[str] = set()
+        docs_listed = docs_changed = schemas_changed = schemas_listed = manifest_changed = baseline_changed = False
+        guides_changed: Set[Path] = set()
+
+        for rel in sorted(changed):
+            if rel in _BASELINE_NAMES:
+                baseline_changed = True
+                continue
+            old, new = self.index.refresh(rel)
+            if old is None and new is None:
+                continue
+            kind = (new or old).kind
+            listed = (old is None) != (new is None)
+            content.add(rel)
+            if kind == "doc":
+                docs_changed = True
+                docs_listed = docs_listed or listed
+            elif kind == "playbook" and listed:
+                playbooks_changed.add((new or old).name)
+            elif kind == "schema":
+                schemas_changed = True
+                schemas_listed = schemas_listed or listed
+            elif kind == "manifest" and rel == manifest_rel:
+                manifest_changed = True
+            elif kind == "guide" and rel in guide_rels:
+                guides_changed.add(guide_rels[rel])
+
+        previous_docs = set(self.docs)
+        if docs_listed or playbooks_changed or schemas_listed:
+            self._refresh_lists()
+        docs_added = [d for d in self.docs if d not in previous_docs]
+        docs_removed = sorted(previous_docs.difference(self.docs))
+        load_errors: List[Finding] = []
+        if manifest_changed:
+            load_errors = self._load_manifest()
+        for guide_path in guides_changed:
+            self._load_guide(guide_path)
+
+        if manifest_changed or docs_added or docs_removed:
+            self._check_manifest(report, load_errors)
+        if manifest_changed or docs_changed or schemas_listed:
+            self._check_frontmatter(report)
+        if manifest_changed or schemas_changed:
+            self._check_manifest_schema(report)
+        if manifest_changed or schemas_listed:
+            self._check_schema_refs(report)
+        if schemas_listed or vds.GUIDE_CONN in guides_changed:
+            self._check_guide_schemas(report)
+        if vds.GUIDE_PB_DOCS in guides_changed:
+            self._check_guide_docs(report)
+        for doc in docs_added:
+            self._check_doc(doc, True, report)
+        for doc in docs_removed:
+            self._check_doc(doc, False, report)
+        if playbooks_changed:
+            for doc in self.docs:
+                basename = doc.name[:-3]
+                names = {vds.CANONICAL_PB_PATTERN.format(doc_basename=basename), *vds.ALIASES.get(basename, ())}
+                if names & playbooks_changed:
+                    self._set(("playbook", vds._rel(doc)), vds.iter_playbooks([doc], self.pb_names), report)
+
+        if baseline_changed:
+            self._load_baseline()
+            self._check_all_files(report)
+        else:
+            for rel in sorted(content):
+                self._check_file(rel, report)
+        return report
+
+    def counts(self) -> Dict[str, int]:
+        totals = {"error": 0, "warning": 0}
+        for state in self.results.values():
+            for _code, severity, _message, _path in state:
+                if severity in totals:
+                    totals[severity] += 1
+        return totals
+
+
+def run(backend: str = vi.DEFAULT_BACKEND, jobs: Optional[int] = None, poll: bool = False,
+        interval: float = DEFAULT_INTERVAL_S) -> int:
+    """Bucle principal de `verify.py watch`; termina con Ctrl+C."""
+    t0 = time.perf_counter()
+    session = WatchSession(backend, jobs)
+    for line in format_report(session.start()):
+        print(line)
+    totals = session.counts()
+    watcher = make_watcher(vds.BASE, session.index, poll, interval)
+    detail = f"cada {interval:g}s" if isinstance(watcher, PollingWatcher) else "eventos del kernel"
+    print(
+        f"👀 Vigilando {vds.BASE} ({watcher.name}, {detail}) — ❌ {totals['error']} ⚠️  {totals['warning']}"
+        f" | archivos en línea base: {len(session.baseline)} | arranque {(time.perf_counter() - t0) * 1000:.1f} ms"
+    )
+    try:
+        while True:
+            changed = watcher.wait()
+            if not changed:
+                continue
+            # Con inotify el índice del watcher es el de la sesión; tras un reescaneo se actualiza
+            t0 = time.perf_counter()
+            report = session.apply(changed)
+            if isinstance(watcher, InotifyWatcher):
+                watcher.index = session.index
+            elapsed = (time.perf_counter() - t0) * 1000
+            totals = session.counts()
+            stamp = time.strftime("%H:%M:%S")
+            what = "reescaneo completo" if "*" in changed else f"{len(changed)} archivo(s)"
+            print(f"🔁 [{stamp}] {what} → Δ {len(report)} en {elapsed:.1f} ms"
+                  f" (❌ {totals['error']} ⚠️  {totals['warning']})")
+            for line in format_report(report):
+                print(line)
+    except KeyboardInterrupt:
+        print("\n👋 Fin del modo watch")
+    finally:
+        watcher.close()
+    return 0